@@ -7,6 +7,7 @@ class Settings(BaseSettings):
     HOST: str = "127.0.0.1"
     PORT: int = 8000
     DEBUG: bool = True
+    WORKERS: int = 2  # uvicorn workers forked by serve.py after the model is loaded
     
     # CORS configuration
     ALLOWED_ORIGINS: List[str] = [
@@ -20,6 +21,86 @@ class Settings(BaseSettings):
     
     # API Keys - Use absolute path to ensure .env is found  
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    OPENAI_BASE_URL: str = ""  # any OpenAI-compatible endpoint; empty uses api.openai.com
+    
+    # OpenAI HTTP client: one keep-alive connection pool per process, hard timeouts per call
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_READ_TIMEOUT_SECONDS: float = 30.0
+    OPENAI_MAX_RETRIES: int = 1
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    
+    # Goal validator model and on-disk artifact cache
+    VALIDATOR_MODEL_NAME: str = "ProsusAI/finbert"
+    VALIDATOR_MODEL_REVISION: str = "main"
+    VALIDATOR_MODEL_DIR: str = ""  # local directory from prepare_model.py; loaded offline instead of the hub
+    VALIDATOR_OFFLINE: bool = False  # only use files already in the local Hugging Face cache
+    VALIDATOR_BATCH_SIZE: int = 32
+    VALIDATOR_PRECISION: str = "fp32"  # "fp32" or "int8" (dynamic quantization of the encoder)
+    VALIDATOR_BACKEND: str = "torch"  # "torch" or "onnx" (ONNX Runtime CPU execution provider)
+    VALIDATOR_EAGER_WARMUP: bool = True
+    VALIDATOR_FUSION: str = "none"  # "none", "trace" (TorchScript) or "compile" (torch.compile); torch backend only
+    VALIDATOR_MAX_LENGTH: int = 128  # tokens per goal, including [CLS]/[SEP]; longer goals are truncated
+    VALIDATOR_LENGTH_BUCKETS: List[int] = [16, 32, 64, 128]  # batches are padded to the smallest bucket that fits
+    CLASSIFIER_ENGINE: str = "mlp"  # "mlp" (FinancialGoalClassifier, Adam) or "linear" (logistic regression, L-BFGS)
+    CLASSIFIER_LINEAR_L2: float = 1.0
+    CLASSIFIER_LINEAR_MAX_ITER: int = 200
+    SIMILARITY_TOP_K: int = 5  # nearest reference phrases returned by GoalValidator.match_references
+    
+    # In-process cache of generated tasks, keyed by goal, analysis fingerprint and day
+    TASK_CACHE_ENABLED: bool = True
+    TASK_CACHE_MAX_SIZE: int = 10000
+    TASK_CACHE_TTL_SECONDS: float = 86400.0
+    TASK_CACHE_AMOUNT_ROUNDING: float = 10.0  # dollars; analyses within this of each other share tasks
+    
+    # Per-user buffer of /generate-next-task responses generated in the background ahead of time
+    TASK_PREFETCH_ENABLED: bool = True
+    TASK_PREFETCH_BUFFER_SIZE: int = 1  # responses kept ready per user
+    TASK_PREFETCH_MAX_CONCURRENT: int = 4  # background generations running at once, across all users
+    TASK_PREFETCH_MAX_USERS: int = 10000
+    
+    # Micro-batching of concurrent /validate-goal requests
+    VALIDATION_BATCHING_ENABLED: bool = True
+    VALIDATION_BATCH_MAX_SIZE: int = 32
+    VALIDATION_BATCH_MAX_WAIT_MS: float = 5.0
+    VALIDATION_BATCH_MAX_QUEUE: int = 512
+    
+    # Bulk /validate-goals endpoint: goals per request, and goals per encoder batch
+    VALIDATION_BULK_MAX_ITEMS: int = 1000
+    VALIDATION_BULK_BATCH_SIZE: int = 128
+    
+    # In-process cache of goal validation results
+    VALIDATION_CACHE_ENABLED: bool = True
+    VALIDATION_CACHE_MAX_SIZE: int = 10000
+    VALIDATION_CACHE_TTL_SECONDS: float = 3600.0
+    
+    # Keyword fast path that decides unambiguous goals without running FinBERT
+    LEXICAL_FASTPATH_ENABLED: bool = True
+    LEXICAL_FASTPATH_THRESHOLD: float = 0.8
+    
+    # Thread pool that runs model inference off the event loop
+    INFERENCE_WORKERS: int = 1
+    INFERENCE_MAX_PENDING: int = 64
+    
+    # Separate inference process (sidecar.py); when set, API workers send goals to it instead of loading FinBERT
+    INFERENCE_SIDECAR_SOCKET: str = ""  # Unix socket path shared by sidecar.py and the API
+    INFERENCE_SIDECAR_TIMEOUT_SECONDS: float = 30.0
+    
+    # CPU threads for model kernels; 0 divides the cores evenly across processes x INFERENCE_WORKERS
+    THREAD_BUDGET_CORES: int = 0  # cores to divide; 0 uses every core this process may run on
+    TORCH_INTRA_OP_THREADS: int = 0
+    TORCH_INTER_OP_THREADS: int = 0  # 0 means 1: BERT's graph has no independent branches to overlap
+    TOKENIZERS_PARALLELISM: bool = False  # the Rust tokenizer's own pool; not fork-safe under serve.py
+    
+    # On-disk cache of validator artifacts (reference embeddings, classifier checkpoint, ONNX graphs)
+    VALIDATOR_CACHE_ENABLED: bool = True
+    VALIDATOR_CACHE_DIR: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.model_cache"))
+    
+    # Persistent SQLite store of goal embeddings shared by all workers
+    EMBEDDING_STORE_ENABLED: bool = True
+    EMBEDDING_STORE_PATH: str = ""  # defaults to goal_embeddings.sqlite3 in VALIDATOR_CACHE_DIR
+    EMBEDDING_STORE_MAX_ENTRIES: int = 100000  # ~3 KB each at FinBERT's 768 dimensions
     
     # Database (if needed later)
     DATABASE_URL: str = "sqlite:///./financial_peak.db"
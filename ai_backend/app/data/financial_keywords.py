@@ -6,7 +6,7 @@ FINANCIAL_GOAL_KEYWORDS = [
     "invest", "investment", "portfolio", "diversify", "retirement", "401k", "ira", "roth ira", "mutual fund", "etf", "stock", "bond",
 
     # budgeting goals
-    "budget", "budgeting", "expense", "spending", "track expenses", "cut costs", "reduce spending"
+    "budget", "budgeting", "expense", "spending", "track expenses", "cut costs", "reduce spending",
 
     # debt goals
     "debt", "pay off debt", "loan", "credit card", "mortgage", "student loan", "debt-free", "debt reduction",
@@ -19,7 +19,7 @@ FINANCIAL_GOAL_KEYWORDS = [
 
     # generalized financial goals
     "financial freedom", "financial independence", "financial security", "wealth", "net worth", "income", "better with money", "manage money", "money management", 
-    "financial literacy", "financial education", "retire early", "frugal", "frugality"
+    "financial literacy", "financial education", "retire early", "frugal", "frugality",
 
     # financial goal sentences
 
@@ -91,7 +91,7 @@ FINANCIAL_GOAL_KEYWORDS = [
     "I want to grow my freelancing business.",
     "My goal is to start a small business.",
     "I will look for higher-paying job opportunities.",
-    "I want to create multiple income streams."
+    "I want to create multiple income streams.",
 
     # General Financial Wellness
     "I want to improve my financial literacy.",
@@ -42,7 +42,7 @@ UNRELATED_KEYWORDS = unrelated_words = [
     # Random Concepts
     "science", "history", "art", "music", "love", "friendship", "adventure", "dream",
     "story", "idea", "magic", "mystery", "puzzle", "language", "culture", "tradition",
-    "holiday", "celebration", "family", "community" 
+    "holiday", "celebration", "family", "community",
 
     # non-financial goals
     
@@ -104,11 +104,11 @@ UNRELATED_KEYWORDS = unrelated_words = [
     "I want to go camping more often.",
     "My goal is to try rock climbing.",
     "I will take a road trip across the country.",
-    "I want to explore more national parks."
+    "I want to explore more national parks.",
 
     #gibberish
     "asdfghjkl", "qwertyuiop", "zxcvbnm", "1234567890", "!@#$%^&*()", "lorem ipsum",
-    "blah blah", "foo bar", "hello world", "test test", "random words", "nonsense", "gibberish", "unrelated", "meaningless"
+    "blah blah", "foo bar", "hello world", "test test", "random words", "nonsense", "gibberish", "unrelated", "meaningless",
     "erji2342jfio", "asdkjfhwe", "qweoiu123", "zmxncbv", "1234asdf", "!!@@##$$", "lorem123", "blah456",
 
     # a lot more sentences non related to finance or financial goals
@@ -1,13 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routes.api import router
+from .services.thread_budget import apply_thread_budget, applied_thread_budget, budget_from_settings, standalone_processes
 from .config import settings
 
+# serve.py applies the budget for all its workers before importing the app; under uvicorn
+# the process count comes from WEB_CONCURRENCY (one when unset). With a sidecar the model
+# (and torch) live in the sidecar process, which applies its own budget.
+if applied_thread_budget() is None and not settings.INFERENCE_SIDECAR_SOCKET:
+    apply_thread_budget(budget_from_settings(processes=standalone_processes()))
+
+from .routes.api import router, goal_validator, goal_dispatcher, inference_executor, sidecar_client, task_generator, task_prefetcher
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the goal validator in the background; /api/v1/ready reports when it is done
+    if goal_validator is not None and settings.VALIDATOR_EAGER_WARMUP:
+        goal_validator.start_background_warmup()
+    yield
+    if sidecar_client is not None:
+        await sidecar_client.close()
+    else:
+        await goal_dispatcher.stop()
+        inference_executor.shutdown()
+    if task_prefetcher is not None:
+        task_prefetcher.close()
+    await task_generator.aclose()
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="Financial Peak API",
         description="AI-powered financial goal tracking and task generation",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     
     # Configure CORS
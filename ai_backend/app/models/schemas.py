@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from datetime import datetime
 
 class GoalValidationRequest(BaseModel):
@@ -12,6 +12,17 @@ class GoalValidationResponse(BaseModel):
     suggestions: Optional[List[str]] = []
     processed_goal: Optional[str] = None
 
+class BulkGoalValidationEntry(BaseModel):
+    """One /validate-goals entry; checked against GoalValidationRequest in the handler, so a bad goal only fails its own item"""
+    goal_text: Any = Field(None, description="The goal, 5-500 characters as for /validate-goal",
+                           json_schema_extra={"type": "string", "minLength": 5, "maxLength": 500})
+    user_id: Optional[Any] = Field(None, json_schema_extra={"type": "string"})
+
+class BulkGoalValidationItem(BaseModel):
+    index: int
+    result: Optional[GoalValidationResponse] = None
+    error: Optional[str] = None
+
 class TaskGenerationRequest(BaseModel):
     validated_goal: str
     financial_profile: 'FinancialProfile'
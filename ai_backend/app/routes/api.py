@@ -1,8 +1,18 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+from typing import List
 from ..models.schemas import *
-from ..services.goal_validator import GoalValidator
-from ..services.task_generator import TaskGenerator
+from ..services.inference_executor import InferenceExecutor, InferenceQueueFull
+from ..services.inference_sidecar import SidecarClient, SidecarUnavailable, SidecarWarmingUp
+from ..services.thread_budget import applied_thread_budget
+from ..services.task_generator import TaskGenerator, task_events, with_fresh_task_ids
+from ..services.single_flight import SingleFlight
+from ..services.task_prefetch import TaskPrefetcher
 from ..services.financial_analyzer import FinancialAnalyzer
+from ..config import settings
+from .disconnect import cancel_on_disconnect
+import json
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -11,44 +21,200 @@ from testing.daily_task_generation.mock_data import create_mock_financial_profil
 router = APIRouter(prefix="/api/v1")
 
 # Initialize services
-goal_validator = GoalValidator()
+if settings.INFERENCE_SIDECAR_SOCKET:
+    # Goals are validated by sidecar.py; this process never imports torch or loads the model
+    sidecar_client = SidecarClient(settings.INFERENCE_SIDECAR_SOCKET, timeout=settings.INFERENCE_SIDECAR_TIMEOUT_SECONDS)
+    goal_validator = inference_executor = goal_dispatcher = None
+else:
+    from ..services.goal_validator import GoalValidator
+    from ..services.batch_dispatcher import GoalBatchDispatcher
+
+    sidecar_client = None
+    goal_validator = GoalValidator()
+    inference_executor = InferenceExecutor(
+        max_workers=settings.INFERENCE_WORKERS,
+        max_pending=settings.INFERENCE_MAX_PENDING
+    )
+    goal_dispatcher = GoalBatchDispatcher(
+        goal_validator,
+        inference_executor,
+        max_batch_size=settings.VALIDATION_BATCH_MAX_SIZE,
+        max_wait_ms=settings.VALIDATION_BATCH_MAX_WAIT_MS,
+        max_queue_size=settings.VALIDATION_BATCH_MAX_QUEUE
+    )
 task_generator = TaskGenerator()
+# Identical concurrent task requests (double taps, retries, open tabs) share one LLM call
+task_flights = SingleFlight()
+task_prefetcher = TaskPrefetcher(
+    buffer_size=settings.TASK_PREFETCH_BUFFER_SIZE,
+    max_concurrent=settings.TASK_PREFETCH_MAX_CONCURRENT,
+    max_users=settings.TASK_PREFETCH_MAX_USERS
+) if settings.TASK_PREFETCH_ENABLED else None
 financial_analyzer = FinancialAnalyzer()
 
 @router.post("/validate-goal", response_model=GoalValidationResponse)
 async def validate_financial_goal(request: GoalValidationRequest):
     """Validate if the user's goal is financially relevant using FinBERT"""
+    if goal_validator is not None and goal_validator.is_warming_up:
+        raise HTTPException(status_code=503, detail="Goal validator is warming up", headers={"Retry-After": "5"})
+
     try:
-        is_valid, confidence, suggestions = goal_validator.validate_goal(request.goal_text)
+        if sidecar_client is not None:
+            is_valid, confidence, suggestions = await sidecar_client.validate_goal(request.goal_text)
+        elif settings.VALIDATION_BATCHING_ENABLED:
+            is_valid, confidence, suggestions = await goal_dispatcher.submit(request.goal_text)
+        else:
+            is_valid, confidence, suggestions = await inference_executor.run(goal_validator.validate_goal, request.goal_text)
         
-        return GoalValidationResponse(
-            is_valid=is_valid,
-            confidence_score=confidence,
-            suggested_improvements=suggestions if suggestions else None,
-            processed_goal=request.goal_text if is_valid else None
-        )
+        return goal_validation_response(request.goal_text, (is_valid, confidence, suggestions))
+    except SidecarWarmingUp as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except (InferenceQueueFull, SidecarUnavailable) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Goal validation failed: {str(e)}")
 
+@router.post("/validate-goals", response_model=List[BulkGoalValidationItem])
+async def validate_financial_goals(requests: List[BulkGoalValidationEntry]):
+    """
+    Validate many goals in one call; results come back in request order, each with its own result or error
+
+    Each entry is checked against GoalValidationRequest on its own, so one goal that is too
+    short or too long only fails its item. An overloaded or unreachable validator fails the
+    whole call with 503, like /validate-goal.
+    """
+    if len(requests) > settings.VALIDATION_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.VALIDATION_BULK_MAX_ITEMS} goals can be validated per request, got {len(requests)}"
+        )
+    if goal_validator is not None and goal_validator.is_warming_up:
+        raise HTTPException(status_code=503, detail="Goal validator is warming up", headers={"Retry-After": "5"})
+
+    items = [None] * len(requests)
+    goals = []
+    for index, entry in enumerate(requests):
+        try:
+            goals.append((index, GoalValidationRequest(**entry.dict()).goal_text))
+        except ValidationError as e:
+            items[index] = BulkGoalValidationItem(index=index, error="Invalid goal: " + "; ".join(error["msg"] for error in e.errors()))
+
+    batch_size = settings.VALIDATION_BULK_BATCH_SIZE
+    # One executor job per chunk, run in turn, so a large import can't occupy every inference slot at once
+    for start in range(0, len(goals), batch_size):
+        chunk = goals[start:start + batch_size]
+        goal_texts = [goal_text for _, goal_text in chunk]
+        try:
+            if sidecar_client is not None:
+                outcomes = await sidecar_client.validate_goals_isolated(goal_texts, batch_size)
+            else:
+                outcomes = await inference_executor.run(goal_validator.validate_goals_isolated, goal_texts, batch_size)
+        except SidecarWarmingUp as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+        except (InferenceQueueFull, SidecarUnavailable) as e:
+            # Not the goals' fault: the client should retry the call, not drop these items
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+        except Exception as e:
+            outcomes = [(None, f"Goal validation failed: {str(e)}")] * len(goal_texts)
+
+        for (index, goal_text), (result, error) in zip(chunk, outcomes):
+            items[index] = BulkGoalValidationItem(
+                index=index,
+                result=goal_validation_response(goal_text, result) if result is not None else None,
+                error=error
+            )
+    return items
+
+def goal_validation_response(goal_text, result):
+    is_valid, confidence, suggestions = result
+    return GoalValidationResponse(
+        is_valid=is_valid,
+        confidence_score=confidence,
+        suggestions=suggestions if suggestions else None,
+        processed_goal=goal_text if is_valid else None
+    )
+
 @router.post("/generate-tasks", response_model=TaskGenerationResponse)  
-async def generate_daily_tasks(request: TaskGenerationRequest):
+async def generate_daily_tasks(request: TaskGenerationRequest, http_request: Request):
     """Generate personalized daily tasks using ChatGPT"""
     try:
         # First analyze the financial profile
         analysis = financial_analyzer.analyze_spending_patterns(request.financial_profile)
         
         # Then generate tasks based on goal and analysis
-        task_response = task_generator.generate_daily_tasks(
-            request.validated_goal,
-            request.financial_profile,
-            analysis
-        )
+        task_response = await cancel_on_disconnect(http_request, generate_tasks_once(request, analysis))
         
         return task_response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Task generation failed: {str(e)}")
 
+def task_generation(request, analysis, next_task):
+    """Coroutine function generating the request's tasks"""
+    def generate():
+        # A next task has to be a new one, so it never comes from the response cache
+        return task_generator.generate_daily_tasks_async(
+            request.validated_goal,
+            request.financial_profile,
+            analysis,
+            use_cache=not next_task
+        )
+    return generate
+
+async def generate_tasks_once(request, analysis, next_task=False):
+    """Generate tasks, joining an identical generation already in flight for the same user"""
+    user_id = request.financial_profile.user_id
+    key = task_generator.cache_key(request.validated_goal, analysis)
+    generate = task_generation(request, analysis, next_task)
+
+    start_call = generate
+    if next_task and task_prefetcher is not None:
+        start_call = lambda: task_prefetcher.next_response(user_id, key, generate)
+
+    task_response, shared = await task_flights.run((next_task, user_id, *key), start_call)
+    # Every caller still gets tasks with ids of its own
+    return with_fresh_task_ids(task_response) if shared else task_response
+
+@router.post("/generate-tasks/stream")
+async def stream_daily_tasks(request: TaskGenerationRequest):
+    """Stream generated tasks as server-sent events: one "task" event per task as soon as it is written, then a summary or error event"""
+    return task_event_stream(request, "Task generation failed")
+
+@router.post("/generate-next-task/stream")
+async def stream_next_task(request: TaskGenerationRequest):
+    """Streaming variant of /generate-next-task, with the same events as /generate-tasks/stream"""
+    return task_event_stream(request, "Next task generation failed", next_task=True)
+
+def task_event_stream(request, failure, next_task=False):
+    try:
+        analysis = financial_analyzer.analyze_spending_patterns(request.financial_profile)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{failure}: {str(e)}")
+
+    async def events():
+        ready = None
+        if next_task and task_prefetcher is not None:
+            # A next task prefetched after the previous one is sent whole; otherwise it is streamed
+            key = task_generator.cache_key(request.validated_goal, analysis)
+            ready = task_prefetcher.take_ready(request.financial_profile.user_id, key, task_generation(request, analysis, next_task))
+        if ready is not None:
+            stream = task_events(ready)
+        else:
+            stream = task_generator.stream_daily_tasks(request.validated_goal, request.financial_profile, analysis, use_cache=not next_task)
+
+        # Starlette closes this generator when the client disconnects, which closes the upstream stream
+        async for event, payload in stream:
+            if event == "task":
+                payload = payload.dict()
+            elif event == "error":
+                payload = {"detail": payload}
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    # No-cache and no proxy buffering, or intermediaries may hold events back until the end
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @router.post("/create-mock-profile")
 async def create_mock_profile(scenario: str = "high_spender", user_id: str = "game_player"):
     """Create a mock financial profile for game integration"""
@@ -63,21 +229,19 @@ async def create_mock_profile(scenario: str = "high_spender", user_id: str = "ga
         raise HTTPException(status_code=500, detail=f"Mock profile creation failed: {str(e)}")
 
 @router.post("/generate-next-task", response_model=TaskGenerationResponse)
-async def generate_next_task(request: TaskGenerationRequest):
+async def generate_next_task(request: TaskGenerationRequest, http_request: Request):
     """Generate the next task after chisel use - simplified for game flow"""
     try:
         # Analyze the financial profile
         analysis = financial_analyzer.analyze_spending_patterns(request.financial_profile)
         
-        # Generate a single next task
-        task_response = task_generator.generate_daily_tasks(
-            request.validated_goal,
-            request.financial_profile,
-            analysis
-        )
+        # Usually already generated in the background after the previous task was handed out
+        task_response = await cancel_on_disconnect(http_request, generate_tasks_once(request, analysis, next_task=True))
         
         return task_response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Next task generation failed: {str(e)}")
 
@@ -85,3 +249,43 @@ async def generate_next_task(request: TaskGenerationRequest):
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "Financial Peak API is running"}
+
+@router.get("/ready")
+async def readiness_check():
+    """Readiness check: 200 once the goal validator is initialized, 503 with per-phase progress until then"""
+    if sidecar_client is not None:
+        try:
+            readiness = await sidecar_client.readiness()
+        except SidecarUnavailable as e:
+            readiness = {"ready": False, "warming_up": False, "phases": {}, "error": str(e)}
+    else:
+        readiness = goal_validator.readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+@router.get("/metrics")
+async def metrics():
+    """Runtime counters for the goal validation pipeline and the task generation cache"""
+    if sidecar_client is not None:
+        try:
+            counters = await sidecar_client.metrics()
+        except SidecarUnavailable as e:
+            counters = {"error": str(e)}
+        return {
+            **counters,
+            "inference_sidecar_client": sidecar_client.snapshot(),
+            "task_generation_cache": task_generator.response_cache.snapshot() if task_generator.response_cache else None,
+            "task_generation_single_flight": task_flights.snapshot(),
+            "task_prefetch": task_prefetcher.snapshot() if task_prefetcher else None
+        }
+
+    return {
+        "goal_validation_batching": goal_dispatcher.metrics.snapshot(),
+        "goal_validation_cache": goal_validator.result_cache.snapshot() if goal_validator.result_cache else None,
+        "lexical_fastpath": goal_validator.lexical_classifier.snapshot() if goal_validator.lexical_classifier else None,
+        "embedding_store": await goal_validator.embedding_store.snapshot_async() if goal_validator.embedding_store else None,
+        "inference_executor": inference_executor.snapshot(),
+        "thread_budget": applied_thread_budget(),
+        "task_generation_cache": task_generator.response_cache.snapshot() if task_generator.response_cache else None,
+        "task_generation_single_flight": task_flights.snapshot(),
+        "task_prefetch": task_prefetcher.snapshot() if task_prefetcher else None
+    }
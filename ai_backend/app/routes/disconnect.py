@@ -0,0 +1,22 @@
+import asyncio
+from fastapi import HTTPException, Request
+
+# How often a long-running handler checks whether its client is still connected
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+async def cancel_on_disconnect(http_request: Request, coro):
+    """Await coro, but cancel it as soon as the client disconnects (no paying for completions nobody reads)"""
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        # Also covers this handler itself being cancelled
+        if not task.done():
+            task.cancel()
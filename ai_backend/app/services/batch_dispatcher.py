@@ -0,0 +1,152 @@
+import asyncio
+import time
+from .inference_executor import InferenceQueueFull
+
+
+class BatchMetrics:
+    """Counters for batch sizes and the time requests spend queued before their batch runs"""
+
+    def __init__(self):
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.batch_size_counts = {}
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    def record_batch(self, queue_waits):
+        size = len(queue_waits)
+        self.batches += 1
+        self.items += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.batch_size_counts[size] = self.batch_size_counts.get(size, 0) + 1
+        self.total_queue_wait += sum(queue_waits)
+        self.max_queue_wait = max(self.max_queue_wait, *queue_waits)
+
+    def snapshot(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": round(self.items / self.batches, 3) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_size_counts": {str(size): count for size, count in sorted(self.batch_size_counts.items())},
+            "average_queue_wait_ms": round(1000 * self.total_queue_wait / self.items, 3) if self.items else 0.0,
+            "max_queue_wait_ms": round(1000 * self.max_queue_wait, 3),
+        }
+
+
+class GoalBatchDispatcher:
+    """
+    Coalesce concurrent goal validations into batched GoalValidator.validate_goals calls.
+
+    Each submit() enqueues one goal and awaits its result. A single worker task takes
+    the first queued goal, keeps collecting for up to `max_wait_ms` or until
+    `max_batch_size` goals are queued, runs one batched validation on the inference
+    executor and fans the results back out to the waiting callers. At most one batch
+    per executor worker is in flight; submit() raises InferenceQueueFull once
+    `max_queue_size` goals are already waiting.
+    """
+
+    def __init__(self, validator, executor, max_batch_size=32, max_wait_ms=5.0, max_queue_size=512):
+        self.validator = validator
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.metrics = BatchMetrics()
+        self._queue = None
+        self._worker = None
+        self._batch_slots = None
+        self._in_flight = set()
+
+    async def submit(self, goal_text):
+        """Queue one goal and wait for its (is_valid, confidence_score, suggestions) result"""
+        self._ensure_worker()
+        if self._queue.qsize() >= self.max_queue_size:
+            raise InferenceQueueFull(f"Goal validation queue is full ({self.max_queue_size} goals waiting)")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((goal_text, future, time.perf_counter()))
+        return await future
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            loop = asyncio.get_running_loop()
+            pending, self._queue = self._queue, asyncio.Queue()
+            # Goals still queued when the old worker died are handed to the new one; those
+            # queued on an earlier event loop have nobody left waiting for them
+            while pending is not None and not pending.empty():
+                item = pending.get_nowait()
+                if item[1].get_loop() is loop and not item[1].done():
+                    self._queue.put_nowait(item)
+            self._batch_slots = asyncio.Semaphore(self.executor.max_workers)
+            self._worker = loop.create_task(self._run())
+
+    async def _collect_batch(self):
+        """Wait for one queued goal, then gather more until the window closes or the batch is full"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Callers that gave up while queued (e.g. client disconnects) are dropped
+        return [item for item in batch if not item[1].done()]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Keep collecting while batches run, but only as many in flight as there are workers
+            await self._batch_slots.acquire()
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                self._batch_slots.release()
+                raise
+            if not batch:
+                self._batch_slots.release()
+                continue
+
+            task = loop.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch):
+        try:
+            started = time.perf_counter()
+            self.metrics.record_batch([started - queued_at for _, _, queued_at in batch])
+
+            try:
+                results = await self.executor.run(self.validator.validate_goals, [goal_text for goal_text, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            # Never leave a caller waiting, e.g. when the batch is cancelled on shutdown
+            for _, future, _ in batch:
+                if not future.done():
+                    future.cancel()
+            self._batch_slots.release()
+
+    async def stop(self):
+        """Cancel the worker and in-flight batches; queued callers are cancelled with them"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        for task in list(self._in_flight):
+            task.cancel()
+        await asyncio.gather(self._worker, *self._in_flight, return_exceptions=True)
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+        self._worker = None
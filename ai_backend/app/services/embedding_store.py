@@ -0,0 +1,185 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_CHUNK = 500
+
+
+def text_key(text):
+    """sha256 of the exact goal text; embeddings depend on case and punctuation, so nothing is normalized"""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class EmbeddingStore:
+    """
+    Persistent goal embedding store shared by every worker process.
+
+    Embeddings are float32 blobs in a SQLite database in WAL mode, keyed by the
+    sha256 of the goal text plus the version of the model that produced them, so
+    concurrent readers never block on a writer and entries survive restarts.
+    Each thread (and each forked worker) opens its own connection.
+
+    `last_used` is refreshed on a hit at most once per `touch_interval` seconds to
+    keep reads from turning into writes. Every `compact_every` inserts the store is
+    trimmed back to `max_entries`, evicting the least recently used entries of any
+    model version, and the database file is vacuumed once enough pages are free.
+    """
+
+    def __init__(self, path, max_entries=100000, compact_every=1000, touch_interval=3600.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._inserts_since_compact = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connection(self):
+        # Connections must not cross a fork, so they are tracked per process as well as per thread
+        if getattr(self._local, "pid", None) != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " text_hash BLOB NOT NULL,"
+                " model_version TEXT NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (text_hash, model_version))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def get_many(self, model_version, texts, dim):
+        """Return {index: vector} for the texts that have a stored embedding under model_version"""
+        keys = [text_key(text) for text in texts]
+        found = {}
+        now = time.time()
+        try:
+            connection = self._connection()
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = list(dict.fromkeys(keys[start:start + _QUERY_CHUNK]))
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT text_hash, vector, last_used FROM embeddings WHERE model_version = ? AND text_hash IN ({placeholders})",
+                    [model_version] + chunk
+                ).fetchall()
+                stale = []
+                for text_hash, vector, last_used in rows:
+                    vector = np.frombuffer(vector, dtype=np.float32)
+                    if vector.shape == (dim,):
+                        found[text_hash] = vector
+                        if now - last_used > self.touch_interval:
+                            stale.append(text_hash)
+                if stale:
+                    connection.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE text_hash = ? AND model_version = ?",
+                        [(now, text_hash, model_version) for text_hash in stale]
+                    )
+        except sqlite3.Error as e:
+            self._record_error("read", e)
+            return {}
+
+        result = {i: found[key] for i, key in enumerate(keys) if key in found}
+        with self._lock:
+            self.hits += len(result)
+            self.misses += len(keys) - len(result)
+        return result
+
+    def put_many(self, model_version, texts, vectors):
+        """Store one float32 embedding per text under model_version"""
+        now = time.time()
+        rows = [
+            (text_key(text), model_version, np.ascontiguousarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+        if not rows:
+            return
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings (text_hash, model_version, vector, last_used) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+        except sqlite3.Error as e:
+            self._record_error("write", e)
+            return
+
+        with self._lock:
+            self.writes += len(rows)
+            self._inserts_since_compact += len(rows)
+            due = self._inserts_since_compact >= self.compact_every
+            if due:
+                self._inserts_since_compact = 0
+        if due:
+            self.compact()
+
+    def compact(self, vacuum_ratio=0.25):
+        """Evict least recently used entries beyond max_entries and reclaim free pages"""
+        try:
+            connection = self._connection()
+            count = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                with connection:
+                    connection.execute("BEGIN")
+                    connection.execute(
+                        "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                        (excess,)
+                    )
+                with self._lock:
+                    self.evictions += excess
+
+            pages = connection.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = connection.execute("PRAGMA freelist_count").fetchone()[0]
+            if pages and free_pages / pages > vacuum_ratio:
+                connection.execute("VACUUM")
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            # Another worker holding a lock just postpones compaction to the next round
+            self._record_error("compact", e)
+
+    def count(self):
+        try:
+            return self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def _record_error(self, operation, error):
+        with self._lock:
+            self.errors += 1
+        print(f"Warning: embedding store {operation} failed: {error}")
+
+    async def snapshot_async(self):
+        """snapshot() from a worker thread: COUNT(*) grows with the store and must not block the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.snapshot)
+
+    def snapshot(self):
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": self.count(),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
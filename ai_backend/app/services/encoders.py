@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import torch
+import torch.nn as nn
+from .model_cache import fingerprint, CACHE_FORMAT_VERSION
+
+# Encoder backends selectable with VALIDATOR_BACKEND
+SUPPORTED_BACKENDS = ("torch", "onnx")
+
+ONNX_OPSET = 17
+
+
+def quantize_encoder(model):
+    """Dynamically quantize the encoder's linear layers to int8 weights for faster, smaller CPU inference"""
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+class TorchEncoder:
+    """Runs a transformers encoder with torch and returns CLS embeddings"""
+
+    name = "torch"
+
+    def __init__(self, model):
+        self.model = model
+        self.hidden_size = model.config.hidden_size
+
+    def encode(self, inputs):
+        """Encode a padded batch of numpy token arrays into a (batch, hidden_size) float32 matrix"""
+        with torch.no_grad():
+            outputs = self.model(**{name: torch.from_numpy(array) for name, array in inputs.items()})
+            # Use CLS token (first token) for sentence representation, which is standard for BERT models
+            return outputs.last_hidden_state[:, 0, :].numpy()
+
+
+class _ClsPooler(nn.Module):
+    """Export wrapper so the ONNX graph returns only the CLS vector instead of every hidden state"""
+
+    def __init__(self, model, input_names):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        outputs = self.model(**dict(zip(self.input_names, inputs)))
+        return outputs.last_hidden_state[:, 0, :]
+
+
+class OnnxEncoder:
+    """
+    Runs the encoder through ONNX Runtime's CPU execution provider.
+
+    The torch model is exported to ONNX once (and, for int8, quantized with ORT's
+    dynamic quantizer) and cached on disk; later starts build the session straight
+    from the cached graph without loading the torch weights. Inference takes numpy
+    inputs, so torch is never touched on the hot path.
+    """
+
+    name = "onnx"
+    OUTPUT_NAME = "cls_embedding"
+
+    def __init__(self, session):
+        self.session = session
+        self.hidden_size = session.get_outputs()[0].shape[1]
+        self.input_names = [model_input.name for model_input in session.get_inputs()]
+
+    @classmethod
+    def load(cls, model_version, precision, tokenizer, cache_dir, load_torch_model, intra_op_threads=0):
+        """Build a session from the cached graph, exporting it from `load_torch_model()` on a cache miss"""
+        import onnxruntime as ort
+
+        model_path = cls.export(model_version, precision, tokenizer, cache_dir, load_torch_model)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        return cls(session)
+
+    @classmethod
+    def export(cls, model_version, precision, tokenizer, cache_dir, load_torch_model):
+        """Return the path of the cached ONNX graph, exporting (and quantizing) it first if needed"""
+        # model_version already includes the precision, so fp32 and int8 graphs get separate entries
+        key = fingerprint(CACHE_FORMAT_VERSION, ONNX_OPSET, model_version, list(tokenizer.model_input_names))[:32]
+        export_dir = os.path.join(cache_dir, "onnx", key)
+        model_path = os.path.join(export_dir, "encoder.onnx")
+        if os.path.exists(model_path):
+            return model_path
+
+        print(f"Exporting encoder to ONNX ({precision})...")
+        os.makedirs(os.path.dirname(export_dir), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(export_dir))
+        try:
+            input_names = list(tokenizer.model_input_names)
+            sample = tokenizer(["export sample", "a longer export sample text"], padding=True, return_tensors="pt")
+            axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+            axes[cls.OUTPUT_NAME] = {0: "batch"}
+            exported_path = os.path.join(tmp_dir, "encoder.fp32.onnx")
+            torch.onnx.export(
+                _ClsPooler(load_torch_model(), input_names).eval(),
+                tuple(sample[name] for name in input_names),
+                exported_path,
+                input_names=input_names,
+                output_names=[cls.OUTPUT_NAME],
+                dynamic_axes=axes,
+                opset_version=ONNX_OPSET,
+                dynamo=False
+            )
+            if precision == "int8":
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                quantize_dynamic(exported_path, os.path.join(tmp_dir, "encoder.onnx"), weight_type=QuantType.QInt8)
+                os.remove(exported_path)
+            else:
+                os.replace(exported_path, os.path.join(tmp_dir, "encoder.onnx"))
+
+            try:
+                os.replace(tmp_dir, export_dir)
+            except OSError:
+                # Another process published the same export first; keep theirs
+                if not os.path.exists(model_path):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return model_path
+
+    def encode(self, inputs):
+        """Encode a padded batch of numpy token arrays into a (batch, hidden_size) float32 matrix"""
+        feeds = {name: inputs[name].astype(np.int64, copy=False) for name in self.input_names}
+        return self.session.run([self.OUTPUT_NAME], feeds)[0]
+
+
+# Ways to fuse the encoder and classifier into one graph, selectable with VALIDATOR_FUSION
+SUPPORTED_FUSIONS = ("none", "trace", "compile")
+
+
+class _FusedGoalModule(nn.Module):
+    """Encoder, CLS pooling and classifier in one module; returns [cls_embedding | probability] rows"""
+
+    def __init__(self, model, classifier, input_names):
+        super().__init__()
+        self.model = model
+        self.classifier = classifier
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        cls_embedding = self.model(**dict(zip(self.input_names, inputs))).last_hidden_state[:, 0, :]
+        return torch.cat([cls_embedding, self.classifier(cls_embedding)], dim=1)
+
+
+class FusedGoalScorer:
+    """
+    Scores tokenized goals with the encoder and classifier fused into one graph.
+
+    "trace" records the module with torch.jit.trace; "compile" hands it to
+    torch.compile. Both run under torch.inference_mode, and the CLS vector goes
+    straight into the classifier as a tensor, so numpy only appears once, at the
+    output. warm_up() runs every padded shape the validator produces (one per length
+    bucket) so tracing, compilation and kernel selection happen at startup instead of
+    on the first requests.
+    """
+
+    def __init__(self, model, classifier, input_names, mode, sample_inputs):
+        self.mode = mode
+        self.input_names = list(input_names)
+        module = _FusedGoalModule(model, classifier, self.input_names).eval()
+        if mode == "trace":
+            with torch.inference_mode(False), torch.no_grad():
+                example = tuple(torch.from_numpy(sample_inputs[name]) for name in self.input_names)
+                self.module = torch.jit.trace(module, example, check_trace=False)
+        elif mode == "compile":
+            self.module = torch.compile(module, dynamic=True)
+        else:
+            raise ValueError(f"Unsupported fusion mode '{mode}', expected one of {SUPPORTED_FUSIONS[1:]}")
+
+    def score(self, inputs):
+        """Return a (batch, hidden_size + 1) matrix: CLS embeddings with the probability as the last column"""
+        with torch.inference_mode():
+            outputs = self.module(*(torch.from_numpy(inputs[name]) for name in self.input_names))
+        return outputs.numpy()
+
+    def warm_up(self, shapes):
+        """Run a dummy batch of each (batch, sequence) shape through the graph"""
+        for shape in shapes:
+            self.score({name: np.ones(shape, dtype=np.int64) for name in self.input_names})
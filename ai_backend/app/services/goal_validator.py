@@ -3,10 +3,41 @@ import torch.nn as nn
 import torch.optim as optim
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.linear_model import LogisticRegression
 from transformers import AutoTokenizer, AutoModel 
 from ..data.financial_keywords import FINANCIAL_GOAL_KEYWORDS
 from ..data.unrelated_keywords import UNRELATED_KEYWORDS
+from ..config import settings
+from .model_cache import ReferenceEmbeddingCache, ClassifierCheckpointCache, classifier_fingerprint, tokenizer_fingerprint
+from .ttl_cache import TTLCache
+from .encoders import SUPPORTED_BACKENDS, SUPPORTED_FUSIONS, TorchEncoder, OnnxEncoder, FusedGoalScorer, quantize_encoder
+from .lexical_matcher import LexicalPreClassifier
+from .reference_index import ReferenceIndex
+from .embedding_store import EmbeddingStore
+from .local_model import read_manifest
+from .thread_budget import applied_thread_budget
+from contextlib import contextmanager
+import os
 import re
+import threading
+import time
+
+# Initialization phases, in the order they run; reported by readiness()
+INIT_PHASES = ("load_model", "reference_embeddings", "train_classifier", "fuse_scorer")
+
+# fp32 runs the encoder as loaded; int8 applies dynamic quantization to its linear layers
+SUPPORTED_PRECISIONS = ("fp32", "int8")
+
+# mlp trains FinancialGoalClassifier with Adam; linear fits LinearGoalClassifier with L-BFGS
+SUPPORTED_CLASSIFIER_ENGINES = ("mlp", "linear")
+
+def length_buckets(buckets, max_length):
+    """Sorted padding lengths up to and including max_length, which is always the last bucket"""
+    return sorted({bucket for bucket in buckets if 0 < bucket < max_length} | {max_length})
+
+def normalize_goal_text(goal_text):
+    """Fold case, punctuation and whitespace so trivially different submissions share a cache entry"""
+    return " ".join(re.sub(r"[^\w\s]", " ", goal_text.lower()).split())
 
 class FinancialGoalClassifier(nn.Module):
     def __init__(self, input_dim=768, hidden_dim=128):
@@ -25,59 +56,357 @@ class FinancialGoalClassifier(nn.Module):
     def forward(self, x):
         return self.classifier(x)
 
+class LinearGoalClassifier(nn.Module):
+    """Logistic-regression probe over the embeddings: one linear layer and a sigmoid"""
+    def __init__(self, input_dim=768):
+        super(LinearGoalClassifier, self).__init__()
+        self.classifier = nn.Sequential(
+            nn.Linear(input_dim, 1),
+            nn.Sigmoid()
+        )
+
+    def forward(self, x):
+        return self.classifier(x)
+
+    def fit(self, X, y, l2=1.0, max_iter=200):
+        """
+        Fit the probe with L2-regularized logistic regression (L-BFGS)
+
+        Features are standardized for the solver, then the scaling is folded back into
+        the linear layer, so inference takes raw embeddings like the MLP does.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        mean = X.mean(axis=0)
+        std = X.std(axis=0)
+        std[std == 0] = 1
+        model = LogisticRegression(C=1 / l2, solver="lbfgs", max_iter=max_iter)
+        model.fit((X - mean) / std, y)
+
+        weight = model.coef_[0] / std
+        bias = model.intercept_[0] - np.dot(weight, mean)
+        linear = self.classifier[0]
+        with torch.no_grad():
+            linear.weight.copy_(torch.from_numpy(weight[np.newaxis, :]).float())
+            linear.bias.fill_(float(bias))
+        return self
+
+class NumpyClassifierHead:
+    """
+    numpy replica of a trained classifier's eval-mode forward pass
+
+    Used with the ONNX backend so scoring a goal never calls into torch. Supports
+    nn.Linear, nn.ReLU and nn.Sigmoid layers; nn.Dropout is a no-op at inference.
+    """
+    def __init__(self, module):
+        self.layers = []
+        for layer in module.modules():
+            if isinstance(layer, nn.Linear):
+                weight = layer.weight.detach().numpy().T.astype(np.float32)
+                bias = layer.bias.detach().numpy().astype(np.float32)
+                self.layers.append(("linear", np.ascontiguousarray(weight), bias))
+            elif isinstance(layer, nn.ReLU):
+                self.layers.append(("relu",))
+            elif isinstance(layer, nn.Sigmoid):
+                self.layers.append(("sigmoid",))
+
+    def __call__(self, x):
+        for layer in self.layers:
+            if layer[0] == "linear":
+                x = x @ layer[1] + layer[2]
+            elif layer[0] == "relu":
+                x = np.maximum(x, 0)
+            else:
+                x = 1 / (1 + np.exp(-x))
+        return x
+
 class GoalValidator:
     def __init__(self):
-        self.model_name = "ProsusAI/finbert"
+        self.model_name = settings.VALIDATOR_MODEL_NAME
+        self.model_revision = settings.VALIDATOR_MODEL_REVISION
+        self.model_dir = settings.VALIDATOR_MODEL_DIR or None
+        if self.model_dir:
+            # Identify a prepared directory by the hub model it was vendored from, so the
+            # artifact caches built from the same weights stay valid either way. The commit,
+            # not the branch name: re-preparing "main" later may bring different weights.
+            manifest = read_manifest(self.model_dir) or {}
+            self.model_name = manifest.get("model_name", os.path.abspath(self.model_dir))
+            self.model_revision = manifest.get("commit") or manifest.get("revision", "local")
+        self.precision = settings.VALIDATOR_PRECISION
+        if self.precision not in SUPPORTED_PRECISIONS:
+            raise ValueError(f"Unsupported VALIDATOR_PRECISION '{self.precision}', expected one of {SUPPORTED_PRECISIONS}")
+        self.backend = settings.VALIDATOR_BACKEND
+        if self.backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Unsupported VALIDATOR_BACKEND '{self.backend}', expected one of {SUPPORTED_BACKENDS}")
+        self.fusion = settings.VALIDATOR_FUSION
+        if self.fusion not in SUPPORTED_FUSIONS:
+            raise ValueError(f"Unsupported VALIDATOR_FUSION '{self.fusion}', expected one of {SUPPORTED_FUSIONS}")
+        if self.fusion != "none" and self.backend != "torch":
+            raise ValueError("VALIDATOR_FUSION requires VALIDATOR_BACKEND=torch")
+        self.max_length = settings.VALIDATOR_MAX_LENGTH
+        if self.max_length < 2:
+            raise ValueError(f"VALIDATOR_MAX_LENGTH must leave room for [CLS] and [SEP], got {self.max_length}")
+        self.length_buckets = length_buckets(settings.VALIDATOR_LENGTH_BUCKETS, self.max_length)
+        self.classifier_engine = settings.CLASSIFIER_ENGINE
+        if self.classifier_engine not in SUPPORTED_CLASSIFIER_ENGINES:
+            raise ValueError(f"Unsupported CLASSIFIER_ENGINE '{self.classifier_engine}', expected one of {SUPPORTED_CLASSIFIER_ENGINES}")
+        self.embedding_cache = ReferenceEmbeddingCache(settings.VALIDATOR_CACHE_DIR) if settings.VALIDATOR_CACHE_ENABLED else None
+        self.classifier_cache = ClassifierCheckpointCache(settings.VALIDATOR_CACHE_DIR) if settings.VALIDATOR_CACHE_ENABLED else None
+        self.embedding_store = EmbeddingStore(
+            settings.EMBEDDING_STORE_PATH or os.path.join(settings.VALIDATOR_CACHE_DIR, "goal_embeddings.sqlite3"),
+            max_entries=settings.EMBEDDING_STORE_MAX_ENTRIES
+        ) if settings.EMBEDDING_STORE_ENABLED else None
+        if self.classifier_engine == "linear":
+            self.classifier_hyperparameters = {
+                "architecture": "LinearGoalClassifier",
+                "input_dim": 768,
+                "l2": settings.CLASSIFIER_LINEAR_L2,
+                "max_iter": settings.CLASSIFIER_LINEAR_MAX_ITER
+            }
+        else:
+            self.classifier_hyperparameters = {
+                "architecture": "FinancialGoalClassifier",
+                "input_dim": 768,
+                "hidden_dim": 128,
+                "epochs": 600,
+                "learning_rate": 0.001
+            }
         self.tokenizer = None
         self.model = None
+        self.encoder = None
+        self.classifier_head = None
+        self.fused_scorer = None
         self.financial_embeddings = None
         self.unrelated_embeddings = None
+        self.reference_index = None
         self.classifier = None
         self.classifier_trained = False
+        self.classifier_version = None
+        self.result_cache = TTLCache(
+            max_size=settings.VALIDATION_CACHE_MAX_SIZE,
+            ttl_seconds=settings.VALIDATION_CACHE_TTL_SECONDS
+        ) if settings.VALIDATION_CACHE_ENABLED else None
+        self.lexical_classifier = LexicalPreClassifier(
+            FINANCIAL_GOAL_KEYWORDS,
+            UNRELATED_KEYWORDS,
+            threshold=settings.LEXICAL_FASTPATH_THRESHOLD
+        ) if settings.LEXICAL_FASTPATH_ENABLED else None
         self._initialized = False
+        self._init_lock = threading.Lock()
+        self._warmup_thread = None
+        self.init_error = None
+        self.phases = {phase: {"status": "pending", "seconds": None} for phase in INIT_PHASES}
     
+    @property
+    def model_version(self):
+        """Identifies the encoder weights, backend and precision that produced an embedding"""
+        return f"{self.model_name}@{self.model_revision}/{self.backend}-{self.precision}"
+
+    @property
+    def embedding_version(self):
+        """Identifies everything that determines an embedding: the model version plus the input length cap"""
+        return f"{self.model_version}/max_length={self.max_length}"
+
+    @property
+    def is_ready(self):
+        return self._initialized
+
+    @property
+    def is_warming_up(self):
+        return self._warmup_thread is not None and self._warmup_thread.is_alive()
+
+    def readiness(self):
+        """Report overall readiness and per-phase initialization progress"""
+        return {
+            "ready": self._initialized,
+            "warming_up": self.is_warming_up,
+            "phases": {phase: dict(state) for phase, state in self.phases.items()},
+            "error": self.init_error
+        }
+
+    @contextmanager
+    def _phase(self, name):
+        """Track status and duration of one initialization phase"""
+        state = self.phases[name]
+        state.update(status="running", seconds=None)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            state.update(status="failed", seconds=round(time.perf_counter() - start, 3))
+            raise
+        state.update(status="done", seconds=round(time.perf_counter() - start, 3))
+
     def _ensure_initialized(self):
         """Lazy initialization of FinBERT model and classifier training"""
         if self._initialized:
             return
-            
-        print("Initializing GoalValidator (downloading FinBERT model and training classifier)...")
-        
-        # Load FinBERT model
-        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self.model = AutoModel.from_pretrained(self.model_name)
-        
-        # Initialize classifier
-        self.classifier = FinancialGoalClassifier()
-        
-        # Initialize embeddings and train classifier
-        self.initialize_reference_embeddings()
-        self.train_classifier()
-        
-        self._initialized = True
-        print("GoalValidator initialization completed.")
+
+        # Single-flight: concurrent callers wait for the one initialization already in progress
+        with self._init_lock:
+            if self._initialized:
+                return
+
+            print(f"Initializing GoalValidator (loading {self.model_dir or self.model_name} and preparing the classifier)...")
+            self.init_error = None
+            try:
+                # Load FinBERT model
+                with self._phase("load_model"):
+                    source, options = self._pretrained_source()
+                    self.tokenizer = AutoTokenizer.from_pretrained(source, **options)
+                    if self.backend == "onnx":
+                        # The torch weights are only loaded if the graph still has to be exported
+                        self.encoder = OnnxEncoder.load(
+                            self.model_version,
+                            self.precision,
+                            self.tokenizer,
+                            settings.VALIDATOR_CACHE_DIR,
+                            self._load_torch_model,
+                            intra_op_threads=(applied_thread_budget() or {}).get("intra_op_threads", 0)
+                        )
+                    else:
+                        self.model = self._load_torch_model()
+                        if self.precision == "int8":
+                            self.model = quantize_encoder(self.model)
+                        self.encoder = TorchEncoder(self.model)
+
+                    # Initialize classifier
+                    self.classifier = self._create_classifier()
+
+                # Initialize embeddings and train classifier
+                with self._phase("reference_embeddings"):
+                    self.initialize_reference_embeddings()
+                with self._phase("train_classifier"):
+                    self.train_classifier()
+                    if self.backend == "onnx":
+                        self.classifier.eval()
+                        self.classifier_head = NumpyClassifierHead(self.classifier)
+                with self._phase("fuse_scorer"):
+                    if self.fusion != "none":
+                        self.build_fused_scorer()
+            except Exception as e:
+                self.init_error = str(e)
+                raise
+
+            self._initialized = True
+            print("GoalValidator initialization completed.")
+
+    def build_fused_scorer(self):
+        """Fuse the encoder and trained classifier into one graph and warm it up on every bucket shape"""
+        self.classifier.eval()
+        try:
+            sample = dict(self.tokenizer(["warm up"], padding="max_length", max_length=self.length_buckets[0], return_tensors="np"))
+            scorer = FusedGoalScorer(self.model, self.classifier, self.tokenizer.model_input_names, self.fusion, sample)
+            batch_size = settings.VALIDATOR_BATCH_SIZE
+            scorer.warm_up([(batch, bucket) for bucket in self.length_buckets for batch in sorted({1, batch_size})])
+        except Exception as e:
+            # Fusion is an optimization; the unfused path still works
+            print(f"Warning: could not build the fused scorer ({self.fusion}), using the unfused path: {e}")
+            return
+        self.fused_scorer = scorer
+        print(f"Fused scorer ready ({self.fusion}).")
+
+    def _create_classifier(self):
+        if self.classifier_engine == "linear":
+            return LinearGoalClassifier(input_dim=self.classifier_hyperparameters["input_dim"])
+        return FinancialGoalClassifier(
+            input_dim=self.classifier_hyperparameters["input_dim"],
+            hidden_dim=self.classifier_hyperparameters["hidden_dim"]
+        )
+
+    def _pretrained_source(self):
+        """Where from_pretrained loads from: the local model directory (strictly offline) or the hub"""
+        if self.model_dir:
+            return self.model_dir, {"local_files_only": True}
+        return self.model_name, {"revision": self.model_revision, "local_files_only": settings.VALIDATOR_OFFLINE}
+
+    def _load_torch_model(self):
+        source, options = self._pretrained_source()
+        if self.model_dir:
+            # safetensors only: no pickle fallback, and the weights are read through a memory map
+            options["use_safetensors"] = True
+        return AutoModel.from_pretrained(source, **options)
+
+    def start_background_warmup(self):
+        """Run initialization in a daemon thread so startup does not block the event loop"""
+        if self._initialized or self.is_warming_up:
+            return self._warmup_thread
+
+        def warmup():
+            try:
+                self._ensure_initialized()
+            except Exception as e:
+                print(f"GoalValidator warm-up failed: {e}")
+
+        self._warmup_thread = threading.Thread(target=warmup, name="goal-validator-warmup", daemon=True)
+        self._warmup_thread.start()
+        return self._warmup_thread
     
     def initialize_reference_embeddings(self):
         """initialize reference embeddings for financial and unrelated keywords"""
-        # Financial embeddings
-        financial_embeds = []
-        for keyword in FINANCIAL_GOAL_KEYWORDS:
-            embedding = self.get_embedding(keyword)
-            financial_embeds.append(embedding)
-        self.financial_embeddings = np.array(financial_embeds)
-
-        # Unrelated embeddings
-        unrelated_embeds = []
-        for keyword in UNRELATED_KEYWORDS:
-            embedding = self.get_embedding(keyword)
-            unrelated_embeds.append(embedding)
-        self.unrelated_embeddings = np.array(unrelated_embeds)
+        cache_key = None
+        if self.embedding_cache is not None:
+            cache_key = self.embedding_cache.make_key(
+                self.embedding_version,
+                tokenizer_fingerprint(self.tokenizer, self.model_revision),
+                FINANCIAL_GOAL_KEYWORDS,
+                UNRELATED_KEYWORDS
+            )
+            cached = self.embedding_cache.load(cache_key)
+            if cached is not None:
+                self.financial_embeddings, self.unrelated_embeddings = cached
+                print(f"Financial and unrelated reference embeddings loaded from cache ({cache_key}).")
+                self.build_reference_index()
+                return
+
+        # Encode both reference sets in one batched pass, then split them back apart
+        embeddings = self.get_embeddings(FINANCIAL_GOAL_KEYWORDS + UNRELATED_KEYWORDS)
+        self.financial_embeddings = embeddings[:len(FINANCIAL_GOAL_KEYWORDS)]
+        self.unrelated_embeddings = embeddings[len(FINANCIAL_GOAL_KEYWORDS):]
 
         print("Financial and unrelated reference embeddings initialized.")
+
+        if cache_key is not None:
+            try:
+                self.embedding_cache.save(
+                    cache_key,
+                    self.financial_embeddings,
+                    self.unrelated_embeddings,
+                    metadata={"model_name": self.model_name, "model_revision": self.model_revision, "precision": self.precision}
+                )
+            except OSError as e:
+                print(f"Warning: could not write reference embedding cache: {e}")
+
+        self.build_reference_index()
+
+    def build_reference_index(self):
+        """Normalize the reference embeddings once into the similarity fallback's nearest-neighbour index"""
+        self.reference_index = ReferenceIndex(
+            FINANCIAL_GOAL_KEYWORDS,
+            self.financial_embeddings,
+            UNRELATED_KEYWORDS,
+            self.unrelated_embeddings
+        )
     
     def train_classifier(self):
-        """Train the neural network classifier on the reference embeddings"""
-        print("Training financial goal classifier...")
+        """Train the classifier on the reference embeddings, reusing a matching checkpoint if one exists"""
+        checkpoint_key = classifier_fingerprint(
+            self.financial_embeddings,
+            self.unrelated_embeddings,
+            self.classifier_hyperparameters
+        )
+        self.classifier_version = f"{self.embedding_version}:{checkpoint_key}"
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+        if self.classifier_cache is not None:
+            state_dict = self.classifier_cache.load(checkpoint_key)
+            if state_dict is not None:
+                self.classifier.load_state_dict(state_dict)
+                self.classifier_trained = True
+                print(f"Classifier restored from checkpoint ({checkpoint_key}).")
+                return
+
+        print(f"Training financial goal classifier ({self.classifier_engine})...")
         
         # Prepare training data
         X_train = np.concatenate([self.financial_embeddings, self.unrelated_embeddings], axis=0)
@@ -85,36 +414,147 @@ class GoalValidator:
             np.ones(len(self.financial_embeddings)),  # Financial goals = 1
             np.zeros(len(self.unrelated_embeddings))  # Non-financial goals = 0
         ])
+
+        if self.classifier_engine == "linear":
+            self.classifier.fit(
+                X_train,
+                y_train,
+                l2=self.classifier_hyperparameters["l2"],
+                max_iter=self.classifier_hyperparameters["max_iter"]
+            )
+        else:
+            self._train_mlp(X_train, y_train)
         
+        self.classifier_trained = True
+        print("Classifier training completed!")
+
+        if self.classifier_cache is not None:
+            try:
+                self.classifier_cache.save(checkpoint_key, self.classifier.state_dict(), self.classifier_hyperparameters)
+            except (OSError, RuntimeError) as e:
+                print(f"Warning: could not write classifier checkpoint: {e}")
+
+    def _train_mlp(self, X_train, y_train):
+        """Train FinancialGoalClassifier with full-batch Adam"""
+        self.classifier.train()
+
         # Convert to PyTorch tensors
         X_tensor = torch.FloatTensor(X_train)
         y_tensor = torch.FloatTensor(y_train).unsqueeze(1)
         
         # Training setup
         criterion = nn.BCELoss()
-        optimizer = optim.Adam(self.classifier.parameters(), lr=0.001)
+        optimizer = optim.Adam(self.classifier.parameters(), lr=self.classifier_hyperparameters["learning_rate"])
         
         # Training loop
-        epochs = 600
+        epochs = self.classifier_hyperparameters["epochs"]
         for epoch in range(epochs):
             optimizer.zero_grad()
             outputs = self.classifier(X_tensor)
             loss = criterion(outputs, y_tensor)
             loss.backward()
             optimizer.step()
-        
-        self.classifier_trained = True
-        print("Classifier training completed!")
     
+    def get_goal_embeddings(self, goal_texts, batch_size=None):
+        """
+        Embeddings for user goals, served from the persistent embedding store where possible
+
+        Only goals the store has not seen under the current embedding version go through
+        the encoder, and their embeddings are written back for every other worker.
+        """
+        goal_texts = list(goal_texts)
+        if self.embedding_store is None:
+            return self.get_embeddings(goal_texts, batch_size=batch_size)
+
+        embeddings = np.zeros((len(goal_texts), self.encoder.hidden_size), dtype=np.float32)
+        stored = self.embedding_store.get_many(self.embedding_version, goal_texts, self.encoder.hidden_size)
+        for i, vector in stored.items():
+            embeddings[i] = vector
+
+        missing = [i for i in range(len(goal_texts)) if i not in stored]
+        if missing:
+            missing_texts = [goal_texts[i] for i in missing]
+            computed = self.get_embeddings(missing_texts, batch_size=batch_size)
+            embeddings[missing] = computed
+            self.embedding_store.put_many(self.embedding_version, missing_texts, computed)
+        return embeddings
+
     def get_embedding(self, text):
         """get embedding for a given text using the transformer model"""
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            # Use CLS token (first token) for sentence representation, which is standard for BERT models
-            embeddings = outputs.last_hidden_state[:, 0, :].squeeze().numpy()
+        return self.get_embeddings([text], batch_size=1)[0]
 
-        return embeddings
+    def get_embeddings(self, texts, batch_size=None):
+        """
+        Get embeddings for many texts with one forward pass per batch
+
+        Inputs are truncated to max_length tokens and grouped by length bucket; every
+        batch is padded to its bucket's fixed length, so the encoder only ever sees a
+        handful of input shapes. Results come back in the original order.
+        """
+        return self._run_batches(texts, batch_size, self.encoder.encode, self.encoder.hidden_size)
+
+    def _run_batches(self, texts, batch_size, run, width):
+        """Tokenize, bucket and pad texts, call run(inputs) per batch and gather its rows in input order"""
+        texts = list(texts)
+        batch_size = batch_size or settings.VALIDATOR_BATCH_SIZE
+        outputs = np.zeros((len(texts), width), dtype=np.float32)
+        if not texts:
+            return outputs
+
+        # Tokenize once without padding; each batch is padded separately below
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        order = np.argsort(lengths, kind="stable")
+
+        for bucket, bucket_indices in self._group_by_bucket(order, lengths):
+            for start in range(0, len(bucket_indices), batch_size):
+                batch_indices = bucket_indices[start:start + batch_size]
+                features = [{key: encoded[key][i] for key in encoded.keys()} for i in batch_indices]
+                inputs = self.tokenizer.pad(features, padding="max_length", max_length=bucket, return_tensors="np")
+                outputs[batch_indices] = run(dict(inputs))
+
+        return outputs
+
+    def _score_goals(self, goal_texts, batch_size=None):
+        """
+        Classifier probabilities for goals
+
+        Goals already in the embedding store only need the classifier. With a fused
+        scorer the rest go through encoder and classifier in one graph, and their
+        embeddings (the scorer returns them alongside) are written back to the store.
+        """
+        goal_texts = list(goal_texts)
+        if self.fused_scorer is None:
+            return self._classify(self.get_goal_embeddings(goal_texts, batch_size=batch_size))
+
+        scores = [None] * len(goal_texts)
+        stored = {}
+        if self.embedding_store is not None:
+            stored = self.embedding_store.get_many(self.embedding_version, goal_texts, self.encoder.hidden_size)
+            if stored:
+                for i, score in zip(stored, self._classify(np.stack(list(stored.values())))):
+                    scores[i] = score
+
+        missing = [i for i in range(len(goal_texts)) if i not in stored]
+        if missing:
+            missing_texts = [goal_texts[i] for i in missing]
+            outputs = self._run_batches(missing_texts, batch_size, self.fused_scorer.score, self.encoder.hidden_size + 1)
+            for i, score in zip(missing, outputs[:, -1]):
+                scores[i] = float(score)
+            if self.embedding_store is not None:
+                self.embedding_store.put_many(self.embedding_version, missing_texts, outputs[:, :-1])
+        return scores
+
+    def _group_by_bucket(self, order, lengths):
+        """Split length-sorted indices into (bucket_length, indices) runs, one per length bucket in use"""
+        groups = []
+        for i in order:
+            bucket = next(b for b in self.length_buckets if b >= lengths[i])
+            if groups and groups[-1][0] == bucket:
+                groups[-1][1].append(i)
+            else:
+                groups.append((bucket, [i]))
+        return [(bucket, np.array(indices)) for bucket, indices in groups]
 
     def validate_goal(self, goal_text):
         """
@@ -129,25 +569,135 @@ class GoalValidator:
         self._ensure_initialized()
         
         # Check minimum word count requirement
-        words = re.findall(r'\b\w+\b', goal_text.lower())
-        if len(words) < 3:
-            print(f"Goal '{goal_text}' rejected: must be at least 3 words long")
-            return False, 0.0, ["Your goal must be at least 3 words long. Please provide a more descriptive financial goal."]
+        rejection = self._check_word_count(goal_text)
+        if rejection is not None:
+            return rejection
         
         if not self.classifier_trained:
             print("Warning: Classifier not trained, falling back to similarity comparison")
             return self.validate_goal_similarity(goal_text)
         
-        # Get embedding for the input goal
-        goal_embedding = self.get_embedding(goal_text)
+        cached = self._cached_result(goal_text)
+        if cached is not None:
+            return cached
+        
+        lexical = self._lexical_result(goal_text)
+        if lexical is not None:
+            return lexical
         
-        # Use the trained classifier
+        # Score the goal with the encoder and the trained classifier
+        confidence_score = self._score_goals([goal_text], batch_size=1)[0]
+        
+        return self._cache_result(goal_text, self._build_result(goal_text, confidence_score))
+
+    def validate_goals(self, goal_texts, batch_size=None):
+        """
+        Validate many goals with batched encoder and classifier passes
+
+        Returns a list of (is_valid, confidence_score, suggestions) tuples in input order.
+        """
+        self._ensure_initialized()
+
+        goal_texts = list(goal_texts)
+        results = [self._check_word_count(goal_text) for goal_text in goal_texts]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        if not self.classifier_trained:
+            print("Warning: Classifier not trained, falling back to similarity comparison")
+            pending_texts = [goal_texts[i] for i in pending]
+            embeddings = self.get_goal_embeddings(pending_texts, batch_size=batch_size)
+            for i, goal_text, embedding in zip(pending, pending_texts, embeddings):
+                results[i] = self._similarity_result(goal_text, embedding)[:3]
+            return results
+
+        # Answer repeats from the result cache and decisive goals lexically; only the rest go through the encoder
+        for i in pending:
+            results[i] = self._cached_result(goal_texts[i])
+            if results[i] is None:
+                results[i] = self._lexical_result(goal_texts[i])
+        pending = [i for i in pending if results[i] is None]
+        if not pending:
+            return results
+
+        confidence_scores = self._score_goals([goal_texts[i] for i in pending], batch_size=batch_size)
+        for i, confidence_score in zip(pending, confidence_scores):
+            results[i] = self._cache_result(goal_texts[i], self._build_result(goal_texts[i], confidence_score))
+        return results
+
+    def validate_goals_isolated(self, goal_texts, batch_size=None):
+        """
+        Like validate_goals, but a goal that fails only fails itself
+
+        Returns a list of (result, error) pairs in input order, where exactly one of the
+        two is None. The whole list is validated in one batched pass; if that pass
+        raises, each goal is retried on its own so one bad input can't sink the rest.
+        """
+        goal_texts = list(goal_texts)
+        try:
+            return [(result, None) for result in self.validate_goals(goal_texts, batch_size=batch_size)]
+        except Exception as e:
+            print(f"Batched validation of {len(goal_texts)} goals failed ({e}); retrying goals one by one")
+
+        outcomes = []
+        for goal_text in goal_texts:
+            try:
+                outcomes.append((self.validate_goal(goal_text), None))
+            except Exception as e:
+                outcomes.append((None, str(e)))
+        return outcomes
+
+    def _lexical_result(self, goal_text):
+        """Return a result without the transformer when the keyword evidence is decisive, otherwise None"""
+        if self.lexical_classifier is None:
+            return None
+        decision = self.lexical_classifier.classify(goal_text)
+        if decision is None:
+            return None
+        _, lexical_score = decision
+        print(f"Goal '{goal_text}': decided lexically (score={lexical_score:.3f})")
+        return self._build_result(goal_text, lexical_score)
+
+    def _cached_result(self, goal_text):
+        """Look up a previous result for an equivalent goal under the current classifier"""
+        if self.result_cache is None:
+            return None
+        cached = self.result_cache.get((self.classifier_version, normalize_goal_text(goal_text)))
+        if cached is None:
+            return None
+        is_valid, confidence_score, suggestions = cached
+        return is_valid, confidence_score, list(suggestions)
+
+    def _cache_result(self, goal_text, result):
+        if self.result_cache is not None:
+            is_valid, confidence_score, suggestions = result
+            self.result_cache.set(
+                (self.classifier_version, normalize_goal_text(goal_text)),
+                (is_valid, confidence_score, tuple(suggestions))
+            )
+        return result
+
+    def _check_word_count(self, goal_text):
+        """Return a rejection result for goals shorter than 3 words, otherwise None"""
+        words = re.findall(r'\b\w+\b', goal_text.lower())
+        if len(words) < 3:
+            print(f"Goal '{goal_text}' rejected: must be at least 3 words long")
+            return False, 0.0, ["Your goal must be at least 3 words long. Please provide a more descriptive financial goal."]
+        return None
+
+    def _classify(self, embeddings):
+        """Run the trained classifier over a matrix of goal embeddings, returning probabilities"""
+        if self.classifier_head is not None:
+            return [float(p) for p in self.classifier_head(np.asarray(embeddings, dtype=np.float32))[:, 0]]
+
         self.classifier.eval()
         with torch.no_grad():
-            embedding_tensor = torch.FloatTensor(goal_embedding).unsqueeze(0)
-            prediction = self.classifier(embedding_tensor)
-            confidence_score = float(prediction.item())
-        
+            predictions = self.classifier(torch.from_numpy(np.asarray(embeddings, dtype=np.float32)))
+        return [float(p) for p in predictions.squeeze(1)]
+
+    def _build_result(self, goal_text, confidence_score):
+        """Turn a classifier probability into (is_valid, confidence_score, suggestions)"""
         # Goal is valid if classifier probability > 0.5
         is_valid = confidence_score > 0.5
         
@@ -164,34 +714,38 @@ class GoalValidator:
     
     def validate_goal_similarity(self, goal_text):
         """Fallback method using similarity comparison"""
-        goal_embedding = self.get_embedding(goal_text)
+        return self._similarity_result(goal_text, self.get_goal_embeddings([goal_text], batch_size=1)[0])[:3]
 
-        # Normalize embeddings to prevent divide by zero errors
-        goal_norm = np.linalg.norm(goal_embedding)
-        if goal_norm == 0:
-            print(f"Warning: Zero embedding for goal '{goal_text}'")
-            return False, 0.0, ["Unable to process this goal. Please try a different phrasing."]
-        
-        goal_embedding = goal_embedding / goal_norm
+    def match_references(self, goal_text, k=None):
+        """
+        Similarity verdict plus the reference phrases closest to the goal
+
+        Returns (is_valid, confidence_score, suggestions, matches), where matches lists
+        the k nearest reference phrases as {"phrase", "category", "similarity"} dicts.
+        """
+        self._ensure_initialized()
+        if k is None:
+            k = settings.SIMILARITY_TOP_K
+        return self._similarity_result(goal_text, self.get_goal_embeddings([goal_text], batch_size=1)[0], k)
 
-        # Normalize reference embeddings
-        financial_norms = np.linalg.norm(self.financial_embeddings, axis=1, keepdims=True)
-        financial_norms[financial_norms == 0] = 1
-        financial_embeddings_norm = self.financial_embeddings / financial_norms
+    def _similarity_result(self, goal_text, goal_embedding, k=0):
+        """
+        Compare one goal embedding against every reference phrase with a single matrix-vector product
 
-        unrelated_norms = np.linalg.norm(self.unrelated_embeddings, axis=1, keepdims=True)
-        unrelated_norms[unrelated_norms == 0] = 1
-        unrelated_embeddings_norm = self.unrelated_embeddings / unrelated_norms
+        The verdict only needs the two maxima; the k nearest phrases are ranked only when asked for.
+        """
+        if self.reference_index is None:
+            self.build_reference_index()
 
-        # Calculate similarities
-        financial_similarities = np.dot(financial_embeddings_norm, goal_embedding)
-        max_financial_similarity = np.max(financial_similarities)
+        # Zero embeddings can't be normalized, so there is nothing to compare
+        if not np.any(goal_embedding):
+            print(f"Warning: Zero embedding for goal '{goal_text}'")
+            return False, 0.0, ["Unable to process this goal. Please try a different phrasing."], []
 
-        unrelated_similarities = np.dot(unrelated_embeddings_norm, goal_embedding)
-        max_unrelated_similarity = np.max(unrelated_similarities)
+        max_financial_similarity, max_unrelated_similarity, matches = self.reference_index.search(goal_embedding, k)[0]
 
         is_valid = max_financial_similarity > max_unrelated_similarity
-        confidence_score = float(max_financial_similarity)
+        confidence_score = max_financial_similarity
 
         suggestions = []
         if not is_valid:
@@ -200,5 +754,5 @@ class GoalValidator:
             else:
                 suggestions.append("Your goal could be more clearly financial. Try incorporating terms like 'save', 'invest', or 'budget'.")
             
-        return is_valid, confidence_score, suggestions
+        return is_valid, confidence_score, suggestions, matches
 
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InferenceQueueFull(Exception):
+    """Raised when inference work is rejected because the queue is at capacity"""
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool that keeps blocking model inference off the event loop.
+
+    torch and the tokenizers release the GIL during their heavy kernels, so a small
+    thread pool gives real parallelism without duplicating the model per process.
+    At most `max_pending` jobs may be running or queued; beyond that run() raises
+    InferenceQueueFull immediately so callers can shed load instead of piling up.
+    """
+
+    def __init__(self, max_workers=1, max_pending=64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def pending(self):
+        return self._pending
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the pool and await its result"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise InferenceQueueFull(f"Inference queue is full ({self.max_pending} pending jobs)")
+            self._pending += 1
+            self.submitted += 1
+
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        # Release the slot when the job actually finishes, even if the awaiting request is cancelled
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+            if future is None or future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def snapshot(self):
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,284 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+from .inference_executor import InferenceQueueFull
+from .thread_budget import applied_thread_budget
+
+# Requests and responses are single JSON lines; a full bulk chunk of goals must fit in one
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class SidecarUnavailable(Exception):
+    """Raised when the inference sidecar can't be reached or dropped the connection"""
+
+
+class SidecarWarmingUp(Exception):
+    """Raised while the sidecar's goal validator is still initializing"""
+
+
+def encode_result(result):
+    """(is_valid, confidence_score, suggestions) as plain JSON types (the model returns numpy scalars)"""
+    is_valid, confidence, suggestions = result
+    return [bool(is_valid), float(confidence), list(suggestions) if suggestions else None]
+
+
+def decode_result(result):
+    is_valid, confidence, suggestions = result
+    return is_valid, confidence, suggestions
+
+
+class SidecarServer:
+    """
+    Serve a GoalValidator to other processes over a Unix domain socket.
+
+    Clients send one JSON object per line: {"id": 7, "op": "validate", "goal": "..."}.
+    Each reply carries the same id, so a connection can have many requests in flight
+    and replies may come back out of order. Single goals from every connection go
+    through one GoalBatchDispatcher, so API workers' requests are batched together.
+
+    Ops: "validate" (one goal), "validate_many" (a list of goals, per-goal result or
+    error), "ready" (the validator's readiness report), "health" and "metrics".
+    Failed requests reply {"ok": false, "code": ..., "error": ...} where code is
+    "warming_up" or "queue_full" (retry later), "bad_request" or "error".
+    """
+
+    def __init__(self, validator, dispatcher, executor):
+        self.validator = validator
+        self.dispatcher = dispatcher
+        self.executor = executor
+        self.started_at = time.time()
+        self.connections = 0
+        self.requests = 0
+        self.errors = {}
+        self.path = None
+        self._server = None
+
+    async def start(self, path):
+        self.path = path
+        if os.path.exists(path):
+            # A socket left behind by a sidecar that didn't shut down cleanly
+            os.unlink(path)
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=path, limit=MAX_MESSAGE_BYTES)
+        # Only processes running as the same user (or group) may talk to the model
+        os.chmod(path, 0o660)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+        await self.dispatcher.stop()
+
+    async def _handle_connection(self, reader, writer):
+        self.connections += 1
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.get_running_loop().create_task(self._reply(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            print(f"Inference sidecar: dropping connection: {e}")
+        except asyncio.CancelledError:
+            # Shutdown; asyncio would otherwise log the cancelled connection handler as an error
+            pass
+        finally:
+            self.connections -= 1
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _reply(self, line, writer, write_lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = {"id": request_id, "ok": True, **await self._handle(request)}
+        except Exception as e:
+            code = self._error_code(e)
+            self.errors[code] = self.errors.get(code, 0) + 1
+            response = {"id": request_id, "ok": False, "code": code, "error": str(e)}
+
+        async with write_lock:
+            try:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    def _error_code(error):
+        if isinstance(error, SidecarWarmingUp):
+            return "warming_up"
+        if isinstance(error, InferenceQueueFull):
+            return "queue_full"
+        if isinstance(error, (ValueError, KeyError, TypeError, AttributeError)):
+            return "bad_request"
+        return "error"
+
+    async def _handle(self, request):
+        self.requests += 1
+        op = request["op"]
+        if op == "health":
+            return {"status": "healthy", "pid": os.getpid(), "uptime_seconds": round(time.time() - self.started_at, 3)}
+        if op == "ready":
+            return {"readiness": self.validator.readiness()}
+        if op == "metrics":
+            return {"metrics": await self.metrics()}
+
+        if op not in ("validate", "validate_many"):
+            raise ValueError(f"Unknown op {op!r}")
+        if self.validator.is_warming_up:
+            raise SidecarWarmingUp("Goal validator is warming up")
+        if op == "validate":
+            return {"result": encode_result(await self.dispatcher.submit(str(request["goal"])))}
+
+        goals = [str(goal) for goal in request["goals"]]
+        outcomes = await self.executor.run(self.validator.validate_goals_isolated, goals, request.get("batch_size"))
+        return {"outcomes": [[encode_result(result) if result is not None else None, error] for result, error in outcomes]}
+
+    async def metrics(self):
+        validator = self.validator
+        return {
+            "goal_validation_batching": self.dispatcher.metrics.snapshot(),
+            "goal_validation_cache": validator.result_cache.snapshot() if validator.result_cache else None,
+            "lexical_fastpath": validator.lexical_classifier.snapshot() if validator.lexical_classifier else None,
+            "embedding_store": await validator.embedding_store.snapshot_async() if validator.embedding_store else None,
+            "inference_executor": self.executor.snapshot(),
+            "thread_budget": applied_thread_budget(),
+            "sidecar": {"connections": self.connections, "requests": self.requests, "errors": dict(self.errors)},
+        }
+
+
+class SidecarClient:
+    """
+    Talk to a SidecarServer from an API worker; never imports torch.
+
+    One connection per process (and event loop) is opened on first use and shared by
+    all requests, which are matched to replies by id. If the connection drops, waiting
+    requests fail with SidecarUnavailable and the next request reconnects. Replies with
+    code "queue_full" raise InferenceQueueFull and "warming_up" raises SidecarWarmingUp,
+    so callers can answer 503 just as they do for the in-process validator.
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._writer = None
+        self._reader_task = None
+        self._connect_lock = None
+        self._write_lock = None
+        self._loop = None
+        self.requests = 0
+        self.failures = 0
+        self.reconnects = 0
+
+    async def validate_goal(self, goal_text):
+        return decode_result((await self.request("validate", goal=goal_text))["result"])
+
+    async def validate_goals_isolated(self, goal_texts, batch_size=None):
+        response = await self.request("validate_many", goals=list(goal_texts), batch_size=batch_size)
+        return [(decode_result(result) if result is not None else None, error) for result, error in response["outcomes"]]
+
+    async def readiness(self):
+        return (await self.request("ready"))["readiness"]
+
+    async def health(self):
+        return await self.request("health")
+
+    async def metrics(self):
+        return (await self.request("metrics"))["metrics"]
+
+    async def request(self, op, **fields):
+        """Send one request and wait for its reply (without "id" and "ok")"""
+        self.requests += 1
+        request_id = next(self._ids)
+        await self._ensure_connected()
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+        try:
+            async with self._write_lock:
+                self._writer.write(json.dumps({"id": request_id, "op": op, **fields}).encode("utf-8") + b"\n")
+                await self._writer.drain()
+            response = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            self.failures += 1
+            raise SidecarUnavailable(f"Inference sidecar did not answer {op!r} within {self.timeout}s")
+        except ConnectionError as e:
+            self.failures += 1
+            raise SidecarUnavailable(f"Inference sidecar connection failed: {e}")
+        finally:
+            self._pending.pop(request_id, None)
+
+        if response.get("ok"):
+            return {key: value for key, value in response.items() if key not in ("id", "ok")}
+        if response.get("code") == "queue_full":
+            raise InferenceQueueFull(response.get("error"))
+        if response.get("code") == "warming_up":
+            raise SidecarWarmingUp(response.get("error"))
+        raise RuntimeError(response.get("error"))
+
+    async def _ensure_connected(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (e.g. a forked worker): nothing can be reused
+            self._loop = loop
+            self._writer = None
+            self._connect_lock = asyncio.Lock()
+            self._write_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path, limit=MAX_MESSAGE_BYTES)
+            except OSError as e:
+                self.failures += 1
+                raise SidecarUnavailable(f"Inference sidecar is not reachable at {self.path}: {e}")
+            if self._reader_task is not None:
+                self.reconnects += 1
+            self._reader_task = loop.create_task(self._read_replies(reader, self._writer))
+
+    async def _read_replies(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.get(response.get("id"))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (ConnectionError, ValueError) as e:
+            print(f"Inference sidecar connection lost: {e}")
+        finally:
+            writer.close()
+            # Nothing still waiting can be answered on this connection any more
+            for future in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed by the inference sidecar"))
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+    def snapshot(self):
+        return {
+            "socket": self.path,
+            "connected": self._writer is not None and not self._writer.is_closing(),
+            "in_flight": len(self._pending),
+            "requests": self.requests,
+            "failures": self.failures,
+            "reconnects": self.reconnects,
+        }
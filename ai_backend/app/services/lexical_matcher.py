@@ -0,0 +1,125 @@
+import re
+import threading
+from collections import deque
+
+FINANCIAL = "financial"
+UNRELATED = "unrelated"
+
+
+def tokenize(text):
+    """Lowercased word tokens; phrase matching happens on these, so matches respect word boundaries"""
+    return re.findall(r"\w+", text.lower())
+
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Built once from a list of (phrase, label) pairs; find() then reports every
+    occurrence of every phrase in a token sequence in a single left-to-right pass,
+    regardless of how many phrases were added.
+    """
+
+    def __init__(self, phrases):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        for phrase, label in phrases:
+            tokens = tokenize(phrase)
+            if tokens:
+                self._add(tokens, label)
+        self._build_failure_links()
+
+    def _add(self, tokens, label):
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        if (label, len(tokens)) not in self._outputs[node]:
+            self._outputs[node].append((label, len(tokens)))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                # A match ending here also ends every phrase that is a suffix of it
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def find(self, tokens):
+        """Yield (label, phrase_length) for every phrase occurrence in tokens"""
+        node = 0
+        for token in tokens:
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            yield from self._outputs[node]
+
+
+class LexicalPreClassifier:
+    """
+    Cheap keyword-based verdict that runs ahead of the transformer.
+
+    Every matched reference phrase adds its length in words as evidence for its list,
+    so "pay off debt" counts more than "debt" alone. The lexical score is the
+    Laplace-smoothed share of financial evidence, (financial + 0.5) / (total + 1):
+    0.5 with no matches, approaching 1 or 0 as one side's evidence grows. A score at or
+    above `threshold` is decisively financial, one at or below 1 - threshold is
+    decisively unrelated, and anything in between is left to the model.
+    """
+
+    PRIOR = 0.5
+
+    def __init__(self, financial_phrases, unrelated_phrases, threshold=0.8):
+        self.threshold = threshold
+        self._automaton = PhraseAutomaton(
+            [(phrase, FINANCIAL) for phrase in financial_phrases]
+            + [(phrase, UNRELATED) for phrase in unrelated_phrases]
+        )
+        self._lock = threading.Lock()
+        self.decided_valid = 0
+        self.decided_invalid = 0
+        self.undecided = 0
+
+    def score(self, text):
+        """Return the lexical score in [0, 1]; higher means more financial"""
+        evidence = {FINANCIAL: 0, UNRELATED: 0}
+        for label, length in self._automaton.find(tokenize(text)):
+            evidence[label] += length
+        total = evidence[FINANCIAL] + evidence[UNRELATED]
+        return (evidence[FINANCIAL] + self.PRIOR) / (total + 2 * self.PRIOR)
+
+    def classify(self, text):
+        """Return (is_valid, score) when the lexical evidence is decisive, otherwise None"""
+        score = self.score(text)
+        with self._lock:
+            if score >= self.threshold:
+                self.decided_valid += 1
+                return True, score
+            if score <= 1 - self.threshold:
+                self.decided_invalid += 1
+                return False, score
+            self.undecided += 1
+            return None
+
+    def snapshot(self):
+        decided = self.decided_valid + self.decided_invalid
+        total = decided + self.undecided
+        return {
+            "threshold": self.threshold,
+            "decided_valid": self.decided_valid,
+            "decided_invalid": self.decided_invalid,
+            "undecided": self.undecided,
+            "fast_path_rate": round(decided / total, 4) if total else 0.0,
+        }
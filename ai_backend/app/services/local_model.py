@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+# Written by prepare_model() next to the vendored weights
+MANIFEST_FILE = "prepared_model.json"
+
+
+def read_manifest(model_dir):
+    """Return the manifest of a prepared model directory, or None if it has none"""
+    try:
+        with open(os.path.join(model_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def prepare_model(model_name, revision, output_dir, force=False):
+    """
+    Download a hub model once and vendor it into output_dir for offline loading.
+
+    Weights are re-saved as model.safetensors (FinBERT is published as a pickled
+    pytorch_model.bin), which loads without unpickling and is read through a memory
+    map. The tokenizer is saved alongside. The directory is assembled in a temp dir
+    and moved into place only once complete, so a failed download never leaves a
+    half-written model behind. Returns the manifest.
+
+    An existing output_dir is only replaced if it is empty or a previously prepared
+    model (it has a manifest); anything else raises FileExistsError unless force=True.
+    """
+    if os.path.lexists(output_dir) and read_manifest(output_dir) is None and not force:
+        if not os.path.isdir(output_dir) or os.listdir(output_dir):
+            raise FileExistsError(
+                f"{output_dir} exists and is not a prepared model directory; refusing to replace it (--force overwrites it)"
+            )
+
+    from transformers import AutoTokenizer, AutoModel
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    model = AutoModel.from_pretrained(model_name, revision=revision)
+
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        tokenizer.save_pretrained(tmp_dir)
+        model.save_pretrained(tmp_dir, safe_serialization=True)
+        manifest = {
+            "model_name": model_name,
+            "revision": revision,
+            "commit": getattr(model.config, "_commit_hash", None),
+            "prepared_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "files": sorted(os.listdir(tmp_dir)),
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.isdir(output_dir) and not os.path.islink(output_dir):
+            shutil.rmtree(output_dir)
+        elif os.path.lexists(output_dir):
+            os.remove(output_dir)
+        os.replace(tmp_dir, output_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return manifest
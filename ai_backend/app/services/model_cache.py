@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import torch
+
+# Bump whenever the on-disk layout or the way embeddings are computed changes
+CACHE_FORMAT_VERSION = 1
+
+
+def fingerprint(*parts):
+    """Stable sha256 hex digest over JSON-serializable parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def array_fingerprint(*arrays):
+    """sha256 hex digest over the shape, dtype and raw bytes of numpy arrays"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode("utf-8"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def classifier_fingerprint(financial_embeddings, unrelated_embeddings, hyperparameters):
+    """Fingerprint the classifier's training data and hyperparameters"""
+    return fingerprint(
+        CACHE_FORMAT_VERSION,
+        array_fingerprint(financial_embeddings, unrelated_embeddings),
+        hyperparameters,
+    )[:32]
+
+
+def tokenizer_fingerprint(tokenizer, revision):
+    """Identify a tokenizer by its configured revision and the contents of its vocabulary"""
+    vocab = sorted(tokenizer.get_vocab().items())
+    return fingerprint(revision, type(tokenizer).__name__, vocab)[:16]
+
+
+class ReferenceEmbeddingCache:
+    """
+    Versioned on-disk store for the financial/unrelated reference embedding matrices.
+
+    Each entry lives in its own directory named after a key derived from the model version,
+    tokenizer revision and the keyword lists, so any change to those inputs misses the
+    cache and the matrices are rebuilt. Matrices are stored as .npy files and loaded
+    memory-mapped, which makes a warm start a couple of page faults instead of hundreds
+    of FinBERT forward passes.
+    """
+
+    FINANCIAL_FILE = "financial.npy"
+    UNRELATED_FILE = "unrelated.npy"
+    META_FILE = "meta.json"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.join(cache_dir, "reference_embeddings")
+
+    def make_key(self, model_version, tokenizer_revision, financial_keywords, unrelated_keywords):
+        """Build the cache key for a given model version (name, revision, precision), tokenizer and keyword set"""
+        return fingerprint(
+            CACHE_FORMAT_VERSION,
+            model_version,
+            tokenizer_revision,
+            list(financial_keywords),
+            list(unrelated_keywords),
+        )[:32]
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """Return (financial, unrelated) memory-mapped arrays, or None on a cache miss"""
+        entry_dir = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, self.META_FILE)) as f:
+                meta = json.load(f)
+            if meta.get("format_version") != CACHE_FORMAT_VERSION:
+                return None
+            financial = np.load(os.path.join(entry_dir, self.FINANCIAL_FILE), mmap_mode="r")
+            unrelated = np.load(os.path.join(entry_dir, self.UNRELATED_FILE), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+        if financial.shape[0] != meta.get("financial_count") or unrelated.shape[0] != meta.get("unrelated_count"):
+            return None
+        return financial, unrelated
+
+    def save(self, key, financial_embeddings, unrelated_embeddings, metadata=None):
+        """Atomically write an entry and drop entries left behind by older inputs"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+        try:
+            np.save(os.path.join(tmp_dir, self.FINANCIAL_FILE), np.ascontiguousarray(financial_embeddings, dtype=np.float32))
+            np.save(os.path.join(tmp_dir, self.UNRELATED_FILE), np.ascontiguousarray(unrelated_embeddings, dtype=np.float32))
+            meta = dict(metadata or {})
+            meta.update({
+                "format_version": CACHE_FORMAT_VERSION,
+                "financial_count": int(len(financial_embeddings)),
+                "unrelated_count": int(len(unrelated_embeddings)),
+            })
+            with open(os.path.join(tmp_dir, self.META_FILE), "w") as f:
+                json.dump(meta, f, indent=2)
+
+            entry_dir = self._entry_dir(key)
+            if os.path.isdir(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                # Another process published the same entry first; keep theirs
+                if not os.path.isdir(entry_dir):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.prune(keep=key)
+
+    def prune(self, keep):
+        """Remove every cache entry except `keep` (in-progress writes are left alone)"""
+        for name in os.listdir(self.cache_dir):
+            if name != keep and not name.startswith(".tmp-"):
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+
+class ClassifierCheckpointCache:
+    """
+    On-disk checkpoint of the trained goal classifier.
+
+    The state_dict is stored together with classifier_fingerprint() of the training embeddings
+    and hyperparameters; a checkpoint is only reused when that fingerprint matches,
+    so changed reference data or training settings always trigger retraining.
+    """
+
+    CHECKPOINT_FILE = "classifier.pt"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.join(cache_dir, "classifier")
+        self.path = os.path.join(self.cache_dir, self.CHECKPOINT_FILE)
+
+    def load(self, key):
+        """Return the saved state_dict if it was trained under `key`, otherwise None"""
+        try:
+            checkpoint = torch.load(self.path, map_location="cpu", weights_only=True)
+        except (OSError, RuntimeError, EOFError, ValueError):
+            return None
+        if checkpoint.get("fingerprint") != key:
+            return None
+        return checkpoint["state_dict"]
+
+    def save(self, key, state_dict, hyperparameters=None):
+        """Atomically replace the checkpoint with one trained under `key`"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="classifier-", suffix=".tmp", dir=self.cache_dir)
+        os.close(fd)
+        try:
+            torch.save({
+                "fingerprint": key,
+                "hyperparameters": dict(hyperparameters or {}),
+                "state_dict": state_dict,
+            }, tmp_path)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,69 @@
+import numpy as np
+
+FINANCIAL = "financial"
+UNRELATED = "unrelated"
+
+
+def normalize_rows(matrix):
+    """Return a contiguous float32 copy of matrix with unit-length rows; all-zero rows stay zero"""
+    matrix = np.array(matrix, dtype=np.float32, order="C")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    matrix /= norms
+    return matrix
+
+
+class ReferenceIndex:
+    """
+    Exact cosine nearest-neighbour index over the reference phrases.
+
+    Financial and unrelated embeddings are normalized once and stored in a single
+    contiguous float32 matrix, financial rows first. A query is then one
+    matrix-vector product (one matrix-matrix product for a batch); the best
+    financial and unrelated similarities are maxima over the two row ranges and the
+    top-k rows come from argpartition, so the cost stays linear in the number of
+    references with no per-query normalization or sorting of the full set.
+    """
+
+    def __init__(self, financial_phrases, financial_embeddings, unrelated_phrases, unrelated_embeddings):
+        if len(financial_phrases) != len(financial_embeddings) or len(unrelated_phrases) != len(unrelated_embeddings):
+            raise ValueError("Each reference phrase needs exactly one embedding")
+        self.phrases = list(financial_phrases) + list(unrelated_phrases)
+        self.financial_count = len(financial_phrases)
+        self.matrix = normalize_rows(np.concatenate([financial_embeddings, unrelated_embeddings], axis=0))
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def category(self, row):
+        return FINANCIAL if row < self.financial_count else UNRELATED
+
+    def search(self, queries, k=0):
+        """
+        Score a (batch, dim) matrix of query embeddings against every reference.
+
+        Returns one (max_financial_similarity, max_unrelated_similarity, matches) tuple
+        per query, where matches lists the k closest references as
+        {"phrase", "category", "similarity"} dicts, most similar first. Zero queries
+        score 0.0 against everything.
+        """
+        queries = normalize_rows(np.atleast_2d(queries))
+        similarities = queries @ self.matrix.T
+        k = min(k, len(self.phrases))
+
+        results = []
+        for row in similarities:
+            max_financial = float(row[:self.financial_count].max()) if self.financial_count else 0.0
+            max_unrelated = float(row[self.financial_count:].max()) if len(row) > self.financial_count else 0.0
+            results.append((max_financial, max_unrelated, self._top_k(row, k)))
+        return results
+
+    def _top_k(self, similarities, k):
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [
+            {"phrase": self.phrases[i], "category": self.category(i), "similarity": round(float(similarities[i]), 4)}
+            for i in top
+        ]
@@ -0,0 +1,60 @@
+import asyncio
+
+
+class _Flight:
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Let concurrent identical calls share one execution.
+
+    The first run() for a key starts the call; every run() with the same key while it
+    is in flight awaits that same call instead of starting another. Returns
+    (result, shared), where shared is True for the callers that piggybacked. A caller
+    that is cancelled (e.g. its client disconnected) only stops waiting; the call
+    itself is cancelled once nobody is waiting for it any more.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.calls = 0
+        self.deduplicated = 0
+
+    async def run(self, key, start_call):
+        """Await the in-flight call for key, starting it with start_call() if there is none"""
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.deduplicated += 1
+        else:
+            flight = _Flight(asyncio.ensure_future(start_call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.calls += 1
+
+        flight.waiters += 1
+        try:
+            # shield: one waiter being cancelled must not cancel the call for the others
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Forget it right away, so a new caller starts afresh rather than joining a cancelled call
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _forget(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def snapshot(self):
+        requests = self.calls + self.deduplicated
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "deduplicated": self.deduplicated,
+            "deduplication_rate": round(self.deduplicated / requests, 4) if requests else 0.0,
+        }
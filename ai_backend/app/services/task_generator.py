@@ -1,21 +1,257 @@
+import asyncio
+import hashlib
+import httpx
 import openai
 import json
+import time
 import uuid
 from ..models.schemas import DailyTask, TaskGenerationResponse
 from ..config import settings
+from .ttl_cache import TTLCache
+from .task_stream import IncrementalTaskParser
+
+TASK_MODEL = "gpt-4o-mini"
+
+def analysis_fingerprint(analysis, rounding=10.0):
+    """
+    Stable hash of the parts of a spending analysis that go into the prompt
+
+    Amounts are rounded to the nearest `rounding` dollars, so a coffee bought since the
+    last call doesn't count as a different analysis; categories keep their order.
+    """
+    amount = lambda value: round(float(value) / rounding) * rounding if rounding else round(float(value), 2)
+    summary = {
+        "total": amount(analysis["total_monthly_spending"]),
+        "average": amount(analysis["average_transaction"]),
+        "top": list(analysis["top_categories"]),
+        "opportunities": [
+            [opp["category"], amount(opp["current_spending"]), amount(opp["potential_savings"])]
+            for opp in analysis["savings_opportunities"]
+        ],
+    }
+    return hashlib.sha256(json.dumps(summary, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+def normalize_task_goal(goal):
+    """Fold case and whitespace; punctuation stays, since amounts like "$1,000" matter to the prompt"""
+    return " ".join(goal.lower().split())
+
+async def task_events(response):
+    """The events stream_daily_tasks yields, for a response that is already complete"""
+    for task in response.tasks:
+        yield "task", task
+    yield "summary", {"total_potential_impact": response.total_potential_impact, "analysis_summary": response.analysis_summary}
+
+def with_fresh_task_ids(response):
+    """Copy of a TaskGenerationResponse whose tasks have new ids"""
+    return TaskGenerationResponse(
+        tasks=[DailyTask(**{**task.dict(), "id": str(uuid.uuid4())}) for task in response.tasks],
+        total_potential_impact=response.total_potential_impact,
+        analysis_summary=response.analysis_summary
+    )
 
 class TaskGenerator:
-    def __init__(self):
+    def __init__(self, clock=time.time):
         api_key = settings.OPENAI_API_KEY
-        self.client = openai.OpenAI(api_key=api_key) if api_key else None
+        self.client = openai.OpenAI(api_key=api_key, **self._client_options()) if api_key else None
+        self._async_client = None
+        self._async_loop = None
+        self._clock = clock
+        self.response_cache = TTLCache(
+            max_size=settings.TASK_CACHE_MAX_SIZE,
+            ttl_seconds=settings.TASK_CACHE_TTL_SECONDS
+        ) if settings.TASK_CACHE_ENABLED else None
+
+    def _client_options(self):
+        options = {"max_retries": settings.OPENAI_MAX_RETRIES, "timeout": self._timeout()}
+        if settings.OPENAI_BASE_URL:
+            options["base_url"] = settings.OPENAI_BASE_URL
+        return options
+
+    def _timeout(self):
+        """Fail fast if the API can't be reached; allow slow completions, but not forever"""
+        return openai.Timeout(settings.OPENAI_READ_TIMEOUT_SECONDS, connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS)
+
+    @property
+    def async_client(self):
+        """
+        AsyncOpenAI client over one pooled HTTP connection pool, or None without an API key
+
+        Connections to the API are kept alive and shared by every request in this
+        process. The pool is tied to the event loop it was first used on, so a new
+        loop (a forked worker, a test) gets its own client.
+        """
+        if not settings.OPENAI_API_KEY:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            http_client = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS
+                ),
+                timeout=self._timeout()
+            )
+            self._async_client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, http_client=http_client, **self._client_options())
+            self._async_loop = loop
+        return self._async_client
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
 
     def generate_daily_tasks(self, goal: str, financial_profile, analysis):
         """Generate 1-3 personalized daily tasks using ChatGPT"""
+        prompt = self.build_prompt(goal, financial_profile, analysis)
+
+        # If no OpenAI API key, return mock tasks for testing
+        if not self.client:
+            print("OpenAI API key not found, generating mock tasks for testing...")
+            return self._generate_mock_tasks(goal, analysis)
         
+        cached = self._cached_response(goal, analysis)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.client.chat.completions.create(**self._completion_request(prompt))
+            return self._cache_response(goal, analysis, self._parse_tasks(response.choices[0].message.content))
+        except Exception as e:
+            return self._error_response(goal, analysis, e)
+
+    async def generate_daily_tasks_async(self, goal: str, financial_profile, analysis, use_cache=True):
+        """
+        Like generate_daily_tasks, but awaits the completion instead of blocking the event loop
+
+        Cancelling the awaiting task (e.g. when the HTTP client disconnects) aborts the
+        in-flight request to the API. use_cache=False always asks the model for new tasks.
+        """
+        prompt = self.build_prompt(goal, financial_profile, analysis)
+
+        client = self.async_client
+        if not client:
+            print("OpenAI API key not found, generating mock tasks for testing...")
+            return self._generate_mock_tasks(goal, analysis)
+
+        cached = self._cached_response(goal, analysis) if use_cache else None
+        if cached is not None:
+            return cached
+
+        try:
+            response = await client.chat.completions.create(**self._completion_request(prompt))
+            tasks = self._parse_tasks(response.choices[0].message.content)
+            return self._cache_response(goal, analysis, tasks) if use_cache else tasks
+        except Exception as e:
+            return self._error_response(goal, analysis, e)
+
+    async def stream_daily_tasks(self, goal: str, financial_profile, analysis, use_cache=True):
+        """
+        Yield ("task", DailyTask) as each task of the completion is finished, then one
+        ("summary", {"total_potential_impact", "analysis_summary"}) event
+
+        The completion is streamed and parsed incrementally, so the first task is
+        available long before the model has written the rest. Failures are yielded as
+        ("error", message) after whatever tasks were already sent. Closing the generator
+        (e.g. the HTTP client disconnects) closes the upstream stream. use_cache=False
+        always asks the model for new tasks.
+        """
+        prompt = self.build_prompt(goal, financial_profile, analysis)
+
+        response = self._cached_response(goal, analysis) if use_cache else None
+        client = self.async_client
+        if response is None and not client:
+            print("OpenAI API key not found, generating mock tasks for testing...")
+            response = self._generate_mock_tasks(goal, analysis)
+        if response is not None:
+            async for event in task_events(response):
+                yield event
+            return
+
+        parser = IncrementalTaskParser()
+        tasks = []
+        try:
+            stream = await client.chat.completions.create(stream=True, **self._completion_request(prompt))
+            try:
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    for task_data in parser.feed(chunk.choices[0].delta.content):
+                        task = self._build_task(task_data)
+                        tasks.append(task)
+                        yield "task", task
+            finally:
+                await stream.close()
+
+            parsed_response = parser.finish()
+            response = TaskGenerationResponse(
+                tasks=tasks,
+                total_potential_impact=sum(task.estimated_impact for task in tasks),
+                analysis_summary=parsed_response["analysis_summary"]
+            )
+        except Exception as e:
+            if tasks:
+                print("Error streaming tasks:", e)
+                yield "error", f"Error generating tasks: {str(e)}"
+                return
+            # Nothing was sent yet, so the usual fallback (mock tasks on quota errors) still applies
+            response = self._error_response(goal, analysis, e)
+            for task in response.tasks:
+                yield "task", task
+            if not response.tasks:
+                yield "error", response.analysis_summary
+                return
+        else:
+            if use_cache:
+                self._cache_response(goal, analysis, response)
+        yield "summary", {"total_potential_impact": response.total_potential_impact, "analysis_summary": response.analysis_summary}
+
+    def cache_key(self, goal, analysis):
+        """Same goal, effectively the same analysis, same day: the same tasks are good enough"""
+        day = time.strftime("%Y-%m-%d", time.localtime(self._clock()))
+        return normalize_task_goal(goal), analysis_fingerprint(analysis, settings.TASK_CACHE_AMOUNT_ROUNDING), day
+
+    def _cached_response(self, goal, analysis):
+        """Replay cached tasks under fresh ids, so the game never sees the same task id twice"""
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get(self.cache_key(goal, analysis))
+        if cached is None:
+            return None
+        tasks, total_impact, summary = cached
+        return TaskGenerationResponse(
+            tasks=[DailyTask(id=str(uuid.uuid4()), **task) for task in tasks],
+            total_potential_impact=total_impact,
+            analysis_summary=summary
+        )
+
+    def _cache_response(self, goal, analysis, response):
+        # Only real completions are cached; error and fallback responses are never replayed
+        if self.response_cache is not None and response.tasks:
+            self.response_cache.set(
+                self.cache_key(goal, analysis),
+                (tuple(task.dict(exclude={"id"}) for task in response.tasks), response.total_potential_impact, response.analysis_summary)
+            )
+        return response
+
+    def _completion_request(self, prompt):
+        return dict(
+            model=TASK_MODEL,
+            messages=[
+                {"role": "system", "content": "You are a helpful financial advisor."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=1000,
+            timeout=self._timeout()
+        )
+
+    def build_prompt(self, goal, financial_profile, analysis):
+        """Build the task generation prompt for ChatGPT"""
         # Prepare context for ChatGPT
         context = self.build_context(goal, financial_profile, analysis)
         
-        prompt = f"""
+        return f"""
         You are a financial advisor AI. Based on the user's goal and spending analysis, 
         generate 1-3 specific, actionable daily tasks that will help them achieve their goal.
         
@@ -45,64 +281,52 @@ class TaskGenerator:
         }}
         """
 
-        # If no OpenAI API key, return mock tasks for testing
-        if not self.client:
-            print("OpenAI API key not found, generating mock tasks for testing...")
+    def _parse_tasks(self, response_text):
+        """Convert ChatGPT's JSON answer into a TaskGenerationResponse"""
+        parsed_response = json.loads(response_text)
+        
+        # Convert to proper models
+        tasks = []
+        total_impact = 0
+        
+        for task_data in parsed_response["tasks"]:
+            task = self._build_task(task_data)
+            tasks.append(task)
+            total_impact += task.estimated_impact
+        
+        return TaskGenerationResponse(
+            tasks=tasks,
+            total_potential_impact=total_impact,
+            analysis_summary=parsed_response["analysis_summary"]
+        )
+
+    def _build_task(self, task_data):
+        return DailyTask(
+            id=str(uuid.uuid4()),
+            title=task_data["title"],
+            description=task_data["description"],
+            estimated_impact=task_data["estimated_impact"],
+            difficulty=task_data["difficulty"],
+            category=task_data["category"],
+            actionable_steps=task_data["actionable_steps"]
+        )
+
+    def _error_response(self, goal, analysis, e):
+        # Print error for debugging
+        print("Error generating tasks:", e)
+        
+        # Check if this is a quota/usage limit error
+        error_str = str(e).lower()
+        if "quota" in error_str or "usage" in error_str or "insufficient_quota" in error_str or "429" in str(e):
+            print("⚠️  OpenAI API quota/usage limit reached - using default mock task instead")
             return self._generate_mock_tasks(goal, analysis)
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful financial advisor."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
-            )
-            
-            response_text = response.choices[0].message.content
-            parsed_response = json.loads(response_text)
-            
-            # Convert to proper models
-            tasks = []
-            total_impact = 0
-            
-            for task_data in parsed_response["tasks"]:
-                task = DailyTask(
-                    id=str(uuid.uuid4()),
-                    title=task_data["title"],
-                    description=task_data["description"],
-                    estimated_impact=task_data["estimated_impact"],
-                    difficulty=task_data["difficulty"],
-                    category=task_data["category"],
-                    actionable_steps=task_data["actionable_steps"]
-                )
-                tasks.append(task)
-                total_impact += task.estimated_impact
-            
-            return TaskGenerationResponse(
-                tasks=tasks,
-                total_potential_impact=total_impact,
-                analysis_summary=parsed_response["analysis_summary"]
-            )
-            
-        except Exception as e:
-            # Print error for debugging
-            print("Error generating tasks:", e)
-            
-            # Check if this is a quota/usage limit error
-            error_str = str(e).lower()
-            if "quota" in error_str or "usage" in error_str or "insufficient_quota" in error_str or "429" in str(e):
-                print("⚠️  OpenAI API quota/usage limit reached - using default mock task instead")
-                return self._generate_mock_tasks(goal, analysis)
-            
-            # Return empty response with error message for other errors
-            return TaskGenerationResponse(
-                tasks=[],
-                total_potential_impact=0.0,
-                analysis_summary=f"Error generating tasks: {str(e)}"
-            )
+        # Return empty response with error message for other errors
+        return TaskGenerationResponse(
+            tasks=[],
+            total_potential_impact=0.0,
+            analysis_summary=f"Error generating tasks: {str(e)}"
+        )
     
     def build_context(self, goal, financial_profile, analysis):
         """Build context string for ChatGPT"""
@@ -0,0 +1,145 @@
+import asyncio
+from collections import OrderedDict, deque
+
+
+class _UserBuffer:
+    def __init__(self, key):
+        self.key = key
+        self.responses = deque()
+        self.refill = None
+        self.invalidated = False
+
+
+class TaskPrefetcher:
+    """
+    Per-user buffer of next-task responses generated ahead of time.
+
+    next_response() hands out a buffered response when there is one, and otherwise
+    waits for the refill already running for that user or generates one on the spot.
+    Either way it then starts a background refill so the buffer holds up to
+    `buffer_size` responses by the time the player finishes the current task.
+
+    A buffer belongs to one key (goal, analysis fingerprint, day): a request with a
+    different key drops it and cancels its refill. At most `max_concurrent` refills
+    run at once across all users, and buffers are kept for the `max_users` most
+    recently active users only.
+    """
+
+    def __init__(self, buffer_size=1, max_concurrent=4, max_users=10000):
+        self.buffer_size = buffer_size
+        self.max_concurrent = max_concurrent
+        self.max_users = max_users
+        self._buffers = OrderedDict()
+        self._slots = None
+        self.hits = 0
+        self.waited = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.refills = 0
+        self.refill_failures = 0
+
+    async def next_response(self, user_id, key, generate):
+        """Return the user's next TaskGenerationResponse; `generate()` makes a new one"""
+        buffer = self._buffer_for(user_id, key)
+        waited = False
+        if not buffer.responses and buffer.refill is not None and not buffer.refill.done():
+            # The next response is already being made; waiting for it beats starting another.
+            # wait() rather than await: our caller going away must not cancel the refill.
+            await asyncio.wait({buffer.refill})
+            waited = True
+
+        if buffer.responses:
+            if waited:
+                self.waited += 1
+            else:
+                self.hits += 1
+            response = buffer.responses.popleft()
+        else:
+            self.misses += 1
+            response = await generate()
+
+        self._schedule_refill(buffer, generate)
+        return response
+
+    def take_ready(self, user_id, key, generate):
+        """
+        Pop the user's buffered response without waiting, or None if there isn't one
+
+        For callers that generate in their own way on a miss (the streaming endpoint);
+        either way the buffer is refilled for the request after this one.
+        """
+        buffer = self._buffer_for(user_id, key)
+        response = None
+        if buffer.responses:
+            self.hits += 1
+            response = buffer.responses.popleft()
+        else:
+            self.misses += 1
+        self._schedule_refill(buffer, generate)
+        return response
+
+    def _buffer_for(self, user_id, key):
+        buffer = self._buffers.get(user_id)
+        if buffer is not None and buffer.key != key:
+            # New goal, changed spending or a new day: what was prefetched no longer fits
+            self.invalidations += 1
+            self._drop(buffer)
+            buffer = None
+        if buffer is None:
+            buffer = self._buffers[user_id] = _UserBuffer(key)
+        self._buffers.move_to_end(user_id)
+        while len(self._buffers) > self.max_users:
+            _, oldest = self._buffers.popitem(last=False)
+            self._drop(oldest)
+        return buffer
+
+    def _drop(self, buffer):
+        buffer.invalidated = True
+        buffer.responses.clear()
+        if buffer.refill is not None:
+            buffer.refill.cancel()
+
+    def _schedule_refill(self, buffer, generate):
+        if buffer.invalidated or len(buffer.responses) >= self.buffer_size:
+            return
+        if buffer.refill is None or buffer.refill.done():
+            buffer.refill = asyncio.ensure_future(self._refill(buffer, generate))
+
+    async def _refill(self, buffer, generate):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        async with self._slots:
+            while not buffer.invalidated and len(buffer.responses) < self.buffer_size:
+                self.refills += 1
+                try:
+                    response = await generate()
+                except Exception as e:
+                    self.refill_failures += 1
+                    print(f"Task prefetch failed: {e}")
+                    return
+                if not response.tasks:
+                    # An error response; the next request generates (and reports) on its own
+                    self.refill_failures += 1
+                    return
+                if not buffer.invalidated:
+                    buffer.responses.append(response)
+
+    def close(self):
+        for buffer in self._buffers.values():
+            self._drop(buffer)
+        self._buffers.clear()
+
+    def snapshot(self):
+        requests = self.hits + self.waited + self.misses
+        return {
+            "users": len(self._buffers),
+            "buffered": sum(len(buffer.responses) for buffer in self._buffers.values()),
+            "refilling": sum(1 for buffer in self._buffers.values() if buffer.refill is not None and not buffer.refill.done()),
+            "hits": self.hits,
+            "waited": self.waited,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+            "invalidations": self.invalidations,
+            "refills": self.refills,
+            "refill_failures": self.refill_failures,
+        }
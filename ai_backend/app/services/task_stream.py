@@ -0,0 +1,77 @@
+import json
+
+
+class IncrementalTaskParser:
+    """
+    Pick complete task objects out of a JSON answer while it is still streaming in.
+
+    The model answers {"tasks": [{...}, {...}], "analysis_summary": "..."} a few
+    characters at a time. feed() scans only the new text, tracking strings, escapes
+    and nesting, and returns each object of the top-level "tasks" array as soon as
+    its closing brace arrives. Anything before the first "{" (e.g. a ```json fence)
+    is ignored. finish() parses the whole document once the stream has ended.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._position = 0
+        self._start = None  # index of the document's opening brace
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None
+        self._last_string = None
+        self._tasks_depth = None  # stack depth inside the "tasks" array
+        self._task_start = None
+
+    def feed(self, text):
+        """Add streamed text; return the task dicts completed by it"""
+        self.buffer += text
+        completed = []
+        while self._position < len(self.buffer):
+            index = self._position
+            char = self.buffer[index]
+            self._position += 1
+
+            if self._start is None:
+                if char == "{":
+                    self._start = index
+                    self._stack.append(char)
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = self.buffer[self._string_start + 1:index]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                self._stack.append(char)
+                if char == "[" and len(self._stack) == 2 and self._last_string == "tasks":
+                    self._tasks_depth = len(self._stack)
+                elif char == "{" and self._tasks_depth is not None and len(self._stack) == self._tasks_depth + 1:
+                    self._task_start = index
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if char == "}" and self._task_start is not None and len(self._stack) == self._tasks_depth:
+                    completed.append(json.loads(self.buffer[self._task_start:index + 1]))
+                    self._task_start = None
+                elif char == "]" and self._tasks_depth is not None and len(self._stack) == self._tasks_depth - 1:
+                    self._tasks_depth = None
+        return completed
+
+    def finish(self):
+        """Parse the complete document (raises ValueError if the answer isn't valid JSON)"""
+        if self._start is None:
+            raise ValueError("No JSON object in the model's answer")
+        end = self.buffer.rindex("}")
+        return json.loads(self.buffer[self._start:end + 1])
@@ -0,0 +1,104 @@
+import os
+
+# Native libraries size their thread pools from these when they are first loaded
+NATIVE_THREAD_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# The budget this process is running with, once apply_thread_budget() has been called
+_applied = None
+
+
+def available_cores():
+    """Cores this process may run on (respects taskset/cgroup CPU affinity)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def compute_thread_budget(processes, inference_threads, cores=0, intra_op_threads=0, inter_op_threads=0,
+                          tokenizers_parallelism=False):
+    """
+    Split the machine's cores between every thread that runs model kernels.
+
+    Each serving process has `inference_threads` threads calling into torch, and every
+    such call fans out to its own intra-op team. Left at torch's default (one thread per
+    core), N processes x M inference threads ask for N*M times the cores that exist and
+    tail latency suffers. The automatic budget gives each of them an equal share.
+    Explicit intra/inter-op values (> 0) are used as is.
+    """
+    cores = cores or available_cores()
+    processes = max(1, processes)
+    inference_threads = max(1, inference_threads)
+    auto_intra = max(1, cores // (processes * inference_threads))
+    return {
+        "cores": cores,
+        "processes": processes,
+        "inference_threads": inference_threads,
+        "intra_op_threads": intra_op_threads or auto_intra,
+        # Inter-op parallelism only helps graphs with independent branches; BERT has none
+        "inter_op_threads": inter_op_threads or 1,
+        "tokenizers_parallelism": tokenizers_parallelism,
+        "auto": not intra_op_threads,
+    }
+
+
+def standalone_processes():
+    """
+    Serving processes when the app is started by uvicorn rather than serve.py.
+
+    uvicorn does not tell its workers how many of them there are, but --workers defaults
+    to WEB_CONCURRENCY, so that is the count when it is set and one process otherwise.
+    """
+    try:
+        return max(1, int(os.environ.get("WEB_CONCURRENCY") or 1))
+    except ValueError:
+        return 1
+
+
+def budget_from_settings(processes):
+    """Thread budget for `processes` serving processes, from the THREAD_* settings"""
+    from ..config import settings
+    return compute_thread_budget(
+        processes,
+        settings.INFERENCE_WORKERS,
+        cores=settings.THREAD_BUDGET_CORES,
+        intra_op_threads=settings.TORCH_INTRA_OP_THREADS,
+        inter_op_threads=settings.TORCH_INTER_OP_THREADS,
+        tokenizers_parallelism=settings.TOKENIZERS_PARALLELISM,
+    )
+
+
+def set_thread_environment(budget):
+    """Export the budget to libraries that read it from the environment at load time"""
+    for name in NATIVE_THREAD_VARIABLES:
+        os.environ.setdefault(name, str(budget["intra_op_threads"]))
+    # The tokenizer's own pool is not fork-safe and competes with torch for the same cores
+    os.environ["TOKENIZERS_PARALLELISM"] = "true" if budget["tokenizers_parallelism"] else "false"
+
+
+def apply_thread_budget(budget):
+    """Apply the budget to this process's torch thread pools and log it"""
+    global _applied
+    set_thread_environment(budget)
+
+    import torch
+    torch.set_num_threads(budget["intra_op_threads"])
+    try:
+        torch.set_num_interop_threads(budget["inter_op_threads"])
+    except RuntimeError:
+        # Only settable before the first inter-op task runs (e.g. re-applied in a forked worker)
+        pass
+
+    _applied = dict(budget, intra_op_threads=torch.get_num_threads(), inter_op_threads=torch.get_num_interop_threads())
+    print(
+        f"Thread budget ({'auto' if budget['auto'] else 'explicit'}): {budget['cores']} cores, "
+        f"{budget['processes']} processes x {budget['inference_threads']} inference threads, "
+        f"torch intra-op={_applied['intra_op_threads']} inter-op={_applied['inter_op_threads']}, "
+        f"tokenizers parallelism={'on' if budget['tokenizers_parallelism'] else 'off'}"
+    )
+    return _applied
+
+
+def applied_thread_budget():
+    """The budget applied in this process, or None if none has been"""
+    return _applied
@@ -0,0 +1,62 @@
+"""
+Vendor the goal validator's encoder for offline serving.
+
+Downloads the model and tokenizer once, re-saves the weights as safetensors into a
+local directory, then checks that the directory loads with the hub disabled.
+Point VALIDATOR_MODEL_DIR at the result; the server then never touches the network.
+With --warm-caches it also builds the reference embeddings and classifier (and the
+ONNX graph when VALIDATOR_BACKEND=onnx), so the first boot does no model work at all.
+
+An existing --output directory is only replaced if it holds a previously prepared
+model; pass --force to overwrite any other directory.
+
+Usage: python prepare_model.py [--model NAME] [--revision REV] [--output DIR] [--force] [--warm-caches]
+"""
+import argparse
+import os
+import sys
+import time
+from app.config import settings
+from app.services.local_model import prepare_model
+
+
+def default_output_dir(model_name):
+    return settings.VALIDATOR_MODEL_DIR or os.path.join(settings.VALIDATOR_CACHE_DIR, "models", model_name.replace("/", "--"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.VALIDATOR_MODEL_NAME, help="Hub id to vendor (default: %(default)s)")
+    parser.add_argument("--revision", default=settings.VALIDATOR_MODEL_REVISION)
+    parser.add_argument("--output", help="Target directory (default: VALIDATOR_MODEL_DIR or the model cache)")
+    parser.add_argument("--force", action="store_true", help="Replace --output even if it isn't a prepared model directory")
+    parser.add_argument("--warm-caches", action="store_true", help="Also build the validator's on-disk caches")
+    args = parser.parse_args()
+
+    output_dir = os.path.abspath(args.output or default_output_dir(args.model))
+    print(f"Preparing {args.model}@{args.revision} in {output_dir}...")
+    try:
+        manifest = prepare_model(args.model, args.revision, output_dir, force=args.force)
+    except FileExistsError as e:
+        parser.error(str(e))
+    print(f"Saved {', '.join(manifest['files'])}")
+
+    # Everything below runs as the server would: from the directory, with the hub disabled
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    settings.VALIDATOR_MODEL_DIR = output_dir
+    from app.services.goal_validator import GoalValidator
+    validator = GoalValidator()
+
+    start = time.perf_counter()
+    validator._load_torch_model()
+    print(f"Offline load check passed: weights loaded in {time.perf_counter() - start:.2f}s")
+
+    if args.warm_caches:
+        validator._ensure_initialized()
+        print("Validator caches warmed:", {phase: state["seconds"] for phase, state in validator.phases.items()})
+
+    print(f"\nServe it with:\n  VALIDATOR_MODEL_DIR={output_dir}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
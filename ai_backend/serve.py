@@ -0,0 +1,141 @@
+"""
+Production server: warm the goal validator once, then fork uvicorn workers.
+
+The parent process loads FinBERT, builds the reference embeddings and trains (or
+restores) the classifier before any worker exists. It then freezes the garbage
+collector and forks WORKERS children that serve the same listening socket. The
+model weights, embedding arrays and classifier live in pages the workers only
+read, so they stay shared copy-on-write instead of being loaded once per worker.
+With INFERENCE_SIDECAR_SOCKET set, the model lives in sidecar.py instead and the
+workers forked here only run the API.
+
+Usage: python serve.py [--workers N] [--host HOST] [--port PORT]
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+from app.config import settings
+from app.services.thread_budget import apply_thread_budget, budget_from_settings
+
+WARMUP_GOAL = "I want to save money for retirement"
+
+
+def bind_socket(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def warm_up():
+    """Initialize everything workers would otherwise each build for themselves"""
+    from app.main import app
+    from app.routes.api import goal_validator
+
+    if goal_validator is None:
+        print(f"Goal validation is served by the inference sidecar at {settings.INFERENCE_SIDECAR_SOCKET}")
+        return app
+
+    start = time.perf_counter()
+    goal_validator._ensure_initialized()
+    # One real validation so lazily created inference state exists before the fork
+    goal_validator.validate_goal(WARMUP_GOAL)
+    if goal_validator.result_cache is not None:
+        goal_validator.result_cache.clear()
+    print(f"Goal validator warmed up in the parent in {time.perf_counter() - start:.1f}s")
+
+    # Move every object that exists now out of the GC's reach, so collections in the
+    # workers don't write to (and un-share) the pages holding them
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+class PreforkServer:
+    """Fork uvicorn workers over one shared socket and replace any that die"""
+
+    def __init__(self, app, sock, workers, log_level):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.log_level = log_level
+        self.children = set()
+        self.stopping = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            # uvicorn installs its own handlers; start from the defaults, not the parent's
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                config = uvicorn.Config(self.app, log_level=self.log_level)
+                uvicorn.Server(config).run(sockets=[self.sock])
+            except BaseException as e:
+                print(f"Worker {os.getpid()} failed: {e}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.children.add(pid)
+        print(f"Started worker {pid}")
+
+    def stop(self, signum=None, frame=None):
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        for _ in range(self.workers):
+            self.spawn()
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            self.children.discard(pid)
+            if not self.stopping:
+                print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting it")
+                self.spawn()
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS)
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    args = parser.parse_args()
+
+    # Before torch does any work: every worker inherits these pool sizes, and each gets
+    # its share of the cores. Workers also inherit a tokenizer that was already used,
+    # whose thread pool is not fork-safe, so tokenizer parallelism stays off by default.
+    if not settings.INFERENCE_SIDECAR_SOCKET:
+        apply_thread_budget(budget_from_settings(processes=args.workers))
+
+    # The parent already initialized the validator; a background warm-up per worker would be a no-op
+    settings.VALIDATOR_EAGER_WARMUP = False
+    app = warm_up()
+    sock = bind_socket(args.host, args.port)
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} forked workers")
+    PreforkServer(app, sock, args.workers, "debug" if settings.DEBUG else "info").run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
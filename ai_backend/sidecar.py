@@ -0,0 +1,68 @@
+"""
+Inference sidecar: one process owns the goal validator and serves it over a Unix socket.
+
+Start it next to the API and point the API at the same socket:
+
+    python sidecar.py --socket /tmp/financial-peak-inference.sock
+    INFERENCE_SIDECAR_SOCKET=/tmp/financial-peak-inference.sock python serve.py --workers 8
+
+The API workers then never import torch or load FinBERT, so they start instantly,
+use little memory and can be scaled without touching the model. Goals from all of
+them are micro-batched together here. The sidecar gets the whole thread budget.
+
+Usage: python sidecar.py [--socket PATH]
+"""
+import argparse
+import asyncio
+import signal
+import sys
+from app.config import settings
+from app.services.thread_budget import apply_thread_budget, budget_from_settings
+from app.services.inference_sidecar import SidecarServer
+
+DEFAULT_SOCKET = "/tmp/financial-peak-inference.sock"
+
+
+async def serve(path):
+    from app.services.goal_validator import GoalValidator
+    from app.services.batch_dispatcher import GoalBatchDispatcher
+    from app.services.inference_executor import InferenceExecutor
+
+    validator = GoalValidator()
+    executor = InferenceExecutor(max_workers=settings.INFERENCE_WORKERS, max_pending=settings.INFERENCE_MAX_PENDING)
+    dispatcher = GoalBatchDispatcher(
+        validator,
+        executor,
+        max_batch_size=settings.VALIDATION_BATCH_MAX_SIZE,
+        max_wait_ms=settings.VALIDATION_BATCH_MAX_WAIT_MS,
+        max_queue_size=settings.VALIDATION_BATCH_MAX_QUEUE
+    )
+    server = SidecarServer(validator, dispatcher, executor)
+    await server.start(path)
+    # Clients get "warming_up" replies (and /ready reports progress) until this finishes
+    validator.start_background_warmup()
+    print(f"Inference sidecar listening on {path}")
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await stopped.wait()
+
+    print("Inference sidecar shutting down")
+    await server.stop()
+    executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=settings.INFERENCE_SIDECAR_SOCKET or DEFAULT_SOCKET)
+    args = parser.parse_args()
+
+    # The only process running the model on this host
+    apply_thread_budget(budget_from_settings(processes=1))
+    asyncio.run(serve(args.socket))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Compare per-text and batched reference embedding computation."""
+import numpy as np
+from common import base_parser, load_validator, best_of, print_header
+from app.data.financial_keywords import FINANCIAL_GOAL_KEYWORDS
+from app.data.unrelated_keywords import UNRELATED_KEYWORDS
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    validator = load_validator(args.model)
+    texts = FINANCIAL_GOAL_KEYWORDS + UNRELATED_KEYWORDS
+
+    print_header(f"REFERENCE EMBEDDINGS: {len(texts)} texts, model={args.model}")
+
+    loop_time, loop_result = best_of(
+        lambda: np.array([validator.get_embedding(text) for text in texts]), args.repeat
+    )
+    batch_time, batch_result = best_of(
+        lambda: validator.get_embeddings(texts, batch_size=args.batch_size), args.repeat
+    )
+
+    print(f"One text per forward pass:   {loop_time:8.3f}s")
+    print(f"Batched (batch_size={args.batch_size:3d}):    {batch_time:8.3f}s")
+    print(f"Speedup:                     {loop_time / batch_time:8.2f}x")
+    print(f"Max abs difference:          {np.max(np.abs(loop_result - batch_result)):.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Latency of the unfused scoring path (encoder -> numpy -> classifier) versus the fused trace/compile scorer."""
+import time
+import numpy as np
+from common import base_parser, initialized_validator, best_of, print_header
+from goal_cases import LABELED_GOALS
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--modes", nargs="+", default=["trace", "compile"])
+    args = parser.parse_args()
+
+    validator = initialized_validator(args.model, VALIDATOR_FUSION="none", EMBEDDING_STORE_ENABLED=False,
+                                      VALIDATION_CACHE_ENABLED=False, LEXICAL_FASTPATH_ENABLED=False)
+    goals = [goal for goal, _ in LABELED_GOALS]
+
+    def single():
+        return [validator._score_goals([goal], batch_size=1)[0] for goal in goals]
+
+    def batched():
+        return validator._score_goals(goals)
+
+    rows = []
+    baseline = None
+    for mode in ["none"] + args.modes:
+        validator.fused_scorer = None
+        warm_up = 0.0
+        if mode != "none":
+            start = time.perf_counter()
+            validator.fusion = mode
+            validator.build_fused_scorer()
+            warm_up = time.perf_counter() - start
+            if validator.fused_scorer is None:
+                continue
+        single_time, single_scores = best_of(single, args.repeat)
+        batch_time, batch_scores = best_of(batched, args.repeat)
+        if baseline is None:
+            baseline = np.array(batch_scores)
+        difference = max(np.max(np.abs(np.array(scores) - baseline)) for scores in (single_scores, batch_scores))
+        rows.append((mode, warm_up, 1000 * single_time / len(goals), 1000 * batch_time / len(goals), difference))
+
+    print_header(f"FUSED SCORER: {len(goals)} goals, model={args.model}")
+    print(f"{'mode':>8s}{'warm-up s':>11s}{'ms/goal single':>16s}{'ms/goal batch':>15s}{'max |diff|':>12s}")
+    for mode, warm_up, single_ms, batch_ms, difference in rows:
+        print(f"{mode:>8s}{warm_up:11.2f}{single_ms:16.2f}{batch_ms:15.2f}{difference:12.1e}")
+
+if __name__ == "__main__":
+    main()
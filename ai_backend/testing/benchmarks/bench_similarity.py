@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Per-query cost of the similarity fallback as the reference set grows (synthetic embeddings, no model needed)."""
+import numpy as np
+from common import base_parser, best_of, print_header
+from app.services.reference_index import ReferenceIndex
+
+def renormalizing_search(financial, unrelated, query):
+    """The fallback's previous approach: normalize both reference sets on every query."""
+    query = query / np.linalg.norm(query)
+    financial_norms = np.linalg.norm(financial, axis=1, keepdims=True)
+    financial_norms[financial_norms == 0] = 1
+    unrelated_norms = np.linalg.norm(unrelated, axis=1, keepdims=True)
+    unrelated_norms[unrelated_norms == 0] = 1
+    return np.max(np.dot(financial / financial_norms, query)), np.max(np.dot(unrelated / unrelated_norms, query))
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[600, 5000, 50000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(args.queries, 768))
+
+    print_header(f"SIMILARITY FALLBACK: {args.queries} queries, top_k={args.top_k}")
+    print(f"{'references':>12s}{'renormalize (ms)':>20s}{'index (ms)':>14s}{'speedup':>10s}")
+    for size in args.sizes:
+        financial = rng.normal(size=(size // 2, 768))
+        unrelated = rng.normal(size=(size - size // 2, 768))
+        index = ReferenceIndex([""] * len(financial), financial, [""] * len(unrelated), unrelated)
+
+        old_time, old = best_of(lambda: [renormalizing_search(financial, unrelated, q) for q in queries], args.repeat)
+        new_time, new = best_of(lambda: [index.search(q, args.top_k)[0] for q in queries], args.repeat)
+        assert np.allclose([o for pair in old for o in pair], [n for r in new for n in r[:2]], atol=1e-4)
+
+        old_ms, new_ms = 1000 * old_time / len(queries), 1000 * new_time / len(queries)
+        print(f"{size:12d}{old_ms:20.3f}{new_ms:14.3f}{old_ms / new_ms:9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Accuracy and startup time of the mlp and linear classifier engines on the labelled goals."""
+import time
+import torch
+from common import base_parser, initialized_validator, print_header
+from goal_cases import LABELED_GOALS, accuracy
+
+def evaluate(model_name, engine):
+    # Same seed for both engines; caches off so every phase runs cold
+    torch.manual_seed(0)
+    start = time.perf_counter()
+    validator = initialized_validator(model_name, CLASSIFIER_ENGINE=engine, VALIDATOR_CACHE_ENABLED=False,
+                                      VALIDATION_CACHE_ENABLED=False, LEXICAL_FASTPATH_ENABLED=False)
+    startup = time.perf_counter() - start
+
+    results = validator.validate_goals([goal for goal, _ in LABELED_GOALS])
+    return {
+        "accuracy": accuracy([is_valid for is_valid, _, _ in results]),
+        "startup_s": startup,
+        "train_ms": 1000 * validator.phases["train_classifier"]["seconds"],
+        "embeddings_s": validator.phases["reference_embeddings"]["seconds"],
+    }
+
+def main():
+    args = base_parser(__doc__).parse_args()
+
+    reports = {engine: evaluate(args.model, engine) for engine in ("mlp", "linear")}
+
+    print_header(f"CLASSIFIER ENGINES: {len(LABELED_GOALS)} labelled goals, model={args.model}")
+    print(f"{'':28s}{'mlp':>12s}{'linear':>12s}")
+    print(f"{'Accuracy':28s}{reports['mlp']['accuracy']:12.3f}{reports['linear']['accuracy']:12.3f}")
+    print(f"{'Classifier training (ms)':28s}{reports['mlp']['train_ms']:12.1f}{reports['linear']['train_ms']:12.1f}")
+    print(f"{'Reference embeddings (s)':28s}{reports['mlp']['embeddings_s']:12.2f}{reports['linear']['embeddings_s']:12.2f}")
+    print(f"{'Cold startup total (s)':28s}{reports['mlp']['startup_s']:12.2f}{reports['linear']['startup_s']:12.2f}")
+
+if __name__ == "__main__":
+    main()
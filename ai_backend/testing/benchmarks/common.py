@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'goal_validation'))
+
+import argparse
+import time
+from transformers import AutoTokenizer, AutoModel
+from app.config import settings
+from app.services.goal_validator import GoalValidator
+from app.services.encoders import TorchEncoder
+
+def base_parser(description):
+    """Argument parser with the options shared by every benchmark."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--model", default=settings.VALIDATOR_MODEL_NAME,
+                        help="Hub id or local directory of the encoder (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per measurement")
+    return parser
+
+def load_validator(model_name):
+    """Create a GoalValidator with only the tokenizer and encoder loaded."""
+    validator = GoalValidator()
+    validator.model_name = model_name
+    validator.tokenizer = AutoTokenizer.from_pretrained(model_name)
+    validator.model = AutoModel.from_pretrained(model_name)
+    validator.encoder = TorchEncoder(validator.model)
+    return validator
+
+def initialized_validator(model_name, **setting_overrides):
+    """Create and fully initialize a GoalValidator with the given settings overridden."""
+    for name, value in setting_overrides.items():
+        setattr(settings, name, value)
+    settings.VALIDATOR_MODEL_NAME = model_name
+    validator = GoalValidator()
+    validator._ensure_initialized()
+    return validator
+
+def best_of(fn, repeat):
+    """Run fn `repeat` times and return (best wall time in seconds, last result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def print_header(title):
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Accuracy and latency of the goal validator for different VALIDATOR_MAX_LENGTH caps."""
+import tempfile
+import numpy as np
+import torch
+from common import base_parser, initialized_validator, best_of, print_header
+from goal_cases import LABELED_GOALS, accuracy
+from app.data.financial_keywords import FINANCIAL_GOAL_KEYWORDS
+from app.data.unrelated_keywords import UNRELATED_KEYWORDS
+
+# Appended to each labelled goal to get inputs near the 500-character request limit
+DETAIL = (" I have been thinking about this for a long time and talked it over with my family,"
+          " and I would like to make steady progress on it every single week this year without"
+          " giving up on the things that already matter to me, even when work gets busy again.")
+
+def token_lengths(tokenizer, texts):
+    return np.array([len(ids) for ids in tokenizer(texts)["input_ids"]])
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--max-lengths", type=int, nargs="+", default=[16, 32, 64, 128, 512])
+    args = parser.parse_args()
+
+    goals = [goal for goal, _ in LABELED_GOALS]
+    long_goals = [(goal + DETAIL)[:500] for goal in goals]
+
+    rows = []
+    # A throwaway cache dir, so the real VALIDATOR_CACHE_DIR is neither read nor written
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for max_length in args.max_lengths:
+            # Same seed for every run so differences come from truncation, not classifier initialization
+            torch.manual_seed(0)
+            # No embedding store: repeats after the first would time SQLite lookups instead of the encoder
+            validator = initialized_validator(args.model, VALIDATOR_MAX_LENGTH=max_length, VALIDATOR_CACHE_DIR=cache_dir,
+                                              EMBEDDING_STORE_ENABLED=False, VALIDATION_CACHE_ENABLED=False,
+                                              LEXICAL_FASTPATH_ENABLED=False)
+            _, short_results = best_of(lambda: validator.validate_goals(goals), 1)
+            long_time, long_results = best_of(lambda: [validator.validate_goal(goal) for goal in long_goals], args.repeat)
+            rows.append((
+                max_length,
+                accuracy([is_valid for is_valid, _, _ in short_results]),
+                accuracy([is_valid for is_valid, _, _ in long_results]),
+                1000 * long_time / len(long_goals),
+            ))
+
+    tokenizer = validator.tokenizer
+    print_header(f"MAX LENGTH REPORT: {len(goals)} labelled goals, model={args.model}")
+    for name, texts in (("References", FINANCIAL_GOAL_KEYWORDS + UNRELATED_KEYWORDS),
+                        ("Labelled goals", goals), ("Long goals", long_goals)):
+        lengths = token_lengths(tokenizer, texts)
+        print(f"{name + ' tokens':24s} p50={np.percentile(lengths, 50):5.0f}  p95={np.percentile(lengths, 95):5.0f}  max={lengths.max():5d}")
+
+    print(f"\n{'max_length':>10s}{'accuracy':>10s}{'long acc.':>11s}{'long ms/goal':>14s}")
+    for max_length, short_accuracy, long_accuracy, latency_ms in rows:
+        print(f"{max_length:10d}{short_accuracy:10.3f}{long_accuracy:11.3f}{latency_ms:14.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Accuracy, latency and size parity of the fp32 and int8 goal validator."""
+import io
+import tempfile
+import numpy as np
+import torch
+from common import base_parser, initialized_validator, best_of, print_header
+from goal_cases import LABELED_GOALS, accuracy
+
+def encoder_size_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+def evaluate(model_name, precision, repeat, cache_dir):
+    # Same seed for both runs so differences come from the encoder, not classifier initialization
+    torch.manual_seed(0)
+    # No embedding store: repeats after the first would time SQLite lookups instead of the encoder
+    validator = initialized_validator(model_name, VALIDATOR_PRECISION=precision, VALIDATOR_CACHE_DIR=cache_dir,
+                                      EMBEDDING_STORE_ENABLED=False, VALIDATION_CACHE_ENABLED=False,
+                                      LEXICAL_FASTPATH_ENABLED=False)
+    goals = [goal for goal, _ in LABELED_GOALS]
+
+    latency, results = best_of(lambda: [validator.validate_goal(goal) for goal in goals], repeat)
+    return {
+        "validator": validator,
+        "accuracy": accuracy([is_valid for is_valid, _, _ in results]),
+        "confidences": np.array([confidence for _, confidence, _ in results]),
+        "predictions": [is_valid for is_valid, _, _ in results],
+        "latency_ms": 1000 * latency / len(goals),
+        "size_mb": encoder_size_mb(validator.model),
+        "embeddings": validator.get_embeddings(goals),
+    }
+
+def main():
+    args = base_parser(__doc__).parse_args()
+
+    # A throwaway cache dir, so the real VALIDATOR_CACHE_DIR is neither read nor written
+    with tempfile.TemporaryDirectory() as cache_dir:
+        fp32 = evaluate(args.model, "fp32", args.repeat, cache_dir)
+        int8 = evaluate(args.model, "int8", args.repeat, cache_dir)
+
+    print_header(f"PRECISION PARITY REPORT: {len(LABELED_GOALS)} labelled goals, model={args.model}")
+    print(f"{'':24s}{'fp32':>12s}{'int8':>12s}")
+    print(f"{'Accuracy':24s}{fp32['accuracy']:12.3f}{int8['accuracy']:12.3f}")
+    print(f"{'Latency per goal (ms)':24s}{fp32['latency_ms']:12.2f}{int8['latency_ms']:12.2f}")
+    print(f"{'Encoder size (MB)':24s}{fp32['size_mb']:12.1f}{int8['size_mb']:12.1f}")
+
+    agreement = np.mean([a == b for a, b in zip(fp32["predictions"], int8["predictions"])])
+    a, b = fp32["embeddings"], int8["embeddings"]
+    cosine = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    print(f"\nVerdict agreement:               {agreement:.3f}")
+    print(f"Mean |confidence difference|:    {np.mean(np.abs(fp32['confidences'] - int8['confidences'])):.4f}")
+    print(f"Mean embedding cosine (fp32/int8): {np.mean(cosine):.4f}")
+
+if __name__ == "__main__":
+    main()
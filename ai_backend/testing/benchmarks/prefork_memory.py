@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Memory per worker: serve.py (warm once, fork) versus uvicorn --workers (each worker loads its own model)."""
+import os
+import socket
+import subprocess
+import sys
+import time
+import psutil
+import requests
+from common import base_parser, print_header
+
+AI_BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(base_url, workers, timeout):
+    """Poll /ready until enough consecutive 200s that every worker has most likely answered"""
+    deadline = time.time() + timeout
+    streak = 0
+    while time.time() < deadline:
+        try:
+            streak = streak + 1 if requests.get(f"{base_url}/api/v1/ready", timeout=5).status_code == 200 else 0
+        except requests.RequestException:
+            streak = 0
+        if streak >= 4 * workers:
+            return
+        time.sleep(0.25)
+    raise TimeoutError(f"{base_url} did not become ready within {timeout}s")
+
+def measure(command, model, workers, requests_per_worker, timeout):
+    port = free_port()
+    env = dict(os.environ, VALIDATOR_MODEL_NAME=model, DEBUG="false", WORKERS=str(workers))
+    process = subprocess.Popen(command + ["--port", str(port)], cwd=AI_BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_ready(base_url, workers, timeout)
+        # Serve some traffic so any copy-on-write faults in the workers have happened
+        for i in range(requests_per_worker * workers):
+            requests.post(f"{base_url}/api/v1/validate-goal", json={"goal_text": f"I want to learn skill number {i}"})
+        time.sleep(1)
+
+        rows = []
+        for proc in [psutil.Process(process.pid)] + psutil.Process(process.pid).children(recursive=True):
+            memory = proc.memory_full_info()
+            rows.append((proc.pid, memory.rss, memory.pss, memory.uss))
+        return rows
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def report(title, rows):
+    mb = 1024 * 1024
+    print(f"\n{title}")
+    print(f"{'pid':>8s}{'RSS MB':>10s}{'PSS MB':>10s}{'USS MB':>10s}")
+    for pid, rss, pss, uss in rows:
+        print(f"{pid:8d}{rss / mb:10.1f}{pss / mb:10.1f}{uss / mb:10.1f}")
+    print(f"{'total':>8s}{'':10s}{sum(row[2] for row in rows) / mb:10.1f}{sum(row[3] for row in rows) / mb:10.1f}")
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests-per-worker", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    print_header(f"PREFORK MEMORY: {args.workers} workers, model={args.model}")
+    print("PSS splits shared pages between the processes mapping them, so the PSS total is the real footprint.")
+
+    report("serve.py (validator warmed in the parent, workers forked)",
+           measure([sys.executable, "serve.py", "--workers", str(args.workers)],
+                   args.model, args.workers, args.requests_per_worker, args.timeout))
+    report("uvicorn --workers (every worker loads and trains its own validator)",
+           measure([sys.executable, "-m", "uvicorn", "app.main:app", "--workers", str(args.workers)],
+                   args.model, args.workers, args.requests_per_worker, args.timeout))
+
+if __name__ == "__main__":
+    main()
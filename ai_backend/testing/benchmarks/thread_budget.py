@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Encoder throughput versus thread allocation: N worker processes, each with T torch intra-op threads."""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from common import base_parser, load_validator, print_header
+from goal_cases import LABELED_GOALS
+from app.services.thread_budget import available_cores, compute_thread_budget
+
+def run_child(args):
+    """One serving process: encode batches back to back between a shared start and stop time"""
+    import torch
+    torch.set_num_threads(args.threads)
+    torch.set_num_interop_threads(1)
+    validator = load_validator(args.model)
+    goals = [goal for goal, _ in LABELED_GOALS] * 4
+    batch = goals[:args.batch_size]
+    validator.get_embeddings(batch, batch_size=args.batch_size)
+
+    if time.time() > args.start_at:
+        sys.exit("Model loading took longer than --startup-seconds; increase it")
+    time.sleep(args.start_at - time.time())
+    latencies = []
+    while time.time() < args.start_at + args.seconds:
+        start = time.perf_counter()
+        validator.get_embeddings(batch, batch_size=args.batch_size)
+        latencies.append(time.perf_counter() - start)
+    print(json.dumps({"goals": len(latencies) * len(batch), "latencies": latencies}))
+
+def measure(args, processes, threads):
+    """Start `processes` children with `threads` threads each; return (goals/s, p50 ms, p95 ms)"""
+    start_at = time.time() + args.startup_seconds
+    command = [sys.executable, __file__, "--child", "--model", args.model, "--threads", str(threads),
+               "--batch-size", str(args.batch_size), "--seconds", str(args.seconds), "--start-at", str(start_at)]
+    env = dict(os.environ, TOKENIZERS_PARALLELISM="false")
+    children = [subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+                for _ in range(processes)]
+    results = []
+    for child in children:
+        stdout, stderr = child.communicate()
+        if child.returncode != 0:
+            raise RuntimeError(stderr.strip().splitlines()[-1])
+        results.append(json.loads(stdout.strip().splitlines()[-1]))
+
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    goals = sum(result["goals"] for result in results)
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return goals / args.seconds, percentile(0.5), percentile(0.95)
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--compare-threads", type=int, nargs="*",
+                        help="Intra-op threads per process to compare with the budget (default: all cores, torch's default)")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measured time per configuration")
+    parser.add_argument("--startup-seconds", type=float, default=60.0, help="Time allowed for all children to load the model")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--threads", type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args)
+
+    cores = available_cores()
+    print_header(f"Thread budget: {cores} cores, batches of {args.batch_size}, {args.seconds:.0f}s per configuration")
+    print(f"{'processes':>9} {'threads':>14} {'goals/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for processes in args.processes:
+        budget = compute_thread_budget(processes, 1, cores=cores)
+        allocations = [("budget", budget["intra_op_threads"])]
+        for threads in args.compare_threads if args.compare_threads is not None else [cores]:
+            if threads != budget["intra_op_threads"]:
+                allocations.append(("all cores" if threads == cores else "fixed", threads))
+        for label, threads in allocations:
+            throughput, p50, p95 = measure(args, processes, threads)
+            print(f"{processes:>9} {f'{threads} ({label})':>14} {throughput:>9.1f} {p50:>8.1f} {p95:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Minimal OpenAI-compatible chat completions server for tests (no network, no API key)."""
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+STUB_TASKS = {
+    "tasks": [
+        {
+            "title": "Review monthly subscriptions",
+            "description": "Cancel unused subscriptions to save money",
+            "estimated_impact": 50.0,
+            "difficulty": "easy",
+            "category": "spending",
+            "actionable_steps": ["List all subscriptions", "Cancel unused ones"]
+        }
+    ],
+    "analysis_summary": "You can save money by reducing subscription costs"
+}
+
+class OpenAIStub:
+    """
+    Serve POST /v1/chat/completions on a local port, answering after `delay` seconds.
+
+    Records how many requests arrived and the most that were in flight at once, so
+    tests can tell whether callers overlapped or were serialized. Requests with
+    "stream": true get the content as server-sent chunks of `chunk_size` characters,
+    `chunk_delay` seconds apart.
+    """
+
+    def __init__(self, delay=0.0, content=None, chunk_size=8, chunk_delay=0.0):
+        self.delay = delay
+        self.content = content if content is not None else json.dumps(STUB_TASKS)
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    if request.get("stream"):
+                        self._stream(request)
+                        return
+                    body = json.dumps({
+                        "id": f"chatcmpl-{stub.requests}",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": request["model"],
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": stub.content}}],
+                    }).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _stream(self, request):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                pieces = [stub.content[i:i + stub.chunk_size] for i in range(0, len(stub.content), stub.chunk_size)]
+                for piece, finish_reason in [(piece, None) for piece in pieces] + [(None, "stop")]:
+                    chunk = {
+                        "id": f"chatcmpl-{stub.requests}",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": request["model"],
+                        "choices": [{"index": 0, "finish_reason": finish_reason,
+                                     "delta": {"content": piece} if piece is not None else {}}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(stub.chunk_delay)
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -7,6 +7,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 import unittest
 from test_financial_analyzer import TestFinancialAnalyzer
 from test_task_generation_flow import TestTaskGenerationFlow
+from test_async_task_generation import TestAsyncTaskGeneration
+from test_task_cache import TestTaskResponseCache
+from test_task_streaming import TestIncrementalTaskParser, TestTaskStreaming
+from test_single_flight import TestSingleFlight
+from test_task_prefetch import TestTaskPrefetch
+from test_task_endpoints import TestTaskEndpoints
 
 def run_daily_task_generation_tests():
     """Run all daily task generation tests and display results."""
@@ -20,6 +26,13 @@ def run_daily_task_generation_tests():
     # Add all test cases
     test_suite.addTest(unittest.makeSuite(TestFinancialAnalyzer))
     test_suite.addTest(unittest.makeSuite(TestTaskGenerationFlow))
+    test_suite.addTest(unittest.makeSuite(TestAsyncTaskGeneration))
+    test_suite.addTest(unittest.makeSuite(TestTaskResponseCache))
+    test_suite.addTest(unittest.makeSuite(TestIncrementalTaskParser))
+    test_suite.addTest(unittest.makeSuite(TestTaskStreaming))
+    test_suite.addTest(unittest.makeSuite(TestSingleFlight))
+    test_suite.addTest(unittest.makeSuite(TestTaskPrefetch))
+    test_suite.addTest(unittest.makeSuite(TestTaskEndpoints))
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2)
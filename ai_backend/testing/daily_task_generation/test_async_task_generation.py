@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+from fastapi import HTTPException
+from app.config import settings
+from app.services.financial_analyzer import FinancialAnalyzer
+from app.services.task_generator import TaskGenerator
+from mock_data import create_mock_financial_profile
+from openai_stub import OpenAIStub
+
+class TestAsyncTaskGeneration(unittest.TestCase):
+    def setUp(self):
+        """Set up a profile, its analysis and settings pointing at a local stub."""
+        self.profile = create_mock_financial_profile("high_spender")
+        self.analysis = FinancialAnalyzer().analyze_spending_patterns(self.profile)
+        self.settings = patch.multiple(
+            settings,
+            OPENAI_API_KEY="test-key",
+            OPENAI_MAX_RETRIES=0,
+            OPENAI_READ_TIMEOUT_SECONDS=5.0
+        )
+        self.settings.start()
+
+    def tearDown(self):
+        self.settings.stop()
+
+    def generate(self, generator, count):
+        async def scenario():
+            try:
+                return await asyncio.gather(*[
+                    generator.generate_daily_tasks_async("Save $1000", self.profile, self.analysis) for _ in range(count)
+                ])
+            finally:
+                await generator.aclose()
+        return asyncio.run(scenario())
+
+    def test_concurrent_requests_overlap(self):
+        """Concurrent generations share the event loop instead of running one after another."""
+        with OpenAIStub(delay=0.5) as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            start = time.perf_counter()
+            responses = self.generate(TaskGenerator(), 5)
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(stub.requests, 5)
+        self.assertEqual(stub.max_in_flight, 5)
+        self.assertLess(elapsed, 1.5)
+        for response in responses:
+            self.assertEqual(response.tasks[0].title, "Review monthly subscriptions")
+        self.assertEqual(len({response.tasks[0].id for response in responses}), 5)
+
+    def test_read_timeout(self):
+        """A completion that takes longer than the read timeout fails fast with an error response."""
+        with OpenAIStub(delay=2.0) as stub, patch.multiple(settings, OPENAI_BASE_URL=stub.base_url, OPENAI_READ_TIMEOUT_SECONDS=0.3):
+            start = time.perf_counter()
+            response, = self.generate(TaskGenerator(), 1)
+
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertEqual(response.tasks, [])
+        self.assertIn("Error generating tasks", response.analysis_summary)
+
+    def test_disconnect_cancels_generation(self):
+        """When the HTTP client goes away, the in-flight completion is cancelled."""
+        from app.routes.disconnect import cancel_on_disconnect
+
+        class DisconnectingRequest:
+            async def is_disconnected(self):
+                return True
+
+        generator = TaskGenerator()
+
+        async def scenario():
+            task = asyncio.ensure_future(generator.generate_daily_tasks_async("Save $1000", self.profile, self.analysis))
+            try:
+                with self.assertRaises(HTTPException) as raised:
+                    await cancel_on_disconnect(DisconnectingRequest(), task)
+                await asyncio.sleep(0)
+                return raised.exception, task
+            finally:
+                await generator.aclose()
+
+        with OpenAIStub(delay=3.0) as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            start = time.perf_counter()
+            error, task = asyncio.run(scenario())
+
+        self.assertEqual(error.status_code, 499)
+        self.assertTrue(task.cancelled())
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import unittest
+from unittest.mock import patch
+from app.config import settings
+from app.services.financial_analyzer import FinancialAnalyzer
+from app.services.single_flight import SingleFlight
+from app.services.task_generator import TaskGenerator, with_fresh_task_ids
+from mock_data import create_mock_financial_profile
+from openai_stub import OpenAIStub
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        """Set up a single-flight group and a slow call that counts its executions."""
+        self.flights = SingleFlight()
+        self.executions = 0
+
+    async def slow_call(self, value="result", fail=False):
+        self.executions += 1
+        await asyncio.sleep(0.05)
+        if fail:
+            raise RuntimeError("upstream failed")
+        return value
+
+    def test_concurrent_identical_calls_share_one_execution(self):
+        """Callers with the same key get the leader's result; only followers are marked shared."""
+        async def scenario():
+            return await asyncio.gather(*[self.flights.run("key", self.slow_call) for _ in range(4)])
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(self.executions, 1)
+        self.assertEqual(results, [("result", False)] + [("result", True)] * 3)
+        self.assertEqual(self.flights.snapshot(), {"in_flight": 0, "calls": 1, "deduplicated": 3, "deduplication_rate": 0.75})
+
+    def test_different_keys_and_later_calls_run_separately(self):
+        """Different keys never share, and a finished call is not reused."""
+        async def scenario():
+            await asyncio.gather(self.flights.run("a", self.slow_call), self.flights.run("b", self.slow_call))
+            await self.flights.run("a", self.slow_call)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.executions, 3)
+
+    def test_errors_reach_every_caller(self):
+        """A failed call raises in every caller that shared it."""
+        async def scenario():
+            return await asyncio.gather(*[self.flights.run("key", lambda: self.slow_call(fail=True)) for _ in range(3)],
+                                        return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in asyncio.run(scenario())))
+
+    def test_cancelled_waiter_does_not_cancel_the_others(self):
+        """One caller giving up leaves the call running; it is cancelled once nobody waits."""
+        async def scenario():
+            leader = asyncio.ensure_future(self.flights.run("key", self.slow_call))
+            follower = asyncio.ensure_future(self.flights.run("key", self.slow_call))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            result = await follower
+
+            lonely = asyncio.ensure_future(self.flights.run("other", self.slow_call))
+            await asyncio.sleep(0.01)
+            flight = self.flights._flights["other"]
+            lonely.cancel()
+            await asyncio.sleep(0.01)
+            return result, flight.task.cancelled()
+
+        result, abandoned_cancelled = asyncio.run(scenario())
+        self.assertEqual(result, ("result", True))
+        self.assertTrue(abandoned_cancelled)
+        self.assertEqual(self.flights.snapshot()["in_flight"], 0)
+
+    def test_shared_generation_makes_one_llm_call(self):
+        """Identical concurrent task generations hit the model once; followers get their own task ids."""
+        analysis = FinancialAnalyzer().analyze_spending_patterns(create_mock_financial_profile("balanced"))
+
+        async def scenario(generator):
+            key = ("player", *generator.cache_key("Save $1000", analysis))
+            try:
+                return await asyncio.gather(*[
+                    self.flights.run(key, lambda: generator.generate_daily_tasks_async("Save $1000", None, analysis))
+                    for _ in range(3)
+                ])
+            finally:
+                await generator.aclose()
+
+        with OpenAIStub(delay=0.3) as stub, patch.multiple(settings, OPENAI_API_KEY="test-key", OPENAI_BASE_URL=stub.base_url,
+                                                           OPENAI_MAX_RETRIES=0, TASK_CACHE_ENABLED=False):
+            results = asyncio.run(scenario(TaskGenerator()))
+
+        self.assertEqual(stub.requests, 1)
+        responses = [with_fresh_task_ids(response) if shared else response for response, shared in results]
+        self.assertEqual(len({response.tasks[0].id for response in responses}), 3)
+        self.assertEqual({response.tasks[0].title for response in responses}, {"Review monthly subscriptions"})
+
+if __name__ == '__main__':
+    unittest.main()
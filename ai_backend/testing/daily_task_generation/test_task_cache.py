@@ -0,0 +1,117 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import copy
+import json
+import unittest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.services.financial_analyzer import FinancialAnalyzer
+from app.services.task_generator import TaskGenerator, analysis_fingerprint
+from mock_data import create_mock_financial_profile
+from openai_stub import OpenAIStub, STUB_TASKS
+
+# In sidecar mode the API module doesn't load the goal validator, which these tests don't need
+with patch.object(settings, "INFERENCE_SIDECAR_SOCKET", "/tmp/unused-inference-sidecar.sock"):
+    from app.routes import api
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+class TestTaskResponseCache(unittest.TestCase):
+    def setUp(self):
+        """Set up an analysis and settings pointing at a local stub."""
+        self.analysis = FinancialAnalyzer().analyze_spending_patterns(create_mock_financial_profile("high_spender"))
+        self.settings = patch.multiple(settings, OPENAI_API_KEY="test-key", OPENAI_MAX_RETRIES=0, TASK_CACHE_ENABLED=True)
+        self.settings.start()
+
+    def tearDown(self):
+        self.settings.stop()
+
+    def generate(self, generator, goals_and_analyses):
+        async def scenario():
+            try:
+                return [await generator.generate_daily_tasks_async(goal, None, analysis) for goal, analysis in goals_and_analyses]
+            finally:
+                await generator.aclose()
+        return asyncio.run(scenario())
+
+    def test_fingerprint_ignores_small_changes(self):
+        """Cents of difference keep the fingerprint; a different top category changes it."""
+        # Mid-bucket amounts, so the nudge can't cross a rounding boundary whatever the mock data
+        self.analysis["total_monthly_spending"] = 1200.0
+        self.analysis["average_transaction"] = 40.0
+        nudged = copy.deepcopy(self.analysis)
+        nudged["total_monthly_spending"] += 2.5
+        nudged["average_transaction"] += 0.3
+        self.assertEqual(analysis_fingerprint(nudged), analysis_fingerprint(self.analysis))
+
+        reordered = copy.deepcopy(self.analysis)
+        reordered["top_categories"] = list(reversed(reordered["top_categories"]))
+        self.assertNotEqual(analysis_fingerprint(reordered), analysis_fingerprint(self.analysis))
+
+    def test_repeat_is_served_from_cache_with_fresh_ids(self):
+        """The same goal and analysis on the same day skip the LLM but get new task ids."""
+        with OpenAIStub() as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            generator = TaskGenerator()
+            first, second = self.generate(generator, [("Save $1000", self.analysis), ("  save $1000 ", self.analysis)])
+
+        self.assertEqual(stub.requests, 1)
+        self.assertEqual([task.title for task in second.tasks], [task.title for task in first.tasks])
+        self.assertNotEqual(second.tasks[0].id, first.tasks[0].id)
+        self.assertEqual(generator.response_cache.snapshot()["hits"], 1)
+
+    def test_new_day_misses(self):
+        """Cached tasks are only reused within the same calendar day."""
+        clock = FakeClock()
+        with OpenAIStub() as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            generator = TaskGenerator(clock=clock)
+            self.generate(generator, [("Save $1000", self.analysis)])
+            clock.now += 86400
+            self.generate(generator, [("Save $1000", self.analysis)])
+
+        self.assertEqual(stub.requests, 2)
+
+    def test_errors_are_not_cached(self):
+        """A failed generation is retried on the next call instead of being replayed."""
+        with OpenAIStub(content="not json") as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            generator = TaskGenerator()
+            first, second = self.generate(generator, [("Save $1000", self.analysis)] * 2)
+
+        self.assertEqual(stub.requests, 2)
+        self.assertEqual(first.tasks, [])
+        self.assertEqual(len(generator.response_cache), 0)
+
+    def test_next_task_is_not_the_cached_daily_tasks(self):
+        """/generate-next-task asks the model for a new task instead of replaying what /generate-tasks cached."""
+        app = FastAPI()
+        app.include_router(api.router)
+        body = {
+            "validated_goal": "Save $1000 for a vacation",
+            "financial_profile": json.loads(create_mock_financial_profile("balanced").json())
+        }
+        answer = lambda title: json.dumps({**STUB_TASKS, "tasks": [{**STUB_TASKS["tasks"][0], "title": title}]})
+
+        with OpenAIStub(content=answer("Daily task")) as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url), \
+                patch.object(api, "task_generator", TaskGenerator()):
+            client = TestClient(app)
+            daily = client.post("/api/v1/generate-tasks", json=body).json()
+            stub.content = answer("Next task")
+            next_task = client.post("/api/v1/generate-next-task", json=body).json()
+            repeat = client.post("/api/v1/generate-tasks", json=body).json()
+
+        self.assertEqual(daily["tasks"][0]["title"], "Daily task")
+        self.assertEqual(next_task["tasks"][0]["title"], "Next task")
+        # Nor does the next task replace the cached daily tasks
+        self.assertEqual(repeat["tasks"][0]["title"], "Daily task")
+
+if __name__ == '__main__':
+    unittest.main()
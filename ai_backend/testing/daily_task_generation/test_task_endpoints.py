@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import json
+import time
+import unittest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from mock_data import create_mock_financial_profile
+from openai_stub import OpenAIStub, STUB_TASKS
+
+# In sidecar mode the API module doesn't load the goal validator, which these tests don't need
+with patch.object(settings, "INFERENCE_SIDECAR_SOCKET", "/tmp/unused-inference-sidecar.sock"):
+    from app.routes import api
+
+def stub_answer(title):
+    return json.dumps({**STUB_TASKS, "tasks": [{**STUB_TASKS["tasks"][0], "title": title}]})
+
+def stream_events(response):
+    """(event, data) pairs of a server-sent event stream."""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+class TestTaskEndpoints(unittest.TestCase):
+    def setUp(self):
+        """Set up a client for the API router, a fresh generator and prefetcher, and a profile."""
+        app = FastAPI()
+        app.include_router(api.router)
+        # Entered, so every request runs on one event loop and background prefetches survive between them
+        self.client = TestClient(app).__enter__()
+        self.body = {
+            "validated_goal": "Save $1000 for a vacation",
+            "financial_profile": json.loads(create_mock_financial_profile("balanced").json())
+        }
+        self.settings = patch.multiple(settings, OPENAI_API_KEY="test-key", OPENAI_MAX_RETRIES=0, TASK_CACHE_ENABLED=True)
+        self.settings.start()
+        self.services = patch.multiple(api, task_generator=api.TaskGenerator(), task_flights=api.SingleFlight(),
+                                       task_prefetcher=api.TaskPrefetcher())
+        self.services.start()
+
+    def tearDown(self):
+        self.client.__exit__(None, None, None)
+        self.services.stop()
+        self.settings.stop()
+
+    def test_next_task_stream_is_not_the_cached_daily_tasks(self):
+        """/generate-next-task/stream asks for a new task instead of replaying what /generate-tasks cached."""
+        with OpenAIStub(content=stub_answer("Daily task")) as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            daily = self.client.post("/api/v1/generate-tasks", json=self.body).json()
+            stub.content = stub_answer("Next task")
+            events = stream_events(self.client.post("/api/v1/generate-next-task/stream", json=self.body))
+
+        self.assertEqual(daily["tasks"][0]["title"], "Daily task")
+        self.assertEqual([event for event, _ in events], ["task", "summary"])
+        self.assertEqual(events[0][1]["title"], "Next task")
+
+    def test_next_task_stream_serves_the_prefetched_task(self):
+        """After a /generate-next-task call, the stream hands out the task prefetched in the background."""
+        with OpenAIStub(content=stub_answer("First next task")) as stub, \
+                patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            first = self.client.post("/api/v1/generate-next-task", json=self.body).json()
+            stub.content = stub_answer("Prefetched task")
+            deadline = time.time() + 5
+            while api.task_prefetcher.snapshot()["buffered"] == 0 and time.time() < deadline:
+                time.sleep(0.05)
+            requests = stub.requests
+            stub.content = stub_answer("Streamed task")
+            events = stream_events(self.client.post("/api/v1/generate-next-task/stream", json=self.body))
+
+        self.assertEqual(first["tasks"][0]["title"], "First next task")
+        self.assertEqual(events[0][1]["title"], "Prefetched task")
+        self.assertEqual(api.task_prefetcher.snapshot()["hits"], 1)
+        self.assertGreaterEqual(requests, 2)
+
+if __name__ == '__main__':
+    unittest.main()
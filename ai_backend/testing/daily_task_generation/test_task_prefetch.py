@@ -0,0 +1,163 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from app.config import settings
+from app.services.financial_analyzer import FinancialAnalyzer
+from app.services.task_generator import TaskGenerator
+from app.services.task_prefetch import TaskPrefetcher
+from mock_data import create_mock_financial_profile
+from openai_stub import OpenAIStub
+
+class TestTaskPrefetch(unittest.TestCase):
+    def setUp(self):
+        """Set up a prefetcher and a generator that numbers its responses."""
+        self.prefetcher = TaskPrefetcher(buffer_size=1, max_concurrent=2)
+        self.generated = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, delay=0.02, fail=False):
+        self.generated += 1
+        number = self.generated
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(tasks=[] if fail else [f"task {number}"])
+
+    async def settle(self):
+        """Let background refills finish."""
+        await asyncio.sleep(0.1)
+
+    def test_next_request_is_served_from_the_buffer(self):
+        """The first request generates on the spot; the one after it gets the prefetched response."""
+        async def scenario():
+            first = await self.prefetcher.next_response("player", "key", self.generate)
+            await self.settle()
+            second = await self.prefetcher.next_response("player", "key", self.generate)
+            await self.settle()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual((first.tasks, second.tasks), (["task 1"], ["task 2"]))
+        snapshot = self.prefetcher.snapshot()
+        self.assertEqual((snapshot["misses"], snapshot["hits"], snapshot["buffered"]), (1, 1, 1))
+        self.assertEqual(self.generated, 3)
+
+    def test_take_ready_never_waits(self):
+        """take_ready (the streaming endpoint) returns None on a miss but still refills for next time."""
+        async def scenario():
+            missed = self.prefetcher.take_ready("player", "key", self.generate)
+            await self.settle()
+            return missed, self.prefetcher.take_ready("player", "key", self.generate)
+
+        missed, ready = asyncio.run(scenario())
+        self.assertIsNone(missed)
+        self.assertEqual(ready.tasks, ["task 1"])
+        snapshot = self.prefetcher.snapshot()
+        self.assertEqual((snapshot["misses"], snapshot["hits"]), (1, 1))
+
+    def test_buffer_is_bounded(self):
+        """Refills stop once buffer_size responses are waiting."""
+        self.prefetcher = TaskPrefetcher(buffer_size=3)
+
+        async def scenario():
+            await self.prefetcher.next_response("player", "key", self.generate)
+            await asyncio.sleep(0.3)
+
+        asyncio.run(scenario())
+        self.assertEqual(self.prefetcher.snapshot()["buffered"], 3)
+        self.assertEqual(self.generated, 4)
+
+    def test_key_change_invalidates_the_buffer(self):
+        """A new goal or analysis drops what was prefetched for the old one."""
+        async def scenario():
+            await self.prefetcher.next_response("player", "old goal", self.generate)
+            await self.settle()
+            return await self.prefetcher.next_response("player", "new goal", self.generate)
+
+        response = asyncio.run(scenario())
+        self.assertEqual(response.tasks, ["task 3"])
+        snapshot = self.prefetcher.snapshot()
+        self.assertEqual((snapshot["invalidations"], snapshot["misses"], snapshot["hits"]), (1, 2, 0))
+
+    def test_request_waits_for_a_refill_in_flight(self):
+        """A request arriving mid-refill takes that response instead of starting another generation."""
+        async def scenario():
+            await self.prefetcher.next_response("player", "key", lambda: self.generate(delay=0.1))
+            await asyncio.sleep(0.02)
+            response = await self.prefetcher.next_response("player", "key", lambda: self.generate(delay=0.1))
+            await asyncio.sleep(0.3)
+            return response
+
+        response = asyncio.run(scenario())
+        self.assertEqual(response.tasks, ["task 2"])
+        self.assertEqual(self.prefetcher.snapshot()["waited"], 1)
+        self.assertEqual(self.generated, 3)
+
+    def test_refills_share_a_global_concurrency_cap(self):
+        """Background generations across all users never exceed max_concurrent."""
+        async def scenario():
+            await asyncio.gather(*[self.prefetcher.next_response(f"player {i}", "key", self.generate) for i in range(6)])
+            self.max_in_flight = 0
+            await asyncio.sleep(0.3)
+
+        asyncio.run(scenario())
+        self.assertLessEqual(self.max_in_flight, 2)
+        self.assertEqual(self.prefetcher.snapshot()["buffered"], 6)
+
+    def test_error_responses_are_not_buffered(self):
+        """A refill that produced no tasks leaves the buffer empty for the next request to retry."""
+        async def scenario():
+            await self.prefetcher.next_response("player", "key", lambda: self.generate(fail=self.generated > 0))
+            await self.settle()
+
+        asyncio.run(scenario())
+        snapshot = self.prefetcher.snapshot()
+        self.assertEqual((snapshot["buffered"], snapshot["refill_failures"]), (0, 1))
+
+    def test_least_recently_active_users_are_evicted(self):
+        """Only max_users buffers are kept."""
+        self.prefetcher = TaskPrefetcher(max_users=2)
+
+        async def scenario():
+            for user in ("a", "b", "c"):
+                await self.prefetcher.next_response(user, "key", self.generate)
+            await self.settle()
+
+        asyncio.run(scenario())
+        self.assertEqual(list(self.prefetcher._buffers), ["b", "c"])
+
+    def test_prefetched_next_tasks_bypass_the_response_cache(self):
+        """Next tasks come from the model each time rather than replaying the cached answer."""
+        analysis = FinancialAnalyzer().analyze_spending_patterns(create_mock_financial_profile("balanced"))
+
+        async def scenario(generator):
+            generate = lambda: generator.generate_daily_tasks_async("Save $1000", None, analysis, use_cache=False)
+            key = generator.cache_key("Save $1000", analysis)
+            try:
+                await self.prefetcher.next_response("player", key, generate)
+                await asyncio.sleep(0.5)
+                return await self.prefetcher.next_response("player", key, generate)
+            finally:
+                self.prefetcher.close()
+                await generator.aclose()
+
+        with OpenAIStub(delay=0.1) as stub, patch.multiple(settings, OPENAI_API_KEY="test-key", OPENAI_BASE_URL=stub.base_url,
+                                                           OPENAI_MAX_RETRIES=0):
+            generator = TaskGenerator()
+            response = asyncio.run(scenario(generator))
+
+        self.assertEqual(response.tasks[0].title, "Review monthly subscriptions")
+        self.assertEqual(stub.requests, 2)
+        self.assertEqual(len(generator.response_cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
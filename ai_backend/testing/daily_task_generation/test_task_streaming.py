@@ -0,0 +1,133 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import json
+import time
+import unittest
+from unittest.mock import patch
+from app.config import settings
+from app.services.financial_analyzer import FinancialAnalyzer
+from app.services.task_generator import TaskGenerator
+from app.services.task_stream import IncrementalTaskParser
+from mock_data import create_mock_financial_profile
+from openai_stub import OpenAIStub
+
+def stub_answer(count):
+    """A model answer with `count` tasks whose text contains JSON-looking characters."""
+    return json.dumps({
+        "tasks": [{
+            "title": f"Task {i} {{with braces}} and [brackets]",
+            "description": 'Say "no" to \\ impulse buys',
+            "estimated_impact": 10.0 * (i + 1),
+            "difficulty": "easy",
+            "category": "spending",
+            "actionable_steps": ["Step {1}", "Step [2]"]
+        } for i in range(count)],
+        "analysis_summary": "Summary with a } brace"
+    }, indent=2)
+
+class TestIncrementalTaskParser(unittest.TestCase):
+    def test_tasks_complete_at_any_split(self):
+        """Every task is emitted exactly once, whatever the chunk boundaries."""
+        answer = "```json\n" + stub_answer(3) + "\n```"
+        expected = json.loads(stub_answer(3))["tasks"]
+        for size in (1, 2, 7, 64, len(answer)):
+            parser = IncrementalTaskParser()
+            tasks = []
+            for start in range(0, len(answer), size):
+                tasks.extend(parser.feed(answer[start:start + size]))
+            self.assertEqual(tasks, expected)
+            self.assertEqual(parser.finish()["analysis_summary"], "Summary with a } brace")
+
+    def test_task_emitted_when_its_brace_closes(self):
+        """A task is returned by the feed that completes it, before the rest arrives."""
+        answer = stub_answer(2)
+        first_end = answer.rindex("}", 0, answer.index('"Task 1')) + 1
+        parser = IncrementalTaskParser()
+        self.assertEqual(parser.feed(answer[:first_end - 1]), [])
+        self.assertEqual(len(parser.feed(answer[first_end - 1:first_end])), 1)
+
+    def test_nested_tasks_key_is_ignored(self):
+        """Only the top-level "tasks" array is treated as tasks."""
+        parser = IncrementalTaskParser()
+        self.assertEqual(parser.feed('{"meta": {"tasks": [{"a": 1}]}, "tasks": [{"b": 2}]}'), [{"b": 2}])
+
+class TestTaskStreaming(unittest.TestCase):
+    def setUp(self):
+        """Set up an analysis and settings pointing at a local stub."""
+        self.analysis = FinancialAnalyzer().analyze_spending_patterns(create_mock_financial_profile("frugal"))
+        self.settings = patch.multiple(settings, OPENAI_API_KEY="test-key", OPENAI_MAX_RETRIES=0, TASK_CACHE_ENABLED=True)
+        self.settings.start()
+
+    def tearDown(self):
+        self.settings.stop()
+
+    def collect(self, generator, use_cache=True):
+        async def scenario():
+            start = time.perf_counter()
+            events = []
+            try:
+                async for event, payload in generator.stream_daily_tasks("Save $500", None, self.analysis, use_cache=use_cache):
+                    events.append((event, payload, time.perf_counter() - start))
+            finally:
+                await generator.aclose()
+            return events
+        return asyncio.run(scenario())
+
+    def test_first_task_arrives_before_the_completion_ends(self):
+        """Tasks are yielded as they finish streaming, followed by the summary."""
+        with OpenAIStub(content=stub_answer(3), chunk_size=16, chunk_delay=0.01) as stub, \
+                patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            events = self.collect(TaskGenerator())
+
+        self.assertEqual([event for event, _, _ in events], ["task", "task", "task", "summary"])
+        self.assertLess(events[0][2], events[-1][2] / 2)
+        self.assertEqual(events[-1][1]["total_potential_impact"], 60.0)
+        self.assertEqual(events[1][1].title, "Task 1 {with braces} and [brackets]")
+
+    def test_streamed_response_is_cached(self):
+        """A completed stream fills the task cache; the replay has fresh ids."""
+        with OpenAIStub(content=stub_answer(2)) as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            generator = TaskGenerator()
+            first = self.collect(generator)
+            second = self.collect(generator)
+
+        self.assertEqual(stub.requests, 1)
+        self.assertEqual([payload.title for event, payload, _ in second if event == "task"],
+                         [payload.title for event, payload, _ in first if event == "task"])
+        self.assertNotEqual(second[0][1].id, first[0][1].id)
+
+    def test_next_task_stream_skips_the_cache(self):
+        """With use_cache=False (/generate-next-task/stream) the tasks cached by /generate-tasks are not replayed."""
+        async def generate_tasks(generator):
+            try:
+                return await generator.generate_daily_tasks_async("Save $500", None, self.analysis)
+            finally:
+                await generator.aclose()
+
+        with OpenAIStub(content=stub_answer(2)) as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            generator = TaskGenerator()
+            asyncio.run(generate_tasks(generator))
+            key = generator.cache_key("Save $500", self.analysis)
+            cached = generator.response_cache.get(key)
+            hits = generator.response_cache.snapshot()["hits"]
+            events = self.collect(generator, use_cache=False)
+
+        self.assertEqual(stub.requests, 2)
+        self.assertEqual([event for event, _, _ in events], ["task", "task", "summary"])
+        # The stream neither read nor replaced the /generate-tasks entry
+        self.assertEqual(generator.response_cache.snapshot()["hits"], hits)
+        self.assertIs(generator.response_cache.get(key), cached)
+
+    def test_invalid_answer_ends_with_error(self):
+        """An unparseable answer after some tasks ends the stream with an error event."""
+        answer = stub_answer(1)[:-20]
+        with OpenAIStub(content=answer) as stub, patch.object(settings, "OPENAI_BASE_URL", stub.base_url):
+            events = self.collect(TaskGenerator())
+
+        self.assertEqual([event for event, _, _ in events], ["task", "error"])
+
+if __name__ == '__main__':
+    unittest.main()
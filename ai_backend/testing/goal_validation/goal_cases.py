@@ -0,0 +1,36 @@
+"""Labelled goals used to measure validator accuracy (True = financial goal)."""
+
+LABELED_GOALS = [
+    # Financial goals
+    ("I want to save $10,000", True),
+    ("I need to pay off my debt", True),
+    ("I want to invest in stocks", True),
+    ("I need to create a budget", True),
+    ("save money for retirement", True),
+    ("I want to save $10,000 for an emergency fund", True),
+    ("My goal is to pay off my credit card debt", True),
+    ("I want to invest in a retirement fund", True),
+    ("I need to create a budget for monthly expenses", True),
+    ("I want to buy a house", True),
+    ("I want to be better with money", True),
+    ("reduce my expenses", True),
+    ("I want to be more responsible with money", True),
+    ("I want to save money for retirement", True),
+
+    # Non-financial goals
+    ("I want to learn piano", False),
+    ("I want to run a marathon", False),
+    ("I need to organize my closet", False),
+    ("learn spanish", False),
+    ("testing", False),
+    ("I want to learn how to play piano", False),
+    ("My goal is to run a marathon", False),
+    ("I want to learn Spanish", False),
+    ("I want to learn to dance", False),
+    ("I want to buy expensive clothes", False),
+]
+
+def accuracy(predictions):
+    """Fraction of LABELED_GOALS whose predicted validity matches the label."""
+    correct = sum(prediction == expected for prediction, (_, expected) in zip(predictions, LABELED_GOALS))
+    return correct / len(LABELED_GOALS)
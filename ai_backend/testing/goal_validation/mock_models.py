@@ -0,0 +1,56 @@
+import os
+import re
+import tempfile
+import torch
+from transformers import BertConfig, BertModel, BertTokenizerFast
+from app.data.financial_keywords import FINANCIAL_GOAL_KEYWORDS
+from app.data.unrelated_keywords import UNRELATED_KEYWORDS
+from app.services.goal_validator import GoalValidator
+from app.services.encoders import TorchEncoder
+
+_TINY_MODEL_DIR = None
+
+def create_tiny_finbert():
+    """
+    Create a tiny randomly initialised BERT with FinBERT's hidden size.
+
+    The vocabulary is built from the keyword lists so reference phrases tokenize
+    to real ids. The model is saved once per test run and its directory reused.
+    """
+    global _TINY_MODEL_DIR
+    if _TINY_MODEL_DIR is not None:
+        return _TINY_MODEL_DIR
+
+    model_dir = tempfile.mkdtemp(prefix="tiny-finbert-")
+    words = set("i want to my the a for and of in".split())
+    for phrase in FINANCIAL_GOAL_KEYWORDS + UNRELATED_KEYWORDS:
+        words.update(re.findall(r"\w+|[^\w\s]", phrase.lower()))
+
+    vocab_file = os.path.join(model_dir, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + sorted(words)))
+
+    torch.manual_seed(0)
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file)
+    model = BertModel(BertConfig(
+        vocab_size=len(words) + 5,
+        hidden_size=768,
+        num_hidden_layers=1,
+        num_attention_heads=4,
+        intermediate_size=128
+    ))
+    tokenizer.save_pretrained(model_dir)
+    model.save_pretrained(model_dir)
+
+    _TINY_MODEL_DIR = model_dir
+    return model_dir
+
+def create_tiny_validator():
+    """Create a GoalValidator with the tiny model loaded but nothing else initialised."""
+    model_dir = create_tiny_finbert()
+    validator = GoalValidator()
+    validator.tokenizer = BertTokenizerFast.from_pretrained(model_dir)
+    validator.model = BertModel.from_pretrained(model_dir)
+    validator.model.eval()
+    validator.encoder = TorchEncoder(validator.model)
+    return validator
@@ -6,6 +6,20 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 import unittest
 from test_goal_validator import TestGoalValidator
+from test_model_cache import TestReferenceEmbeddingCache, TestClassifierCheckpointCache
+from test_batched_embeddings import TestBatchedEmbeddings
+from test_batch_dispatcher import TestGoalBatchDispatcher, TestInferenceExecutor
+from test_validation_cache import TestTTLCache, TestGoalValidationCache
+from test_encoder_backends import TestEncoderBackends
+from test_lexical_matcher import TestLexicalPreClassifier
+from test_reference_index import TestReferenceIndex
+from test_bulk_validation import TestBulkValidation, TestBulkValidationEndpoint
+from test_classifier_engines import TestClassifierEngines
+from test_embedding_store import TestEmbeddingStore
+from test_local_model import TestLocalModel
+from test_fused_scorer import TestFusedScorer
+from test_thread_budget import TestThreadBudget
+from test_inference_sidecar import TestInferenceSidecar
 
 def run_goal_validation_tests():
     """Run all goal validation tests and display results."""
@@ -18,6 +32,24 @@ def run_goal_validation_tests():
     
     # Add all test cases
     test_suite.addTest(unittest.makeSuite(TestGoalValidator))
+    test_suite.addTest(unittest.makeSuite(TestReferenceEmbeddingCache))
+    test_suite.addTest(unittest.makeSuite(TestClassifierCheckpointCache))
+    test_suite.addTest(unittest.makeSuite(TestBatchedEmbeddings))
+    test_suite.addTest(unittest.makeSuite(TestGoalBatchDispatcher))
+    test_suite.addTest(unittest.makeSuite(TestInferenceExecutor))
+    test_suite.addTest(unittest.makeSuite(TestTTLCache))
+    test_suite.addTest(unittest.makeSuite(TestGoalValidationCache))
+    test_suite.addTest(unittest.makeSuite(TestEncoderBackends))
+    test_suite.addTest(unittest.makeSuite(TestLexicalPreClassifier))
+    test_suite.addTest(unittest.makeSuite(TestReferenceIndex))
+    test_suite.addTest(unittest.makeSuite(TestBulkValidation))
+    test_suite.addTest(unittest.makeSuite(TestBulkValidationEndpoint))
+    test_suite.addTest(unittest.makeSuite(TestClassifierEngines))
+    test_suite.addTest(unittest.makeSuite(TestEmbeddingStore))
+    test_suite.addTest(unittest.makeSuite(TestLocalModel))
+    test_suite.addTest(unittest.makeSuite(TestFusedScorer))
+    test_suite.addTest(unittest.makeSuite(TestThreadBudget))
+    test_suite.addTest(unittest.makeSuite(TestInferenceSidecar))
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2)
@@ -0,0 +1,146 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import threading
+import unittest
+from app.services.batch_dispatcher import GoalBatchDispatcher
+from app.services.inference_executor import InferenceExecutor, InferenceQueueFull
+
+class FakeValidator:
+    """Stands in for GoalValidator and records the batches it receives."""
+    def __init__(self, fail=False, release=None):
+        self.batches = []
+        self.fail = fail
+        self.release = release
+
+    def validate_goals(self, goal_texts):
+        self.batches.append(list(goal_texts))
+        if self.release is not None:
+            self.release.wait()
+        if self.fail:
+            raise RuntimeError("encoder exploded")
+        return [(True, float(len(goal_text)), []) for goal_text in goal_texts]
+
+class TestGoalBatchDispatcher(unittest.TestCase):
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_concurrent_goals_share_one_batch(self):
+        """Goals submitted together are validated in one call and fanned back out in order."""
+        validator = FakeValidator()
+        dispatcher = GoalBatchDispatcher(validator, InferenceExecutor(), max_batch_size=32, max_wait_ms=50)
+        goals = [f"I want to save {'$' * i}" for i in range(10)]
+
+        async def scenario():
+            results = await asyncio.gather(*[dispatcher.submit(goal) for goal in goals])
+            await dispatcher.stop()
+            return results
+
+        results = self.run_async(scenario())
+
+        self.assertEqual(validator.batches, [goals])
+        self.assertEqual([confidence for _, confidence, _ in results], [float(len(goal)) for goal in goals])
+        metrics = dispatcher.metrics.snapshot()
+        self.assertEqual(metrics["batches"], 1)
+        self.assertEqual(metrics["max_batch_size"], 10)
+
+    def test_max_batch_size_splits_batches(self):
+        """No batch exceeds the configured maximum size."""
+        validator = FakeValidator()
+        dispatcher = GoalBatchDispatcher(validator, InferenceExecutor(), max_batch_size=4, max_wait_ms=50)
+
+        async def scenario():
+            await asyncio.gather(*[dispatcher.submit(f"goal number {i}") for i in range(10)])
+            await dispatcher.stop()
+
+        self.run_async(scenario())
+
+        self.assertEqual(sum(len(batch) for batch in validator.batches), 10)
+        self.assertTrue(all(len(batch) <= 4 for batch in validator.batches))
+
+    def test_failure_propagates_to_every_caller(self):
+        """An exception from the validator is raised in every request of the batch."""
+        dispatcher = GoalBatchDispatcher(FakeValidator(fail=True), InferenceExecutor(), max_wait_ms=50)
+
+        async def scenario():
+            results = await asyncio.gather(*[dispatcher.submit(f"goal number {i}") for i in range(3)], return_exceptions=True)
+            await dispatcher.stop()
+            return results
+
+        results = self.run_async(scenario())
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    def test_goals_queued_when_the_worker_dies_are_still_validated(self):
+        """A replacement worker picks up the goals its predecessor left in the queue."""
+        release = threading.Event()
+        validator = FakeValidator(release=release)
+        dispatcher = GoalBatchDispatcher(validator, InferenceExecutor(max_workers=1), max_wait_ms=10)
+
+        async def scenario():
+            # The first batch holds the only slot, so the next goals wait in the queue
+            first = asyncio.ensure_future(dispatcher.submit("first goal"))
+            await asyncio.sleep(0.1)
+            queued = [asyncio.ensure_future(dispatcher.submit(f"queued goal {i}")) for i in range(3)]
+            await asyncio.sleep(0.1)
+            dispatcher._worker.cancel()
+            await asyncio.gather(dispatcher._worker, return_exceptions=True)
+
+            later = asyncio.ensure_future(dispatcher.submit("later goal"))
+            release.set()
+            results = await asyncio.wait_for(asyncio.gather(first, *queued, later), 5)
+            await dispatcher.stop()
+            return results
+
+        results = self.run_async(scenario())
+
+        goals = ["first goal", "queued goal 0", "queued goal 1", "queued goal 2", "later goal"]
+        self.assertEqual([confidence for _, confidence, _ in results], [float(len(goal)) for goal in goals])
+        self.assertEqual(sorted(goal for batch in validator.batches for goal in batch), sorted(goals))
+
+class TestInferenceExecutor(unittest.TestCase):
+    def test_rejects_work_beyond_max_pending(self):
+        """Jobs beyond max_pending are rejected immediately instead of queueing."""
+        executor = InferenceExecutor(max_workers=1, max_pending=2)
+        release = threading.Event()
+
+        async def scenario():
+            blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with self.assertRaises(InferenceQueueFull):
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*blocked)
+
+        asyncio.run(scenario())
+        executor.shutdown()
+
+        snapshot = executor.snapshot()
+        self.assertEqual(snapshot["rejected"], 1)
+        self.assertEqual(snapshot["completed"], 2)
+        self.assertEqual(snapshot["pending"], 0)
+
+    def test_event_loop_stays_responsive(self):
+        """Other coroutines keep running while a blocking job occupies the pool."""
+        executor = InferenceExecutor(max_workers=1)
+        release = threading.Event()
+        ticks = []
+
+        async def ticker():
+            for i in range(5):
+                ticks.append(i)
+                await asyncio.sleep(0.01)
+            release.set()
+
+        async def scenario():
+            await asyncio.gather(executor.run(release.wait), ticker())
+
+        asyncio.run(scenario())
+        executor.shutdown()
+
+        self.assertEqual(ticks, list(range(5)))
+
+if __name__ == '__main__':
+    unittest.main()
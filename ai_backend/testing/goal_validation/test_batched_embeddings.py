@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+import numpy as np
+from mock_models import create_tiny_validator
+from app.services.goal_validator import length_buckets
+
+class TestBatchedEmbeddings(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Load the tiny model once for all tests."""
+        cls.validator = create_tiny_validator()
+        cls.texts = [
+            "I want to save $500 for an emergency fund.",
+            "budget",
+            "pay off debt",
+            "I will travel by train across Europe.",
+            "tree",
+            "My goal is to build a three-month savings cushion."
+        ]
+
+    def test_batched_matches_single(self):
+        """Batched embeddings match one-at-a-time embeddings in the original order."""
+        single = np.array([self.validator.get_embedding(text) for text in self.texts])
+        batched = self.validator.get_embeddings(self.texts, batch_size=4)
+
+        self.assertEqual(batched.shape, (len(self.texts), 768))
+        np.testing.assert_allclose(batched, single, atol=1e-4)
+
+    def test_batch_size_does_not_change_results(self):
+        """Different batch sizes produce the same embeddings."""
+        np.testing.assert_allclose(
+            self.validator.get_embeddings(self.texts, batch_size=1),
+            self.validator.get_embeddings(self.texts, batch_size=len(self.texts)),
+            atol=1e-4
+        )
+
+    def test_batches_are_padded_to_fixed_buckets(self):
+        """Every batch reaches the encoder padded to one of the configured bucket lengths."""
+        shapes = []
+        encode = self.validator.encoder.encode
+        self.validator.encoder.encode = lambda inputs: shapes.append(inputs["input_ids"].shape) or encode(inputs)
+        try:
+            self.validator.get_embeddings(self.texts + ["save " * 200], batch_size=2)
+        finally:
+            self.validator.encoder.encode = encode
+
+        self.assertTrue(all(length in self.validator.length_buckets for _, length in shapes))
+        self.assertEqual(sum(batch for batch, _ in shapes), len(self.texts) + 1)
+        self.assertEqual(max(length for _, length in shapes), self.validator.max_length)
+
+    def test_long_inputs_are_truncated(self):
+        """Inputs longer than max_length only contribute their first max_length tokens."""
+        buckets, max_length = self.validator.length_buckets, self.validator.max_length
+        self.validator.length_buckets, self.validator.max_length = [8], 8
+        try:
+            np.testing.assert_allclose(
+                self.validator.get_embedding("save money " * 50),
+                self.validator.get_embedding("save money save money save money"),
+                atol=1e-4
+            )
+        finally:
+            self.validator.length_buckets, self.validator.max_length = buckets, max_length
+
+    def test_length_buckets(self):
+        """Buckets above max_length are dropped and max_length is always the last bucket."""
+        self.assertEqual(length_buckets([64, 16, 32, 128], 48), [16, 32, 48])
+        self.assertEqual(length_buckets([16, 32], 32), [16, 32])
+
+    def test_empty_input(self):
+        """No texts gives an empty matrix with the model's hidden size."""
+        self.assertEqual(self.validator.get_embeddings([]).shape, (0, 768))
+
+if __name__ == '__main__':
+    unittest.main()
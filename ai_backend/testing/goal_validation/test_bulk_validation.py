@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.services.goal_validator import GoalValidator
+from app.services.inference_executor import InferenceQueueFull
+from app.services.inference_sidecar import SidecarUnavailable
+
+# In sidecar mode the API module doesn't build a GoalValidator of its own; each test plugs in what it needs
+with patch.object(settings, "INFERENCE_SIDECAR_SOCKET", "/tmp/unused-inference-sidecar.sock"):
+    from app.routes import api
+
+class TestBulkValidation(unittest.TestCase):
+    def setUp(self):
+        """Set up a validator whose initialization is already done."""
+        self.validator = GoalValidator()
+        self.validator._initialized = True
+
+    def test_batched_pass_results_in_order(self):
+        """Results of a successful batched pass are returned in input order with no errors."""
+        results = [(True, 0.9, []), (False, 0.1, ["x"])]
+        with patch.object(self.validator, 'validate_goals', return_value=results) as validate_goals:
+            outcomes = self.validator.validate_goals_isolated(["save for a house", "learn the piano"], batch_size=64)
+
+        validate_goals.assert_called_once_with(["save for a house", "learn the piano"], batch_size=64)
+        self.assertEqual(outcomes, [(results[0], None), (results[1], None)])
+
+    def test_failing_goal_is_isolated(self):
+        """When the batched pass fails, each goal is retried alone and only the bad one reports an error."""
+        def validate_goal(goal_text):
+            if goal_text == "bad goal text":
+                raise RuntimeError("tokenizer exploded")
+            return True, 0.8, []
+
+        with patch.object(self.validator, 'validate_goals', side_effect=RuntimeError("batch failed")), \
+             patch.object(self.validator, 'validate_goal', side_effect=validate_goal):
+            outcomes = self.validator.validate_goals_isolated(["save for a house", "bad goal text", "build an emergency fund"])
+
+        self.assertEqual(outcomes[0], ((True, 0.8, []), None))
+        self.assertEqual(outcomes[1], (None, "tokenizer exploded"))
+        self.assertEqual(outcomes[2], ((True, 0.8, []), None))
+
+class FakeExecutor:
+    """Runs validation inline, or fails with `error`."""
+    def __init__(self, error=None):
+        self.error = error
+
+    async def run(self, fn, *args):
+        if self.error is not None:
+            raise self.error
+        return fn(*args)
+
+class TestBulkValidationEndpoint(unittest.TestCase):
+    def setUp(self):
+        """Set up a client for the API router with an in-process validator that fails on one goal."""
+        def validate_goals_isolated(goal_texts, batch_size=None):
+            return [(None, "tokenizer exploded") if goal == "bad goal text" else ((True, 0.8, []), None) for goal in goal_texts]
+
+        app = FastAPI()
+        app.include_router(api.router)
+        self.client = TestClient(app)
+        self.validator = SimpleNamespace(is_warming_up=False, validate_goals_isolated=validate_goals_isolated)
+        self.services = patch.multiple(api, sidecar_client=None, goal_validator=self.validator, inference_executor=FakeExecutor())
+        self.services.start()
+
+    def tearDown(self):
+        self.services.stop()
+
+    def post(self, goals):
+        return self.client.post("/api/v1/validate-goals", json=[{"goal_text": goal} for goal in goals])
+
+    def test_failing_and_invalid_goals_only_fail_their_items(self):
+        """An inference error or a goal that breaks the schema is reported on its own item, in order."""
+        response = self.post(["save for a house", "bad goal text", "hi", "build an emergency fund"])
+
+        self.assertEqual(response.status_code, 200)
+        items = response.json()
+        self.assertEqual([item["index"] for item in items], [0, 1, 2, 3])
+        self.assertEqual(items[0]["result"]["processed_goal"], "save for a house")
+        self.assertEqual(items[1]["error"], "tokenizer exploded")
+        self.assertIsNone(items[2]["result"])
+        self.assertTrue(items[2]["error"].startswith("Invalid goal: "))
+        self.assertTrue(items[3]["result"]["is_valid"])
+
+    def test_entries_are_validated_one_by_one_but_documented(self):
+        """A missing goal_text fails only its item, and OpenAPI still shows the goal_text length limits."""
+        response = self.client.post("/api/v1/validate-goals", json=[{"goal_text": "save for a house"}, {"user_id": "player"}])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()[1]["error"].startswith("Invalid goal: "))
+
+        schemas = self.client.get("/openapi.json").json()["components"]["schemas"]
+        goal_text = schemas["BulkGoalValidationEntry"]["properties"]["goal_text"]
+        self.assertEqual((goal_text["type"], goal_text["minLength"], goal_text["maxLength"]), ("string", 5, 500))
+
+    def test_too_many_goals_is_413(self):
+        """Requests over VALIDATION_BULK_MAX_ITEMS are rejected before any inference."""
+        with patch.object(settings, "VALIDATION_BULK_MAX_ITEMS", 2):
+            self.assertEqual(self.post(["save for a house"] * 3).status_code, 413)
+
+    def test_overload_is_503_not_failed_items(self):
+        """A full inference queue or an unreachable sidecar fails the call with 503 and Retry-After."""
+        for error in (InferenceQueueFull("queue full"), SidecarUnavailable("sidecar down")):
+            with patch.object(api, "inference_executor", FakeExecutor(error)):
+                response = self.post(["save for a house", "build an emergency fund"])
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.headers["Retry-After"], "1")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+import numpy as np
+import torch
+from app.config import settings
+from app.services.goal_validator import GoalValidator, LinearGoalClassifier, NumpyClassifierHead
+
+class TestClassifierEngines(unittest.TestCase):
+    def setUp(self):
+        """Set up two separable clusters of embeddings with an uninformative large offset."""
+        rng = np.random.default_rng(0)
+        direction = rng.normal(size=768)
+        offset = 20 * rng.normal(size=768)
+        self.financial = (offset + direction + 0.3 * rng.normal(size=(60, 768))).astype(np.float32)
+        self.unrelated = (offset - direction + 0.3 * rng.normal(size=(80, 768))).astype(np.float32)
+        self.original_engine = settings.CLASSIFIER_ENGINE
+
+    def tearDown(self):
+        settings.CLASSIFIER_ENGINE = self.original_engine
+
+    def test_linear_probe_separates_classes(self):
+        """The L-BFGS probe fits raw embeddings and outputs probabilities."""
+        X = np.concatenate([self.financial, self.unrelated])
+        y = np.concatenate([np.ones(60), np.zeros(80)])
+        classifier = LinearGoalClassifier().fit(X, y).eval()
+
+        with torch.no_grad():
+            probabilities = classifier(torch.from_numpy(X)).squeeze(1).numpy()
+        self.assertTrue(np.all((probabilities > 0) & (probabilities < 1)))
+        self.assertEqual(np.mean((probabilities > 0.5) == y), 1.0)
+
+        # The ONNX backend's numpy head replays the probe exactly
+        np.testing.assert_allclose(NumpyClassifierHead(classifier)(X)[:, 0], probabilities, atol=1e-5)
+
+    def test_engine_setting(self):
+        """CLASSIFIER_ENGINE picks the head, and is part of the checkpoint fingerprint."""
+        settings.CLASSIFIER_ENGINE = "linear"
+        validator = GoalValidator()
+        validator.classifier = validator._create_classifier()
+        validator.financial_embeddings, validator.unrelated_embeddings = self.financial, self.unrelated
+        validator.classifier_cache = None
+        validator.train_classifier()
+
+        self.assertIsInstance(validator.classifier, LinearGoalClassifier)
+        self.assertTrue(validator.classifier_trained)
+        self.assertTrue(all(p > 0.5 for p in validator._classify(self.financial[:5])))
+
+        settings.CLASSIFIER_ENGINE = "mlp"
+        mlp_validator = GoalValidator()
+        mlp_validator.financial_embeddings, mlp_validator.unrelated_embeddings = self.financial, self.unrelated
+        mlp_validator.classifier = mlp_validator._create_classifier()
+        mlp_validator.classifier_cache = None
+        mlp_validator.classifier_hyperparameters["epochs"] = 1
+        mlp_validator.train_classifier()
+        self.assertNotEqual(validator.classifier_version, mlp_validator.classifier_version)
+
+        settings.CLASSIFIER_ENGINE = "svm"
+        with self.assertRaises(ValueError):
+            GoalValidator()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+import numpy as np
+from app.services.embedding_store import EmbeddingStore
+from app.services.goal_validator import GoalValidator
+
+class TestEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        """Set up a store in a fresh temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "embeddings.sqlite3")
+        self.store = EmbeddingStore(self.path, max_entries=100)
+        self.vectors = np.random.default_rng(0).normal(size=(3, 8)).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip_survives_restart(self):
+        """Stored embeddings come back bit-identical from a new store on the same file."""
+        self.store.put_many("model-a", ["save money", "learn piano", "pay debt"], self.vectors)
+
+        reopened = EmbeddingStore(self.path)
+        found = reopened.get_many("model-a", ["pay debt", "unknown goal", "save money"], dim=8)
+
+        self.assertEqual(sorted(found), [0, 2])
+        np.testing.assert_array_equal(found[0], self.vectors[2])
+        np.testing.assert_array_equal(found[2], self.vectors[0])
+        self.assertEqual((reopened.hits, reopened.misses), (2, 1))
+
+    def test_keyed_by_model_version_and_exact_text(self):
+        """A different model version or a differently written goal misses."""
+        self.store.put_many("model-a", ["Save money"], self.vectors[:1])
+        self.assertEqual(self.store.get_many("model-b", ["Save money"], dim=8), {})
+        self.assertEqual(self.store.get_many("model-a", ["save money"], dim=8), {})
+        self.assertEqual(self.store.get_many("model-a", ["Save money"], dim=16), {})
+
+    def test_compaction_evicts_least_recently_used(self):
+        """Compaction trims the store to max_entries, dropping the oldest entries first."""
+        store = EmbeddingStore(self.path, max_entries=2, compact_every=10**6)
+        with patch("app.services.embedding_store.time.time", side_effect=[1.0, 2.0, 3.0]):
+            for i, text in enumerate(["first goal", "second goal", "third goal"]):
+                store.put_many("model-a", [text], self.vectors[i:i + 1])
+
+        store.compact()
+
+        self.assertEqual(store.count(), 2)
+        self.assertEqual(store.evictions, 1)
+        self.assertEqual(sorted(store.get_many("model-a", ["first goal", "second goal", "third goal"], dim=8)), [1, 2])
+
+    def test_snapshot_async_counts_off_the_event_loop(self):
+        """The metrics snapshot, with its COUNT(*), runs in a worker thread rather than on the event loop."""
+        self.store.put_many("model-a", ["save money", "learn piano"], self.vectors[:2])
+        threads = []
+        count = self.store.count
+        def counting_thread():
+            threads.append(threading.get_ident())
+            return count()
+
+        async def scenario():
+            with patch.object(self.store, "count", side_effect=counting_thread):
+                return await self.store.snapshot_async()
+
+        snapshot = asyncio.run(scenario())
+        self.assertEqual(snapshot["entries"], 2)
+        self.assertNotEqual(threads, [threading.get_ident()])
+
+    def test_validator_only_encodes_unseen_goals(self):
+        """GoalValidator reads stored goal embeddings and writes back the ones it computes."""
+        validator = GoalValidator()
+        validator.embedding_store = self.store
+        validator.encoder = type("Encoder", (), {"hidden_size": 8})()
+        self.store.put_many(validator.embedding_version, ["save for a house"], self.vectors[:1])
+
+        with patch.object(validator, 'get_embeddings', return_value=self.vectors[1:2]) as get_embeddings:
+            embeddings = validator.get_goal_embeddings(["save for a house", "learn to play piano"])
+
+        get_embeddings.assert_called_once_with(["learn to play piano"], batch_size=None)
+        np.testing.assert_array_equal(embeddings, self.vectors[:2])
+        self.assertEqual(len(self.store.get_many(validator.embedding_version, ["learn to play piano"], dim=8)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
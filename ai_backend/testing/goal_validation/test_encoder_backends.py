@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import importlib.util
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import torch
+from mock_models import create_tiny_validator
+from app.services.encoders import OnnxEncoder
+from app.services.goal_validator import FinancialGoalClassifier, NumpyClassifierHead
+
+# The ONNX backend is optional: pip install -r requirements-onnx.txt to run these tests
+requires_onnx = unittest.skipUnless(
+    importlib.util.find_spec("onnxruntime") and importlib.util.find_spec("onnx"),
+    "ONNX backend tests need onnx and onnxruntime (pip install -r requirements-onnx.txt)"
+)
+
+class TestEncoderBackends(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Load the tiny model once for all tests."""
+        cls.validator = create_tiny_validator()
+        cls.texts = ["I want to pay off debt", "tree", "My goal is to build a three-month savings cushion."]
+
+    def test_numpy_head_matches_classifier(self):
+        """The numpy classifier head reproduces the torch classifier's probabilities."""
+        classifier = FinancialGoalClassifier().eval()
+        x = np.random.rand(5, 768).astype(np.float32)
+        with torch.no_grad():
+            expected = classifier(torch.from_numpy(x)).numpy()
+
+        np.testing.assert_allclose(NumpyClassifierHead(classifier)(x), expected, atol=1e-5)
+
+    @requires_onnx
+    def test_onnx_encoder_matches_torch(self):
+        """The exported ONNX encoder produces the same embeddings as torch and is reused from disk."""
+        cache_dir = tempfile.mkdtemp()
+        onnx_validator = create_tiny_validator()
+        loads = []
+        def load_torch_model():
+            loads.append(1)
+            return self.validator.model
+
+        try:
+            onnx_validator.encoder = OnnxEncoder.load("tiny/onnx-fp32", "fp32", onnx_validator.tokenizer, cache_dir, load_torch_model)
+            onnx_embeddings = onnx_validator.get_embeddings(self.texts)
+            OnnxEncoder.load("tiny/onnx-fp32", "fp32", onnx_validator.tokenizer, cache_dir, load_torch_model)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        np.testing.assert_allclose(onnx_embeddings, self.validator.get_embeddings(self.texts), atol=1e-4)
+        self.assertEqual(len(loads), 1, "The cached graph should be reused without reloading torch weights")
+
+    @requires_onnx
+    def test_int8_onnx_encoder_stays_close_to_torch(self):
+        """The dynamically quantized graph gets its own cache entry and keeps embeddings pointing the same way."""
+        cache_dir = tempfile.mkdtemp()
+        onnx_validator = create_tiny_validator()
+        try:
+            fp32_path = OnnxEncoder.export("tiny/onnx-fp32", "fp32", onnx_validator.tokenizer, cache_dir, lambda: self.validator.model)
+            onnx_validator.encoder = OnnxEncoder.load("tiny/onnx-int8", "int8", onnx_validator.tokenizer, cache_dir, lambda: self.validator.model)
+            int8_path = OnnxEncoder.export("tiny/onnx-int8", "int8", onnx_validator.tokenizer, cache_dir, lambda: self.validator.model)
+            int8_embeddings = onnx_validator.get_embeddings(self.texts)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        self.assertNotEqual(os.path.dirname(int8_path), os.path.dirname(fp32_path))
+        expected = self.validator.get_embeddings(self.texts)
+        cosine = np.sum(int8_embeddings * expected, axis=1) / (np.linalg.norm(int8_embeddings, axis=1) * np.linalg.norm(expected, axis=1))
+        self.assertTrue(np.all(cosine > 0.95), cosine)
+
+if __name__ == '__main__':
+    unittest.main()
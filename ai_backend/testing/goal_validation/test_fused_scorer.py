@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+import numpy as np
+import torch
+from mock_models import create_tiny_validator
+from app.services.goal_validator import FinancialGoalClassifier
+
+class TestFusedScorer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Load the tiny model with an untrained classifier once for all tests."""
+        torch.manual_seed(0)
+        cls.validator = create_tiny_validator()
+        cls.validator.classifier = FinancialGoalClassifier().eval()
+        cls.validator.classifier_trained = True
+        cls.validator.embedding_store = None
+        cls.goals = [
+            "I want to save $500 for an emergency fund.",
+            "pay off debt",
+            "I will travel by train across Europe. " * 10,
+        ]
+
+    def tearDown(self):
+        self.validator.fused_scorer = None
+
+    def test_traced_scores_match_unfused_path(self):
+        """The traced encoder+classifier graph gives the same probabilities at every bucket shape."""
+        expected = self.validator._score_goals(self.goals, batch_size=2)
+
+        self.validator.fusion = "trace"
+        self.validator.build_fused_scorer()
+        self.assertIsNotNone(self.validator.fused_scorer)
+
+        np.testing.assert_allclose(self.validator._score_goals(self.goals, batch_size=2), expected, atol=1e-5)
+        np.testing.assert_allclose(self.validator._score_goals(self.goals[:1], batch_size=1), expected[:1], atol=1e-5)
+
+    def test_fused_output_carries_embedding(self):
+        """The fused graph returns the CLS embedding next to the probability."""
+        self.validator.fusion = "trace"
+        self.validator.build_fused_scorer()
+        outputs = self.validator._run_batches(self.goals, 4, self.validator.fused_scorer.score, 769)
+        np.testing.assert_allclose(outputs[:, :-1], self.validator.get_embeddings(self.goals), atol=1e-4)
+
+    def test_failed_fusion_falls_back(self):
+        """If the graph can't be built, the validator keeps the unfused path."""
+        self.validator.fusion = "unknown"
+        self.validator.build_fused_scorer()
+        self.assertIsNone(self.validator.fused_scorer)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import asyncio
+import subprocess
+import tempfile
+import threading
+import unittest
+import numpy as np
+from app.services.batch_dispatcher import GoalBatchDispatcher
+from app.services.inference_executor import InferenceExecutor, InferenceQueueFull
+from app.services.inference_sidecar import SidecarServer, SidecarClient, SidecarUnavailable, SidecarWarmingUp
+
+AI_BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+class FakeValidator:
+    """Stands in for GoalValidator; returns numpy scores like the real model."""
+    def __init__(self):
+        self.batches = []
+        self.is_warming_up = False
+        self.result_cache = self.lexical_classifier = self.embedding_store = None
+
+    def readiness(self):
+        return {"ready": not self.is_warming_up, "warming_up": self.is_warming_up, "phases": {}, "error": None}
+
+    def validate_goals(self, goal_texts, batch_size=None):
+        self.batches.append(list(goal_texts))
+        return [(np.bool_(True), np.float32(len(goal_text)), None) for goal_text in goal_texts]
+
+    def validate_goals_isolated(self, goal_texts, batch_size=None):
+        return [(None, "too short") if len(goal_text) < 3 else (result, None)
+                for goal_text, result in zip(goal_texts, self.validate_goals(goal_texts))]
+
+class TestInferenceSidecar(unittest.TestCase):
+    def setUp(self):
+        """Set up a sidecar around a fake validator on a temporary socket."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "inference.sock")
+        self.validator = FakeValidator()
+        self.executor = InferenceExecutor(max_workers=1, max_pending=4)
+        self.dispatcher = GoalBatchDispatcher(self.validator, self.executor, max_wait_ms=50)
+        self.server = SidecarServer(self.validator, self.dispatcher, self.executor)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.tmp_dir.cleanup()
+
+    def run_with_sidecar(self, scenario):
+        async def main():
+            await self.server.start(self.path)
+            client = SidecarClient(self.path, timeout=5)
+            try:
+                return await scenario(client)
+            finally:
+                await client.close()
+                await self.server.stop()
+        return asyncio.run(main())
+
+    def test_concurrent_goals_are_batched_across_requests(self):
+        """Goals sent as separate requests share one batch and come back as plain values."""
+        goals = [f"I want to save {'$' * i}" for i in range(10)]
+        results = self.run_with_sidecar(lambda client: asyncio.gather(*[client.validate_goal(goal) for goal in goals]))
+
+        self.assertEqual(self.validator.batches, [goals])
+        self.assertEqual(results, [(True, float(len(goal)), None) for goal in goals])
+
+    def test_validate_many_keeps_per_goal_errors(self):
+        """Bulk requests return each goal's result or error in order."""
+        outcomes = self.run_with_sidecar(lambda client: client.validate_goals_isolated(["save money", "no"]))
+        self.assertEqual(outcomes, [((True, 10.0, None), None), (None, "too short")])
+
+    def test_ready_health_and_metrics(self):
+        """The sidecar answers readiness, health and metrics requests."""
+        async def scenario(client):
+            return await client.readiness(), await client.health(), await client.metrics()
+
+        readiness, health, metrics = self.run_with_sidecar(scenario)
+        self.assertTrue(readiness["ready"])
+        self.assertEqual(health["status"], "healthy")
+        self.assertEqual(metrics["sidecar"]["connections"], 1)
+
+    def test_warming_up_and_queue_full_are_reported(self):
+        """Warm-up and a full inference queue reach the client as their own exceptions."""
+        release = threading.Event()
+
+        async def scenario(client):
+            self.validator.is_warming_up = True
+            with self.assertRaises(SidecarWarmingUp):
+                await client.validate_goal("save money")
+            self.validator.is_warming_up = False
+
+            blocked = [asyncio.ensure_future(self.executor.run(release.wait)) for _ in range(4)]
+            await asyncio.sleep(0.05)
+            try:
+                with self.assertRaises(InferenceQueueFull):
+                    await client.validate_goals_isolated(["save money"])
+            finally:
+                release.set()
+                await asyncio.gather(*blocked)
+
+        self.run_with_sidecar(scenario)
+        self.assertEqual(self.server.errors, {"warming_up": 1, "queue_full": 1})
+
+    def test_unreachable_sidecar(self):
+        """A missing sidecar raises SidecarUnavailable instead of hanging."""
+        client = SidecarClient(self.path, timeout=1)
+        with self.assertRaises(SidecarUnavailable):
+            asyncio.run(client.health())
+
+    def test_api_does_not_import_torch_in_sidecar_mode(self):
+        """With INFERENCE_SIDECAR_SOCKET set the API process never loads torch or transformers."""
+        code = "import sys, app.main; print('torch' in sys.modules or 'transformers' in sys.modules)"
+        env = dict(os.environ, INFERENCE_SIDECAR_SOCKET=self.path)
+        output = subprocess.run([sys.executable, "-c", code], cwd=AI_BACKEND_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], "False")
+
+if __name__ == '__main__':
+    unittest.main()
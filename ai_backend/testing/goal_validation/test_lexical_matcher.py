@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+from unittest.mock import patch
+import numpy as np
+from app.services.lexical_matcher import PhraseAutomaton, LexicalPreClassifier, tokenize
+from app.services.goal_validator import GoalValidator, FinancialGoalClassifier
+
+class TestLexicalPreClassifier(unittest.TestCase):
+    def setUp(self):
+        """Set up a pre-classifier over small keyword lists."""
+        self.classifier = LexicalPreClassifier(
+            ["debt", "pay off debt", "emergency fund", "save money"],
+            ["guitar", "learn guitar", "run a marathon"],
+            threshold=0.8
+        )
+
+    def test_automaton_reports_overlapping_phrases(self):
+        """Every phrase is found, including ones that are suffixes of longer matches."""
+        automaton = PhraseAutomaton([("pay off debt", "a"), ("off debt", "b"), ("debt", "c"), ("payoff", "d")])
+        matches = sorted(automaton.find(tokenize("I will pay off debt, then pay off debt")))
+        self.assertEqual(matches, sorted([("a", 3), ("b", 2), ("c", 1)] * 2))
+
+    def test_matches_respect_word_boundaries(self):
+        """Phrases only match whole words."""
+        automaton = PhraseAutomaton([("ira", "financial")])
+        self.assertEqual(list(automaton.find(tokenize("I admire Ira's library"))), [("financial", 1)])
+        self.assertEqual(list(automaton.find(tokenize("admiration"))), [])
+
+    def test_decisive_financial(self):
+        """Strong financial evidence is decided as valid without the model."""
+        decision = self.classifier.classify("Pay off debt and build an emergency fund")
+        self.assertIsNotNone(decision)
+        is_valid, score = decision
+        self.assertTrue(is_valid)
+        self.assertGreaterEqual(score, 0.8)
+
+    def test_decisive_unrelated(self):
+        """Strong unrelated evidence is decided as invalid without the model."""
+        decision = self.classifier.classify("I want to learn guitar")
+        self.assertIsNotNone(decision)
+        self.assertFalse(decision[0])
+
+    def test_ambiguous_is_left_to_model(self):
+        """Goals with no or mixed keyword evidence are not decided."""
+        self.assertIsNone(self.classifier.classify("Become a better person"))
+        self.assertIsNone(self.classifier.classify("Save money for a guitar"))
+        self.assertEqual(self.classifier.score("Become a better person"), 0.5)
+
+    def test_counters(self):
+        """Decisions are counted for the metrics endpoint."""
+        self.classifier.classify("save money")
+        self.classifier.classify("learn guitar")
+        self.classifier.classify("something else")
+        snapshot = self.classifier.snapshot()
+        self.assertEqual((snapshot["decided_valid"], snapshot["decided_invalid"], snapshot["undecided"]), (1, 1, 1))
+        self.assertAlmostEqual(snapshot["fast_path_rate"], 0.6667)
+
+    def test_validator_skips_encoder_for_decisive_goals(self):
+        """GoalValidator answers decisive goals lexically and only encodes the rest."""
+        validator = GoalValidator()
+        validator.result_cache = None
+        validator.lexical_classifier = self.classifier
+        validator.embedding_store = None
+        validator.classifier = FinancialGoalClassifier()
+        validator.classifier_trained = True
+        validator._initialized = True
+
+        with patch.object(validator, 'get_embeddings', return_value=np.zeros((1, 768), dtype=np.float32)) as get_embeddings:
+            results = validator.validate_goals(["pay off debt", "Become a better person", "learn guitar"])
+
+        get_embeddings.assert_called_once_with(["Become a better person"], batch_size=None)
+        self.assertTrue(results[0][0])
+        self.assertFalse(results[2][0])
+
+if __name__ == '__main__':
+    unittest.main()
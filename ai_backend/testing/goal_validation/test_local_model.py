@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from mock_models import create_tiny_finbert, create_tiny_validator
+from app.config import settings
+from app.services.local_model import prepare_model, read_manifest
+from app.services.goal_validator import GoalValidator
+
+class TestLocalModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Vendor the tiny model into a temporary directory once."""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.model_dir = os.path.join(cls.temp_dir, "finbert")
+        cls.manifest = prepare_model(create_tiny_finbert(), "main", cls.model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+
+    def tearDown(self):
+        settings.VALIDATOR_MODEL_DIR = ""
+
+    def test_prepared_directory(self):
+        """The prepared directory holds safetensors weights, the tokenizer and a manifest."""
+        self.assertIn("model.safetensors", os.listdir(self.model_dir))
+        self.assertNotIn("pytorch_model.bin", os.listdir(self.model_dir))
+        self.assertEqual(read_manifest(self.model_dir)["model_name"], create_tiny_finbert())
+        self.assertIsNone(read_manifest(self.temp_dir))
+
+    def test_refuses_to_replace_an_unrelated_directory(self):
+        """A non-empty --output without a manifest is left alone unless forced; a prepared one is replaced."""
+        target = os.path.join(self.temp_dir, "not-a-model")
+        os.makedirs(target)
+        with open(os.path.join(target, "notes.txt"), "w") as f:
+            f.write("keep me")
+
+        with self.assertRaises(FileExistsError):
+            prepare_model(create_tiny_finbert(), "main", target)
+        self.assertEqual(os.listdir(target), ["notes.txt"])
+
+        prepare_model(create_tiny_finbert(), "main", target, force=True)
+        self.assertIsNotNone(read_manifest(target))
+        # Now that it holds a prepared model, re-preparing it needs no force
+        prepare_model(create_tiny_finbert(), "main", target)
+        self.assertNotIn("notes.txt", os.listdir(target))
+
+    def test_validator_loads_offline(self):
+        """With VALIDATOR_MODEL_DIR set, the validator loads strictly from disk and keeps the hub identity."""
+        settings.VALIDATOR_MODEL_DIR = self.model_dir
+        validator = GoalValidator()
+        self.assertEqual(validator.model_name, create_tiny_finbert())
+        self.assertEqual(validator.model_revision, self.manifest["commit"] or "main")
+
+        with patch.dict(os.environ, {"HF_HUB_OFFLINE": "1"}):
+            source, options = validator._pretrained_source()
+            self.assertEqual((source, options), (self.model_dir, {"local_files_only": True}))
+            model = validator._load_torch_model().eval()
+
+        reference = create_tiny_validator()
+        for name, tensor in reference.model.state_dict().items():
+            np.testing.assert_array_equal(model.state_dict()[name].numpy(), tensor.numpy())
+
+    def test_revision_is_the_prepared_commit(self):
+        """Artifact caches are keyed on the commit the weights came from, not the branch name."""
+        manifest_path = os.path.join(self.model_dir, "prepared_model.json")
+        with open(manifest_path) as f:
+            original = f.read()
+        settings.VALIDATOR_MODEL_DIR = self.model_dir
+        try:
+            for commit, expected in (("0123abcd", "0123abcd"), (None, "main")):
+                with open(manifest_path, "w") as f:
+                    json.dump({**self.manifest, "commit": commit}, f)
+                self.assertEqual(GoalValidator().model_revision, expected)
+        finally:
+            with open(manifest_path, "w") as f:
+                f.write(original)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import torch
+from app.services.model_cache import ReferenceEmbeddingCache, ClassifierCheckpointCache, classifier_fingerprint
+from app.services.goal_validator import FinancialGoalClassifier
+
+class TestReferenceEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a throwaway cache directory."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ReferenceEmbeddingCache(self.cache_dir)
+        self.financial = np.random.rand(4, 768).astype(np.float32)
+        self.unrelated = np.random.rand(6, 768).astype(np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_round_trip_is_memory_mapped(self):
+        """Saved matrices load back unchanged and memory-mapped."""
+        key = self.cache.make_key("finbert", "rev", ["save"], ["tree"])
+        self.cache.save(key, self.financial, self.unrelated)
+
+        financial, unrelated = self.cache.load(key)
+        self.assertIsInstance(financial, np.memmap)
+        np.testing.assert_array_equal(financial, self.financial)
+        np.testing.assert_array_equal(unrelated, self.unrelated)
+
+    def test_key_changes_with_inputs(self):
+        """Any change to model, tokenizer revision or keywords produces a different key."""
+        base = self.cache.make_key("finbert", "rev", ["save"], ["tree"])
+        self.assertEqual(base, self.cache.make_key("finbert", "rev", ["save"], ["tree"]))
+        self.assertNotEqual(base, self.cache.make_key("other-model", "rev", ["save"], ["tree"]))
+        self.assertNotEqual(base, self.cache.make_key("finbert", "rev2", ["save"], ["tree"]))
+        self.assertNotEqual(base, self.cache.make_key("finbert", "rev", ["save", "invest"], ["tree"]))
+        self.assertNotEqual(base, self.cache.make_key("finbert", "rev", ["save"], ["tree", "river"]))
+
+    def test_miss_and_stale_entries_pruned(self):
+        """Unknown keys miss, and saving a new entry removes the stale one."""
+        old_key = self.cache.make_key("finbert", "rev", ["save"], ["tree"])
+        new_key = self.cache.make_key("finbert", "rev", ["save", "invest"], ["tree"])
+        self.assertIsNone(self.cache.load(old_key))
+
+        self.cache.save(old_key, self.financial, self.unrelated)
+        self.cache.save(new_key, self.financial, self.unrelated)
+
+        self.assertIsNone(self.cache.load(old_key))
+        self.assertIsNotNone(self.cache.load(new_key))
+
+    def test_corrupt_entry_is_a_miss(self):
+        """A truncated or mismatched entry is treated as a cache miss."""
+        key = self.cache.make_key("finbert", "rev", ["save"], ["tree"])
+        self.cache.save(key, self.financial, self.unrelated)
+        os.remove(os.path.join(self.cache.cache_dir, key, ReferenceEmbeddingCache.UNRELATED_FILE))
+
+        self.assertIsNone(self.cache.load(key))
+
+class TestClassifierCheckpointCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a throwaway cache directory and training inputs."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = ClassifierCheckpointCache(self.cache_dir)
+        self.financial = np.random.rand(4, 768).astype(np.float32)
+        self.unrelated = np.random.rand(6, 768).astype(np.float32)
+        self.hyperparameters = {"epochs": 600, "learning_rate": 0.001}
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """A saved state_dict restores into a fresh classifier with identical outputs."""
+        key = classifier_fingerprint(self.financial, self.unrelated, self.hyperparameters)
+        trained = FinancialGoalClassifier().eval()
+        self.cache.save(key, trained.state_dict(), self.hyperparameters)
+
+        restored = FinancialGoalClassifier().eval()
+        restored.load_state_dict(self.cache.load(key))
+
+        x = torch.rand(3, 768)
+        with torch.no_grad():
+            torch.testing.assert_close(restored(x), trained(x))
+
+    def test_fingerprint_mismatch_forces_retraining(self):
+        """Changed embeddings or hyperparameters do not reuse the checkpoint."""
+        key = classifier_fingerprint(self.financial, self.unrelated, self.hyperparameters)
+        self.cache.save(key, FinancialGoalClassifier().state_dict())
+
+        changed_data = classifier_fingerprint(self.financial * 2, self.unrelated, self.hyperparameters)
+        changed_params = classifier_fingerprint(self.financial, self.unrelated, {"epochs": 300, "learning_rate": 0.001})
+
+        self.assertIsNotNone(self.cache.load(key))
+        self.assertIsNone(self.cache.load(changed_data))
+        self.assertIsNone(self.cache.load(changed_params))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+from unittest.mock import patch
+import numpy as np
+from app.services.reference_index import ReferenceIndex, normalize_rows
+from app.services.goal_validator import GoalValidator
+
+class TestReferenceIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up an index over random references."""
+        rng = np.random.default_rng(0)
+        self.financial = rng.normal(size=(40, 16))
+        self.unrelated = rng.normal(size=(60, 16))
+        self.index = ReferenceIndex(
+            [f"fin {i}" for i in range(40)], self.financial,
+            [f"other {i}" for i in range(60)], self.unrelated
+        )
+
+    def test_matrix_is_normalized_contiguous_float32(self):
+        """References are stored once as unit-length rows of one contiguous float32 matrix."""
+        self.assertEqual(self.index.matrix.dtype, np.float32)
+        self.assertTrue(self.index.matrix.flags["C_CONTIGUOUS"])
+        np.testing.assert_allclose(np.linalg.norm(self.index.matrix, axis=1), 1.0, rtol=1e-5)
+
+    def test_matches_brute_force_cosine(self):
+        """Best similarities and top-k agree with a brute-force cosine computation."""
+        query = np.random.default_rng(1).normal(size=16)
+        max_financial, max_unrelated, matches = self.index.search(query, k=5)[0]
+
+        unit = query / np.linalg.norm(query)
+        financial = normalize_rows(self.financial) @ unit
+        unrelated = normalize_rows(self.unrelated) @ unit
+        self.assertAlmostEqual(max_financial, financial.max(), places=5)
+        self.assertAlmostEqual(max_unrelated, unrelated.max(), places=5)
+
+        expected = sorted(
+            [(s, f"fin {i}") for i, s in enumerate(financial)] + [(s, f"other {i}") for i, s in enumerate(unrelated)],
+            reverse=True
+        )[:5]
+        self.assertEqual([match["phrase"] for match in matches], [phrase for _, phrase in expected])
+        self.assertEqual([match["category"] for match in matches],
+                         ["financial" if phrase.startswith("fin") else "unrelated" for _, phrase in expected])
+
+    def test_batch_and_edge_cases(self):
+        """Batched queries, k larger than the index and zero rows are handled."""
+        queries = np.stack([self.financial[3], np.zeros(16)])
+        results = self.index.search(queries, k=500)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][2][0]["phrase"], "fin 3")
+        self.assertEqual(len(results[0][2]), 100)
+        self.assertEqual(results[1][:2], (0.0, 0.0))
+
+    def test_validator_similarity_fallback(self):
+        """The similarity fallback returns the verdict and the nearest reference phrases."""
+        validator = GoalValidator()
+        validator._initialized = True
+        validator.reference_index = self.index
+        validator.embedding_store = None
+        validator.get_goal_embeddings = lambda texts, batch_size=None: self.unrelated[7:8]
+
+        is_valid, confidence, suggestions, matches = validator.match_references("learn to juggle", k=3)
+        self.assertFalse(is_valid)
+        self.assertEqual(matches[0]["phrase"], "other 7")
+        self.assertEqual(len(suggestions), 1)
+        with patch.object(self.index, "search", wraps=self.index.search) as search:
+            self.assertEqual(validator.validate_goal_similarity("learn to juggle"), (is_valid, confidence, suggestions))
+        # The verdict-only fallback doesn't rank references it would throw away
+        self.assertEqual(search.call_args.args[1], 0)
+
+if __name__ == '__main__':
+    unittest.main()
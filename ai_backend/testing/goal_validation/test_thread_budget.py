@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+from unittest.mock import patch
+import torch
+from app.services.thread_budget import compute_thread_budget, apply_thread_budget, applied_thread_budget, standalone_processes
+
+class TestThreadBudget(unittest.TestCase):
+    def test_auto_budget_divides_cores(self):
+        """Cores are split evenly across processes and their inference threads."""
+        budget = compute_thread_budget(processes=2, inference_threads=2, cores=16)
+        self.assertEqual((budget["intra_op_threads"], budget["inter_op_threads"]), (4, 1))
+        self.assertTrue(budget["auto"])
+
+    def test_auto_budget_never_drops_below_one_thread(self):
+        """More consumers than cores still get one thread each."""
+        self.assertEqual(compute_thread_budget(processes=8, inference_threads=1, cores=4)["intra_op_threads"], 1)
+
+    def test_explicit_values_win(self):
+        """Explicit intra/inter-op settings are used as given."""
+        budget = compute_thread_budget(processes=4, inference_threads=1, cores=16, intra_op_threads=6, inter_op_threads=2)
+        self.assertEqual((budget["intra_op_threads"], budget["inter_op_threads"]), (6, 2))
+        self.assertFalse(budget["auto"])
+
+    def test_uvicorn_process_count_comes_from_web_concurrency(self):
+        """uvicorn workers budget for WEB_CONCURRENCY processes, or one when it is unset or invalid."""
+        for value, expected in (("4", 4), ("", 1), ("many", 1), ("0", 1)):
+            with patch.dict(os.environ, {"WEB_CONCURRENCY": value}):
+                self.assertEqual(standalone_processes(), expected)
+        with patch.dict(os.environ):
+            os.environ.pop("WEB_CONCURRENCY", None)
+            self.assertEqual(standalone_processes(), 1)
+
+    def test_apply_sets_torch_and_environment(self):
+        """Applying the budget sizes torch's pools and turns tokenizer parallelism off."""
+        previous = torch.get_num_threads()
+        budget = compute_thread_budget(processes=1, inference_threads=1, cores=1)
+        try:
+            with patch.dict(os.environ, {}, clear=False):
+                applied = apply_thread_budget(budget)
+                self.assertEqual(os.environ["TOKENIZERS_PARALLELISM"], "false")
+            self.assertEqual(torch.get_num_threads(), 1)
+            self.assertEqual(applied["intra_op_threads"], 1)
+            self.assertIs(applied_thread_budget(), applied)
+        finally:
+            torch.set_num_threads(previous)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+import unittest
+from unittest.mock import patch
+import numpy as np
+from app.services.ttl_cache import TTLCache
+from app.services.goal_validator import GoalValidator, FinancialGoalClassifier, normalize_goal_text
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestTTLCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when the cache is full."""
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_ttl_expiration(self):
+        """Entries expire once their time-to-live has passed."""
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl_seconds=60, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 59
+        self.assertEqual(cache.get("a"), 1)
+        clock.now = 61
+        self.assertIsNone(cache.get("a"))
+
+        snapshot = cache.snapshot()
+        self.assertEqual((snapshot["hits"], snapshot["misses"], snapshot["expirations"]), (1, 1, 1))
+
+class TestGoalValidationCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a validator with an untrained classifier and a stub encoder."""
+        self.validator = GoalValidator()
+        self.validator.result_cache = TTLCache(max_size=100, ttl_seconds=60)
+        self.validator.lexical_classifier = None
+        self.validator.embedding_store = None
+        self.validator.classifier = FinancialGoalClassifier()
+        self.validator.classifier_trained = True
+        self.validator.classifier_version = "v1"
+        self.validator._initialized = True
+
+    def test_normalization(self):
+        """Case, punctuation and whitespace differences normalize to the same text."""
+        self.assertEqual(
+            normalize_goal_text("  I want to SAVE money!! "),
+            normalize_goal_text("i want to save, money")
+        )
+
+    def test_repeated_goals_skip_the_encoder(self):
+        """Equivalent goals are answered from the cache without encoding."""
+        with patch.object(self.validator, 'get_embeddings', side_effect=lambda texts, batch_size=None: np.random.rand(len(texts), 768)) as mock_embeddings:
+            first = self.validator.validate_goals(["I want to save money", "I want to pay off debt"])
+            second = self.validator.validate_goals(["i want to SAVE money!", "I want to pay off debt", "I want to invest more"])
+
+        self.assertEqual(second[0], first[0])
+        self.assertEqual(second[1], first[1])
+        self.assertEqual(mock_embeddings.call_count, 2)
+        self.assertEqual(mock_embeddings.call_args_list[1].args[0], ["I want to invest more"])
+
+    def test_classifier_version_is_part_of_the_key(self):
+        """A new classifier version does not reuse results from the old one."""
+        with patch.object(self.validator, 'get_embeddings', return_value=np.random.rand(1, 768)) as mock_embedding:
+            self.validator.validate_goal("I want to save money")
+            self.validator.classifier_version = "v2"
+            self.validator.validate_goal("I want to save money")
+
+        self.assertEqual(mock_embedding.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()